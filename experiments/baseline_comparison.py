@@ -5,6 +5,7 @@ Baseline comparison experiment
 
 import sys
 import os
+import pandas as pd
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.main import SimulationController
@@ -35,22 +36,26 @@ def run_baseline_experiment():
                           'avg_response_time', 'cpu_utilization', 
                           'throughput', 'fairness_index']
     
+    # For turnaround, waiting, response: lower is better
+    # For CPU util, throughput, fairness: higher is better
+    minimize = {'avg_turnaround_time', 'avg_waiting_time', 'avg_response_time'}
+    formats = {
+        'avg_turnaround_time': '{:.2f} ms',
+        'avg_waiting_time': '{:.2f} ms',
+        'avg_response_time': '{:.2f} ms',
+        'cpu_utilization': '{:.2f}%',
+        'throughput': '{:.3f}',
+        'fairness_index': '{:.3f}',
+    }
+    
+    df = pd.DataFrame.from_dict(results, orient='index')
+    
     for metric in metrics_of_interest:
-        if any(metric in r for r in results.values()):
-            # For turnaround, waiting, response: lower is better
-            # For CPU util, throughput, fairness: higher is better
-            
-            if 'turnaround' in metric or 'waiting' in metric or 'response' in metric:
-                best_algo = min(results.items(), key=lambda x: x[1].get(metric, float('inf')))
-                value = best_algo[1].get(metric, 0)
-                print(f"{metric.replace('_', ' ').title():25} {best_algo[0]:15} {value:.2f} ms")
-            else:
-                best_algo = max(results.items(), key=lambda x: x[1].get(metric, 0))
-                value = best_algo[1].get(metric, 0)
-                if 'utilization' in metric:
-                    print(f"{metric.replace('_', ' ').title():25} {best_algo[0]:15} {value:.2f}%")
-                else:
-                    print(f"{metric.replace('_', ' ').title():25} {best_algo[0]:15} {value:.3f}")
+        if metric not in df or df[metric].isna().all():
+            continue
+        best = df[metric].idxmin() if metric in minimize else df[metric].idxmax()
+        value = formats[metric].format(df.at[best, metric])
+        print(f"{metric.replace('_', ' ').title():25} {best:15} {value}")
 
 if __name__ == "__main__":
     run_baseline_experiment()
\ No newline at end of file
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Run every experiment in a single process so heavy imports are paid once
+"""
+
+import sys
+import os
+import time
+import importlib
+import traceback
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.helpers import parse_experiment_args
+
+# name -> (module, runner function, description); imported only when run
+EXPERIMENTS = {
+    'baseline': ('experiments.baseline_comparison', 'run_baseline_experiment',
+                 'Baseline Comparison'),
+    'sensitivity': ('experiments.sensitivity_analysis', 'run_sensitivity_experiment',
+                    'Sensitivity Analysis'),
+    'workload': ('experiments.workload_specific', 'run_workload_experiment',
+                 'Workload-Specific Performance'),
+    'scalability': ('experiments.scalability_test', 'run_scalability_experiment',
+                    'Scalability'),
+}
+
+def run_experiment(name):
+    """Run one experiment in this interpreter; returns False if it raised"""
+    module_name, function_name, _ = EXPERIMENTS[name]
+    try:
+        experiment = getattr(importlib.import_module(module_name), function_name)
+        experiment()
+    except Exception:
+        traceback.print_exc()
+        return False
+    return True
+
+def run_all():
+    """Run all experiments in sequence, continuing past failures"""
+    # Headless backend for the batch run; figures are only written to disk.
+    # Imported here so loading the registry does not pull in matplotlib.
+    import matplotlib
+    matplotlib.use('Agg')
+    os.makedirs('data/results/graphs', exist_ok=True)
+    failed = []
+    start_time = time.time()
+
+    for name, (_, _, description) in EXPERIMENTS.items():
+        print(f"\n\n{'='*80}")
+        print(f"RUNNING: {description}")
+        print('='*80)
+
+        if not run_experiment(name):
+            failed.append(description)
+
+    print(f"\nAll experiments finished in {time.time() - start_time:.2f} seconds")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+    return failed
+
+if __name__ == "__main__":
+    parse_experiment_args('Run all experiments')
+    sys.exit(1 if run_all() else 0)
@@ -6,20 +6,109 @@ Scalability test experiment
 import sys
 import os
 import time
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.main import SimulationController
-from src.visualizer import Visualizer
-from src.workload_generator import WorkloadGenerator, WorkloadConfig
+from src.simulator import CPUSimulator
+from src.workload_generator import (
+    WorkloadConfig, load_or_generate, derive_seed, get_workload_cache_stats
+)
+from src.result_cache import (
+    make_run_config, load_cached_result, store_cached_result, get_result_cache_stats
+)
+from src.utils.helpers import figure_save_args, parse_experiment_args, new_figure
 
-def run_scalability_experiment():
-    """Run scalability experiment"""
-    controller = SimulationController()
-    visualizer = Visualizer()
+# (result key, y-axis label, title, y-limits) for each scalability panel.
+SCALABILITY_PANELS = [
+    ('avg_turnaround', 'Average Turnaround Time (ms)', 'Scalability: Turnaround Time', None),
+    ('avg_waiting', 'Average Waiting Time (ms)', 'Scalability: Waiting Time', None),
+    ('cpu_utilization', 'CPU Utilization (%)', 'Scalability: CPU Utilization', (0, 100)),
+    ('throughput', 'Throughput (processes/sec)', 'Scalability: Throughput', None),
+    ('fairness', 'Fairness Index', 'Scalability: Fairness', (0, 1.1)),
+    ('execution_time', 'Execution Time (seconds)', 'Simulation Performance', None),
+]
+
+# Summary table columns keep stable names whatever the largest process count is
+SUMMARY_SCHEMA = [
+    ('algorithm', 'U16'),
+    ('turnaround_growth', 'f8'),
+    ('waiting_growth', 'f8'),
+    ('turnaround_last', 'f8'),
+    ('waiting_last', 'f8'),
+    ('cpu_util_last', 'f8'),
+    ('fairness_last', 'f8'),
+]
+SUMMARY_FORMATS = {
+    'turnaround_growth': '{:.2f}',
+    'waiting_growth': '{:.2f}',
+    'turnaround_last': '{:.0f}',
+    'waiting_last': '{:.0f}',
+    'cpu_util_last': '{:.1f}%',
+    'fairness_last': '{:.2f}',
+}
+SUMMARY_LABELS = {
+    'algorithm': 'Algorithm',
+    'turnaround_growth': 'Avg Turnaround Growth %',
+    'waiting_growth': 'Avg Waiting Growth %',
+    'turnaround_last': 'Turnaround @ {count}',
+    'waiting_last': 'Waiting @ {count}',
+    'cpu_util_last': 'CPU Util @ {count}',
+    'fairness_last': 'Fairness @ {count}',
+}
+
+def _workload_config(count, seed):
+    """Mixed workload for one process count, seeded from the count"""
+    return WorkloadConfig(num_processes=count, workload_type="mixed",
+                          seed=derive_seed('scalability', seed, count))
+
+def _run_config(count, algo, seed):
+    """Result cache key for one (process count, algorithm) run"""
+    return make_run_config(
+        _workload_config(count, seed), algo,
+        context_switch_time=2,
+        time_quantum=20 if algo == 'RR' else None,
+        summary_row=True  # Entries are scalability rows, unlike plain metrics entries
+    )
+
+def _run_one(count, algo, seed):
+    """Run a single (process count, algorithm) simulation in a worker process"""
+    # Load the workload from the shared seed so every algorithm sees the
+    # same processes without pickling them across process boundaries
+    workload = load_or_generate(_workload_config(count, seed))
     
+    start_time = time.time()
+    
+    # Create scheduler
+    controller = SimulationController()
+    if algo == 'RR':
+        scheduler = controller.create_scheduler(algo, time_quantum=20)
+    else:
+        scheduler = controller.create_scheduler(algo)
+    
+    simulator = CPUSimulator(scheduler, context_switch_time=2)
+    simulator.initialize_simulation(workload)
+    
+    # Runs until every process has completed
+    result = simulator.run()
+    
+    exec_time = time.time() - start_time
+    
+    # Store key metrics
+    metrics = result.metrics
+    return {
+        'avg_turnaround': metrics.get('avg_turnaround_time', 0),
+        'avg_waiting': metrics.get('avg_waiting_time', 0),
+        'avg_response': metrics.get('avg_response_time', 0),
+        'cpu_utilization': metrics.get('cpu_utilization', 0),
+        'throughput': metrics.get('throughput', 0),
+        'fairness': metrics.get('fairness_index', 0),
+        'execution_time': exec_time
+    }
+
+def run_scalability_experiment(seed: int = 42):
+    """Run scalability experiment"""
     print("\n" + "="*80)
     print("EXPERIMENT 4: SCALABILITY TEST")
     print("="*80)
@@ -33,83 +122,47 @@ def run_scalability_experiment():
     
     # Store results
     results = {algo: {} for algo in algorithms}
-    execution_times = {algo: [] for algo in algorithms}
     
+    # Warm the workload cache up front so workers only ever read it
     for count in process_counts:
-        print(f"\n{'='*60}")
-        print(f"TESTING WITH {count} PROCESSES")
-        print('='*60)
-        
-        # Generate workload once for fair comparison
-        workload_config = WorkloadConfig(
-            num_processes=count,
-            workload_type="mixed"
-        )
-        generator = WorkloadGenerator(workload_config)
-        workload = generator.generate_synthetic_workload()
+        load_or_generate(_workload_config(count, seed))
+    
+    # Every (count, algo) simulation is independent, so run them in parallel.
+    # The workload seed depends only on the count, so algorithms share workloads.
+    # Runs already in the result cache are not resubmitted. Wall-clock timings
+    # are never cached, so those runs have no execution_time this time (NaN).
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        futures = {}
+        for count in process_counts:
+            for algo in algorithms:
+                cached = load_cached_result(_run_config(count, algo, seed))
+                if cached is not None:
+                    results[algo][count] = {**cached, 'execution_time': float('nan')}
+                    print(f"  {algo} with {count} processes ✓ (cached)")
+                else:
+                    futures[pool.submit(_run_one, count, algo, seed)] = (count, algo)
         
-        for algo in algorithms:
-            print(f"  Running {algo}...", end=' ', flush=True)
-            start_time = time.time()
-            
-            # Create scheduler
-            if algo == 'RR':
-                scheduler = controller.create_scheduler(algo, time_quantum=20)
-            else:
-                scheduler = controller.create_scheduler(algo)
-            
-            # Create simulator
-            from src.simulator import CPUSimulator
-            simulator = CPUSimulator(scheduler, context_switch_time=2)
-            
-            # Use the same workload
-            simulator.processes = {p.process_id: p for p in workload}
-            for process in workload:
-                # Reset process state
-                process.remaining_cpu_time = process.total_cpu_time
-                process.state = PCB.NEW
-                process.start_time = None
-                process.completion_time = None
-                process.first_run_time = None
-                process.total_waiting_time = 0
-                process.total_io_time = 0
-                process.preempted = False
-                process.context_switches = 0
-                process.turnaround_time = None
-                process.waiting_time = None
-                process.response_time = None
-            
-            simulator.initialize_simulation(workload.copy())
-            
-            # Adjust max time based on process count
-            max_time = min(500000, count * 1000)
-            result = simulator.run(max_time=max_time)
-            
-            exec_time = time.time() - start_time
-            execution_times[algo].append(exec_time)
-            
-            # Store key metrics
-            metrics = result.metrics
-            if algo not in results:
-                results[algo] = {}
-            
-            results[algo][count] = {
-                'avg_turnaround': metrics.get('avg_turnaround_time', 0),
-                'avg_waiting': metrics.get('avg_waiting_time', 0),
-                'avg_response': metrics.get('avg_response_time', 0),
-                'cpu_utilization': metrics.get('cpu_utilization', 0),
-                'throughput': metrics.get('throughput', 0),
-                'fairness': metrics.get('fairness_index', 0),
-                'execution_time': exec_time
-            }
-            
-            print(f"✓ ({exec_time:.1f}s)")
-    
-    # Create scalability plots
-    create_scalability_plots(results, process_counts, execution_times)
+        for future in as_completed(futures):
+            count, algo = futures[future]
+            row = future.result()
+            results[algo][count] = row
+            store_cached_result(_run_config(count, algo, seed),
+                                {key: value for key, value in row.items()
+                                 if key != 'execution_time'})
+            print(f"  {algo} with {count} processes ✓ "
+                  f"({results[algo][count]['execution_time']:.1f}s)")
+    
+    # Render plots in the background while the summary table is built
+    render_thread = create_scalability_plots(results, process_counts)
     
     # Print summary table
     print_summary_table(results, process_counts)
+    render_thread.join()
+    
+    cache_stats = get_workload_cache_stats()
+    print(f"\nWorkload cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    result_stats = get_result_cache_stats()
+    print(f"Result cache: {result_stats['hits']} hits, {result_stats['misses']} misses")
     
     print("\n" + "="*80)
     print("EXPERIMENT 4 COMPLETE")
@@ -117,103 +170,72 @@ def run_scalability_experiment():
     
     return results
 
-def create_scalability_plots(results, process_counts, execution_times):
-    """Create scalability visualization plots"""
-    fig, axes = plt.subplots(2, 3, figsize=(18, 10))
-    axes = axes.flatten()
-    
-    # Plot 1: Average Turnaround Time
-    ax = axes[0]
-    for algo in results.keys():
-        turnaround_times = [results[algo][count]['avg_turnaround'] for count in process_counts]
-        ax.plot(process_counts, turnaround_times, 'o-', linewidth=2, markersize=6, label=algo)
-    
-    ax.set_xlabel('Number of Processes')
-    ax.set_ylabel('Average Turnaround Time (ms)')
-    ax.set_title('Scalability: Turnaround Time')
-    ax.grid(True, alpha=0.3)
-    ax.legend()
-    
-    # Plot 2: Average Waiting Time
-    ax = axes[1]
-    for algo in results.keys():
-        waiting_times = [results[algo][count]['avg_waiting'] for count in process_counts]
-        ax.plot(process_counts, waiting_times, 'o-', linewidth=2, markersize=6, label=algo)
-    
-    ax.set_xlabel('Number of Processes')
-    ax.set_ylabel('Average Waiting Time (ms)')
-    ax.set_title('Scalability: Waiting Time')
-    ax.grid(True, alpha=0.3)
-    
-    # Plot 3: CPU Utilization
-    ax = axes[2]
-    for algo in results.keys():
-        cpu_utils = [results[algo][count]['cpu_utilization'] for count in process_counts]
-        ax.plot(process_counts, cpu_utils, 'o-', linewidth=2, markersize=6, label=algo)
-    
-    ax.set_xlabel('Number of Processes')
-    ax.set_ylabel('CPU Utilization (%)')
-    ax.set_title('Scalability: CPU Utilization')
-    ax.set_ylim([0, 100])
-    ax.grid(True, alpha=0.3)
-    
-    # Plot 4: Throughput
-    ax = axes[3]
-    for algo in results.keys():
-        throughputs = [results[algo][count]['throughput'] for count in process_counts]
-        ax.plot(process_counts, throughputs, 'o-', linewidth=2, markersize=6, label=algo)
-    
-    ax.set_xlabel('Number of Processes')
-    ax.set_ylabel('Throughput (processes/sec)')
-    ax.set_title('Scalability: Throughput')
-    ax.grid(True, alpha=0.3)
-    
-    # Plot 5: Fairness Index
-    ax = axes[4]
-    for algo in results.keys():
-        fairness = [results[algo][count]['fairness'] for count in process_counts]
-        ax.plot(process_counts, fairness, 'o-', linewidth=2, markersize=6, label=algo)
+def create_scalability_plots(results, process_counts):
+    """Create scalability visualization plots on a background thread.
+
+    Returns the started thread; join it before exiting so the files are written.
+    """
+    import numpy as np
+    
+    # Extract every series up front so the render thread never touches results
+    algos = list(results)
+    plot_data = {
+        metric: np.array([[results[algo][count][metric] for count in process_counts]
+                          for algo in algos], dtype=float)
+        for metric, _, _, _ in SCALABILITY_PANELS
+    }
+    
+    render_thread = threading.Thread(
+        target=_render_scalability_plots,
+        args=(plot_data, algos, process_counts),
+        name='scalability-plots'
+    )
+    render_thread.start()
+    return render_thread
+
+def _render_scalability_plots(plot_data, algos, process_counts):
+    """Build and save the scalability figures from precomputed arrays"""
+    import numpy as np
     
-    ax.set_xlabel('Number of Processes')
-    ax.set_ylabel('Fairness Index')
-    ax.set_title('Scalability: Fairness')
-    ax.set_ylim([0, 1.1])
-    ax.grid(True, alpha=0.3)
+    # Figures are created directly rather than through pyplot, whose global
+    # figure state is not thread-safe
+    os.makedirs('data/results/graphs', exist_ok=True)
     
-    # Plot 6: Execution Time (Simulation Performance)
-    ax = axes[5]
-    for algo in results.keys():
-        if algo in execution_times:
-            ax.plot(process_counts, execution_times[algo], 'o-', linewidth=2, markersize=6, label=algo)
+    fig = new_figure(figsize=(18, 10))
+    axes = fig.subplots(2, 3).flatten()
     
-    ax.set_xlabel('Number of Processes')
-    ax.set_ylabel('Execution Time (seconds)')
-    ax.set_title('Simulation Performance')
-    ax.grid(True, alpha=0.3)
-    ax.legend()
-    
-    plt.suptitle('Scalability Analysis: Algorithm Performance with Increasing Load', 
-                fontsize=16, fontweight='bold')
-    plt.tight_layout()
-    plt.savefig('data/results/graphs/scalability_analysis.png', dpi=300)
-    plt.show()
+    for ax, (metric, ylabel, title, ylim) in zip(axes, SCALABILITY_PANELS):
+        for i, algo in enumerate(algos):
+            ax.plot(process_counts, plot_data[metric][i], 'o-', linewidth=2, markersize=6, label=algo)
+        
+        if metric == 'execution_time' and np.isnan(plot_data[metric]).any():
+            title += ' (cached runs not timed)'
+        
+        ax.set_xlabel('Number of Processes')
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+        if ylim is not None:
+            ax.set_ylim(ylim)
+        ax.grid(True, alpha=0.3)
+    axes[0].legend()
+    axes[len(SCALABILITY_PANELS) - 1].legend()
+    
+    fig.suptitle('Scalability Analysis: Algorithm Performance with Increasing Load', 
+                 fontsize=16, fontweight='bold')
+    fig.tight_layout()
+    path, save_kwargs = figure_save_args('data/results/graphs/scalability_analysis.png')
+    fig.savefig(path, **save_kwargs)
     
     # Create overhead analysis plot
-    fig, ax = plt.subplots(figsize=(12, 6))
+    overhead_fig = new_figure(figsize=(12, 6))
+    ax = overhead_fig.subplots()
     
     # Calculate overhead (waiting time / turnaround time)
-    for algo in results.keys():
-        overheads = []
-        for count in process_counts:
-            turnaround = results[algo][count]['avg_turnaround']
-            waiting = results[algo][count]['avg_waiting']
-            if turnaround > 0:
-                overhead = (waiting / turnaround) * 100
-                overheads.append(overhead)
-            else:
-                overheads.append(0)
-        
-        ax.plot(process_counts, overheads, 'o-', linewidth=2, markersize=6, label=algo)
+    turnaround, waiting = plot_data['avg_turnaround'], plot_data['avg_waiting']
+    overheads = np.divide(waiting * 100, turnaround,
+                          out=np.zeros_like(turnaround), where=turnaround > 0)
+    for i, algo in enumerate(algos):
+        ax.plot(process_counts, overheads[i], 'o-', linewidth=2, markersize=6, label=algo)
     
     ax.set_xlabel('Number of Processes')
     ax.set_ylabel('Scheduling Overhead (%)')
@@ -221,68 +243,57 @@ def create_scalability_plots(results, process_counts, execution_times):
     ax.grid(True, alpha=0.3)
     ax.legend()
     
-    plt.tight_layout()
-    plt.savefig('data/results/graphs/scheduling_overhead.png', dpi=300)
-    plt.show()
+    overhead_fig.tight_layout()
+    path, save_kwargs = figure_save_args('data/results/graphs/scheduling_overhead.png')
+    overhead_fig.savefig(path, **save_kwargs)
 
 def print_summary_table(results, process_counts):
     """Print scalability summary table"""
+    import numpy as np
+    import pandas as pd
+    
     print("\n" + "="*80)
     print("SCALABILITY SUMMARY")
     print("="*80)
     
-    # Create summary DataFrame
-    summary_data = []
+    # Fixed-schema summary rows; NaN marks a growth rate with no valid steps
+    algos = list(results)
+    rows = np.empty(len(algos), dtype=SUMMARY_SCHEMA)
+    last_count = process_counts[-1]
     
-    for algo in results.keys():
-        row = {'Algorithm': algo}
-        
-        # Calculate growth rates
-        turnaround_growth = []
-        waiting_growth = []
-        
-        for i in range(1, len(process_counts)):
-            prev = results[algo][process_counts[i-1]]['avg_turnaround']
-            curr = results[algo][process_counts[i]]['avg_turnaround']
-            if prev > 0:
-                growth = ((curr - prev) / prev) * 100
-                turnaround_growth.append(growth)
-            
-            prev_w = results[algo][process_counts[i-1]]['avg_waiting']
-            curr_w = results[algo][process_counts[i]]['avg_waiting']
-            if prev_w > 0:
-                growth_w = ((curr_w - prev_w) / prev_w) * 100
-                waiting_growth.append(growth_w)
+    for i, algo in enumerate(algos):
+        # Calculate growth rates between consecutive process counts,
+        # skipping steps whose previous value is zero
+        turnaround = np.array([results[algo][c]['avg_turnaround'] for c in process_counts])
+        waiting = np.array([results[algo][c]['avg_waiting'] for c in process_counts])
         
-        # Add average growth rates
-        if turnaround_growth:
-            row['Avg Turnaround Growth %'] = np.mean(turnaround_growth)
-        if waiting_growth:
-            row['Avg Waiting Growth %'] = np.mean(waiting_growth)
+        turnaround_valid = turnaround[:-1] > 0
+        turnaround_growth = (np.diff(turnaround)[turnaround_valid] /
+                             turnaround[:-1][turnaround_valid]) * 100
+        waiting_valid = waiting[:-1] > 0
+        waiting_growth = (np.diff(waiting)[waiting_valid] /
+                          waiting[:-1][waiting_valid]) * 100
         
-        # Add final values for largest process count
-        last_count = process_counts[-1]
-        row[f'Turnaround @ {last_count}'] = results[algo][last_count]['avg_turnaround']
-        row[f'Waiting @ {last_count}'] = results[algo][last_count]['avg_waiting']
-        row[f'CPU Util @ {last_count}'] = results[algo][last_count]['cpu_utilization']
-        row[f'Fairness @ {last_count}'] = results[algo][last_count]['fairness']
-        
-        summary_data.append(row)
-    
-    # Create and display DataFrame
-    df = pd.DataFrame(summary_data)
+        last = results[algo][last_count]
+        rows[i] = (
+            algo,
+            turnaround_growth.mean() if turnaround_growth.size else np.nan,
+            waiting_growth.mean() if waiting_growth.size else np.nan,
+            last['avg_turnaround'],
+            last['avg_waiting'],
+            last['cpu_utilization'],
+            last['fairness'],
+        )
     
-    # Format numeric columns
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
-    for col in numeric_cols:
-        if 'Growth' in col or 'Fairness' in col:
-            df[col] = df[col].map(lambda x: f'{x:.2f}')
-        elif 'Util' in col:
-            df[col] = df[col].map(lambda x: f'{x:.1f}%')
-        else:
-            df[col] = df[col].map(lambda x: f'{x:.0f}')
+    # Keep the numeric frame for selection; format a copy for display
+    df_num = pd.DataFrame(rows)
+    df_display = df_num.copy()
+    for col, fmt in SUMMARY_FORMATS.items():
+        df_display[col] = df_num[col].map(fmt.format)
     
-    print(df.to_string(index=False))
+    print(df_display.rename(columns={
+        col: label.format(count=last_count) for col, label in SUMMARY_LABELS.items()
+    }).to_string(index=False))
     
     # Print scalability conclusions
     print("\n" + "="*80)
@@ -291,24 +302,24 @@ def print_summary_table(results, process_counts):
     
     # Find best scalable algorithm for each metric
     metrics_to_check = [
-        ('Avg Turnaround Growth %', 'lower', 'turnaround time growth'),
-        ('Avg Waiting Growth %', 'lower', 'waiting time growth'),
-        (f'CPU Util @ {process_counts[-1]}', 'higher', 'CPU utilization'),
-        (f'Fairness @ {process_counts[-1]}', 'higher', 'fairness')
+        ('turnaround_growth', 'lower', 'turnaround time growth'),
+        ('waiting_growth', 'lower', 'waiting time growth'),
+        ('cpu_util_last', 'higher', 'CPU utilization'),
+        ('fairness_last', 'higher', 'fairness')
     ]
     
     for col, direction, description in metrics_to_check:
-        if col in df.columns:
+        if df_num[col].notna().any():
             if direction == 'lower':
-                best_idx = df[col].str.replace('%', '').astype(float).idxmin()
+                best_idx = df_num[col].idxmin()
             else:
-                best_idx = df[col].str.replace('%', '').astype(float).idxmax()
+                best_idx = df_num[col].idxmax()
             
-            best_algo = df.loc[best_idx, 'Algorithm']
-            best_value = df.loc[best_idx, col]
+            best_algo = df_display.loc[best_idx, 'algorithm']
+            best_value = df_display.loc[best_idx, col]
             
             print(f"Best for {description:30} {best_algo:10} ({best_value})")
 
 if __name__ == "__main__":
-    from src.pcb import PCB
+    parse_experiment_args('Scalability experiment')
     results = run_scalability_experiment()
\ No newline at end of file
@@ -5,18 +5,26 @@ Sensitivity analysis experiment
 
 import sys
 import os
-import matplotlib.pyplot as plt
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.main import SimulationController
-from src.visualizer import Visualizer
+from src.simulator import CPUSimulator
+from src.workload_generator import (
+    WorkloadConfig, load_or_generate, derive_seed, get_workload_cache_stats
+)
+from src.result_cache import make_run_config, run_cached, get_result_cache_stats
+from src.utils.helpers import figure_save_args, parse_experiment_args, new_figure
+from src.schedulers.fcfs import FCFSScheduler
+from src.schedulers.sjf import SJFScheduler
+from src.schedulers.round_robin import RoundRobinScheduler
+
+def _run_config(workload_config, algo, time_quantum=None):
+    """Result cache key for one run; the quantum only applies to RR"""
+    return make_run_config(workload_config, algo, context_switch_time=2,
+                           time_quantum=time_quantum if algo == 'RR' else None)
 
 def run_sensitivity_experiment():
     """Run sensitivity analysis experiment"""
-    controller = SimulationController()
-    visualizer = Visualizer()
-    
     print("\n" + "="*80)
     print("EXPERIMENT 2: SENSITIVITY ANALYSIS")
     print("="*80)
@@ -25,6 +33,14 @@ def run_sensitivity_experiment():
     print("Part 2: Varying number of processes")
     print("="*80)
     
+    # Encode PNGs in the background so Part 2 simulations are not blocked.
+    # Figures saved there come from new_figure(), outside pyplot, whose
+    # global figure state is not thread-safe. The save futures are kept so a
+    # failed write fails the run.
+    os.makedirs('data/results/graphs', exist_ok=True)
+    executor = ThreadPoolExecutor(max_workers=2)
+    saves = []
+    
     # Part 1: RR with different time quanta
     print("\nPART 1: ROUND ROBIN TIME QUANTUM SENSITIVITY")
     print("-"*60)
@@ -40,26 +56,29 @@ def run_sensitivity_experiment():
         if algo == 'RR':
             # Test RR with different quanta
             rr_results = {}
+            
+            # One workload, scheduler and simulator are reused for every quantum
+            workload_config = WorkloadConfig(num_processes=300, workload_type='mixed',
+                                             seed=derive_seed('sensitivity', 300))
+            processes = load_or_generate(workload_config)
+            scheduler = RoundRobinScheduler(time_quantum=time_quanta[0])
+            simulator = CPUSimulator(scheduler, context_switch_time=2)
+            
             for quantum in time_quanta:
                 print(f"  Quantum = {quantum}ms")
                 
-                # Create scheduler
-                from src.schedulers.round_robin import RoundRobinScheduler
-                scheduler = RoundRobinScheduler(time_quantum=quantum)
-                
-                # Generate workload
-                from src.workload_generator import WorkloadGenerator, WorkloadConfig
-                workload_config = WorkloadConfig(num_processes=300, workload_type='mixed')
-                generator = WorkloadGenerator(workload_config)
-                processes = generator.generate_synthetic_workload()
+                def simulate():
+                    simulator.reset()
+                    scheduler.set_quantum(quantum)
+                    for process in processes:
+                        process.reset()
+                    
+                    simulator.initialize_simulation(processes)
+                    return simulator.run().metrics
                 
                 # Run simulation
-                from src.simulator import CPUSimulator
-                simulator = CPUSimulator(scheduler, context_switch_time=2)
-                simulator.initialize_simulation(processes)
-                result = simulator.run(max_time=100000)
-                
-                rr_results[quantum] = result.metrics
+                run_config = _run_config(workload_config, algo, time_quantum=quantum)
+                rr_results[quantum] = run_cached(run_config, simulate)
             
             # Convert to format for plotting
             metrics_to_plot = ['avg_turnaround_time', 'avg_waiting_time', 
@@ -72,37 +91,34 @@ def run_sensitivity_experiment():
         
         else:
             # Run baseline for comparison
-            from src.schedulers.fcfs import FCFSScheduler
-            from src.schedulers.sjf import SJFScheduler
-            
             if algo == 'FCFS':
                 scheduler = FCFSScheduler()
             elif algo == 'SJF':
                 scheduler = SJFScheduler()
             
-            # Generate workload
-            from src.workload_generator import WorkloadGenerator, WorkloadConfig
-            workload_config = WorkloadConfig(num_processes=300, workload_type='mixed')
-            generator = WorkloadGenerator(workload_config)
-            processes = generator.generate_synthetic_workload()
+            # Generate workload (same seed as the RR sweep)
+            workload_config = WorkloadConfig(num_processes=300, workload_type='mixed',
+                                             seed=derive_seed('sensitivity', 300))
+            processes = load_or_generate(workload_config)
+            
+            def simulate():
+                simulator = CPUSimulator(scheduler, context_switch_time=2)
+                simulator.initialize_simulation(processes)
+                return simulator.run().metrics
             
             # Run simulation
-            from src.simulator import CPUSimulator
-            simulator = CPUSimulator(scheduler, context_switch_time=2)
-            simulator.initialize_simulation(processes)
-            result = simulator.run(max_time=100000)
+            run_config = _run_config(workload_config, algo)
+            run_metrics = run_cached(run_config, simulate)
             
-            # Store constant values for each quantum
+            # Baselines do not depend on the quantum; store one value per metric
             for metric in ['avg_turnaround_time', 'avg_waiting_time', 
                           'avg_response_time', 'cpu_utilization']:
-                if metric in result.metrics:
-                    all_results[f'{algo}_{metric}'] = {
-                        quantum: result.metrics[metric] for quantum in time_quanta
-                    }
+                if metric in run_metrics:
+                    all_results[f'{algo}_{metric}'] = run_metrics[metric]
     
     # Plot results
-    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-    axes = axes.flatten()
+    fig = new_figure(figsize=(14, 10))
+    axes = fig.subplots(2, 2).flatten()
     
     metrics = ['avg_turnaround_time', 'avg_waiting_time', 
               'avg_response_time', 'cpu_utilization']
@@ -122,15 +138,13 @@ def run_sensitivity_experiment():
         # Plot FCFS baseline (horizontal line)
         fcfs_key = f'FCFS_{metric}'
         if fcfs_key in all_results:
-            fcfs_value = list(all_results[fcfs_key].values())[0]
-            ax.axhline(y=fcfs_value, color='blue', linestyle='--', 
+            ax.axhline(y=all_results[fcfs_key], color='blue', linestyle='--', 
                       linewidth=2, label='FCFS')
         
         # Plot SJF baseline (horizontal line)
         sjf_key = f'SJF_{metric}'
         if sjf_key in all_results:
-            sjf_value = list(all_results[sjf_key].values())[0]
-            ax.axhline(y=sjf_value, color='green', linestyle='-.', 
+            ax.axhline(y=all_results[sjf_key], color='green', linestyle='-.', 
                       linewidth=2, label='SJF')
         
         ax.set_xlabel('Time Quantum (ms)')
@@ -142,11 +156,11 @@ def run_sensitivity_experiment():
         if metric == 'cpu_utilization':
             ax.set_ylim([0, 100])
     
-    plt.suptitle('Sensitivity Analysis: Round Robin vs Time Quantum', 
-                fontsize=16, fontweight='bold')
-    plt.tight_layout()
-    plt.savefig('data/results/graphs/rr_sensitivity.png', dpi=300)
-    plt.show()
+    fig.suptitle('Sensitivity Analysis: Round Robin vs Time Quantum', 
+                 fontsize=16, fontweight='bold')
+    fig.tight_layout()
+    path, save_kwargs = figure_save_args('data/results/graphs/rr_sensitivity.png')
+    saves.append(executor.submit(fig.savefig, path, **save_kwargs))
     
     # Part 2: Scalability test
     print("\n\nPART 2: SCALABILITY WITH INCREASING PROCESS COUNT")
@@ -160,42 +174,44 @@ def run_sensitivity_experiment():
     for count in process_counts:
         print(f"\nTesting with {count} processes...")
         
+        # Generate workload once so every algorithm sees the same processes
+        workload_config = WorkloadConfig(num_processes=count, workload_type='mixed',
+                                         seed=derive_seed('sensitivity', count))
+        processes = load_or_generate(workload_config)
+        
         for algo in algorithms:
             print(f"  {algo}...", end=' ', flush=True)
             
             # Create scheduler
             if algo == 'FCFS':
-                from src.schedulers.fcfs import FCFSScheduler
                 scheduler = FCFSScheduler()
             elif algo == 'SJF':
-                from src.schedulers.sjf import SJFScheduler
                 scheduler = SJFScheduler()
             elif algo == 'RR':
-                from src.schedulers.round_robin import RoundRobinScheduler
                 scheduler = RoundRobinScheduler(time_quantum=20)
             
-            # Generate workload
-            from src.workload_generator import WorkloadGenerator, WorkloadConfig
-            workload_config = WorkloadConfig(num_processes=count, workload_type='mixed')
-            generator = WorkloadGenerator(workload_config)
-            processes = generator.generate_synthetic_workload()
+            def simulate():
+                for process in processes:
+                    process.reset()
+                
+                simulator = CPUSimulator(scheduler, context_switch_time=2)
+                simulator.initialize_simulation(processes)
+                return simulator.run().metrics
             
             # Run simulation
-            from src.simulator import CPUSimulator
-            simulator = CPUSimulator(scheduler, context_switch_time=2)
-            simulator.initialize_simulation(processes)
-            result = simulator.run(max_time=200000)
+            run_config = _run_config(workload_config, algo, time_quantum=20)
+            run_metrics = run_cached(run_config, simulate)
             
             # Store results
             for metric in metrics:
-                if metric in result.metrics:
-                    scalability_results[algo][metric].append(result.metrics[metric])
+                if metric in run_metrics:
+                    scalability_results[algo][metric].append(run_metrics[metric])
             
             print("✓")
     
     # Plot scalability results
-    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-    axes = axes.flatten()
+    fig = new_figure(figsize=(14, 10))
+    axes = fig.subplots(2, 2).flatten()
     
     for idx, (metric, title) in enumerate(zip(metrics, titles)):
         ax = axes[idx]
@@ -214,15 +230,25 @@ def run_sensitivity_experiment():
         if metric == 'cpu_utilization':
             ax.set_ylim([0, 100])
     
-    plt.suptitle('Scalability Analysis: Performance with Increasing Load', 
-                fontsize=16, fontweight='bold')
-    plt.tight_layout()
-    plt.savefig('data/results/graphs/scalability_analysis.png', dpi=300)
-    plt.show()
+    fig.suptitle('Scalability Analysis: Performance with Increasing Load', 
+                 fontsize=16, fontweight='bold')
+    fig.tight_layout()
+    path, save_kwargs = figure_save_args('data/results/graphs/scalability_analysis.png')
+    saves.append(executor.submit(fig.savefig, path, **save_kwargs))
+    
+    executor.shutdown(wait=True)
+    for save in saves:
+        save.result()  # Re-raises any savefig error
+    
+    cache_stats = get_workload_cache_stats()
+    print(f"\nWorkload cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    result_stats = get_result_cache_stats()
+    print(f"Result cache: {result_stats['hits']} hits, {result_stats['misses']} misses")
     
     print("\n" + "="*80)
     print("EXPERIMENT 2 COMPLETE")
     print("="*80)
 
 if __name__ == "__main__":
+    parse_experiment_args('Sensitivity analysis experiment')
     run_sensitivity_experiment()
\ No newline at end of file
@@ -5,18 +5,82 @@ Workload-specific performance experiment
 
 import sys
 import os
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.main import SimulationController
-from src.visualizer import Visualizer
+from src.simulator import CPUSimulator
+from src.workload_generator import (
+    WorkloadConfig, load_or_generate, derive_seed, get_workload_cache_stats
+)
+from src.result_cache import (
+    make_run_config, load_cached_result, store_cached_result, get_result_cache_stats
+)
+from src.utils.helpers import figure_save_args, parse_experiment_args, load_pyplot
 
-def run_workload_experiment():
-    """Run workload-specific performance experiment"""
+WORKLOAD_TYPES = ['cpu_intensive', 'io_intensive', 'mixed']
+ALGORITHMS = ['FCFS', 'SJF', 'RR', 'PRIORITY']
+
+# (metric, column label, decimals) for the per-workload summary table
+SUMMARY_COLUMNS = [
+    ('avg_turnaround_time', 'Turnaround (ms)', 0),
+    ('avg_waiting_time', 'Waiting (ms)', 0),
+    ('avg_response_time', 'Response (ms)', 0),
+    ('cpu_utilization', 'CPU Util (%)', 1),
+    ('throughput', 'Throughput', 1),
+    ('fairness_index', 'Fairness', 3),
+]
+
+# (metric, axis label, printf-style bar label) for each performance panel
+PLOT_PANELS = [
+    ('avg_turnaround_time', 'Avg Turnaround Time (ms)', '%.0f'),
+    ('avg_waiting_time', 'Avg Waiting Time (ms)', '%.0f'),
+    ('avg_response_time', 'Avg Response Time (ms)', '%.0f'),
+    ('cpu_utilization', 'CPU Utilization (%)', '%.1f%%'),
+    ('throughput', 'Throughput (proc/sec)', '%.1f'),
+    ('fairness_index', 'Fairness Index', '%.3f'),
+]
+
+# (metric, lower is better, value format) for the best-algorithm recommendations
+RECOMMENDATION_METRICS = [
+    ('avg_turnaround_time', True, '{:.0f} ms'),
+    ('avg_waiting_time', True, '{:.0f} ms'),
+    ('cpu_utilization', False, '{:.1f}%'),
+    ('fairness_index', False, '{:.3f}'),
+]
+
+def _workload_config(workload):
+    """200-process workload of one type, seeded from the type name"""
+    return WorkloadConfig(
+        num_processes=200,
+        workload_type=workload,
+        seed=derive_seed('workload_specific', workload)
+    )
+
+def _run_config(workload, algo):
+    """Result cache key for one (workload, algorithm) run"""
+    return make_run_config(_workload_config(workload), algo, context_switch_time=2,
+                           time_quantum=20 if algo == 'RR' else None)
+
+def _run_one(workload, algo):
+    """Run a single (workload, algorithm) simulation in a worker process"""
+    # Every algorithm loads the same seeded workload from the shared cache
+    processes = load_or_generate(_workload_config(workload))
+    
+    # Create scheduler
     controller = SimulationController()
+    if algo == 'RR':
+        scheduler = controller.create_scheduler(algo, time_quantum=20)
+    else:
+        scheduler = controller.create_scheduler(algo)
     
+    # Run simulation
+    simulator = CPUSimulator(scheduler, context_switch_time=2)
+    simulator.initialize_simulation(processes)
+    return simulator.run().metrics
+
+def run_workload_experiment():
+    """Run workload-specific performance experiment"""
     print("\n" + "="*80)
     print("EXPERIMENT 3: WORKLOAD-SPECIFIC PERFORMANCE")
     print("="*80)
@@ -25,107 +89,79 @@ def run_workload_experiment():
     print("Algorithms: FCFS, SJF, RR (q=20), Priority (preemptive)")
     print("="*80)
     
-    workload_types = ['cpu_intensive', 'io_intensive', 'mixed']
-    algorithms = ['FCFS', 'SJF', 'RR', 'PRIORITY']
+    workload_types = WORKLOAD_TYPES
+    algorithms = ALGORITHMS
     
-    all_results = {}
+    all_results = {workload: {} for workload in workload_types}
+    
+    # Warm the workload cache up front so workers only ever read it
+    for workload in workload_types:
+        load_or_generate(_workload_config(workload))
+    
+    # The (workload, algorithm) trials are independent, so run them in parallel.
+    # Runs already in the result cache are not resubmitted.
+    with ProcessPoolExecutor(max_workers=min(len(workload_types) * len(algorithms),
+                                             os.cpu_count())) as pool:
+        futures = {}
+        for workload in workload_types:
+            for algo in algorithms:
+                cached = load_cached_result(_run_config(workload, algo))
+                if cached is not None:
+                    all_results[workload][algo] = cached
+                else:
+                    futures[pool.submit(_run_one, workload, algo)] = (workload, algo)
+        
+        for future in as_completed(futures):
+            workload, algo = futures[future]
+            all_results[workload][algo] = future.result()
+            store_cached_result(_run_config(workload, algo), all_results[workload][algo])
     
     for workload in workload_types:
         print(f"\n{'='*60}")
         print(f"WORKLOAD: {workload.upper().replace('_', ' ')}")
         print('='*60)
         
-        workload_results = {}
-        
         for algo in algorithms:
-            print(f"\nTesting {algo}...")
-            
-            # Create scheduler
-            if algo == 'RR':
-                scheduler = controller.create_scheduler(algo, time_quantum=20)
-            else:
-                scheduler = controller.create_scheduler(algo)
-            
-            # Generate workload
-            from src.workload_generator import WorkloadGenerator, WorkloadConfig
-            workload_config = WorkloadConfig(
-                num_processes=200,
-                workload_type=workload
-            )
-            generator = WorkloadGenerator(workload_config)
-            processes = generator.generate_synthetic_workload()
-            
-            # Run simulation
-            from src.simulator import CPUSimulator
-            simulator = CPUSimulator(scheduler, context_switch_time=2)
-            simulator.initialize_simulation(processes)
-            result = simulator.run(max_time=150000)
-            
-            workload_results[algo] = result.metrics
+            metrics = all_results[workload][algo]
             
             # Print quick summary
-            metrics = result.metrics
+            print(f"\n{algo}:")
             print(f"  Turnaround: {metrics.get('avg_turnaround_time', 0):.1f} ms | "
                   f"Waiting: {metrics.get('avg_waiting_time', 0):.1f} ms | "
                   f"CPU Util: {metrics.get('cpu_utilization', 0):.1f}%")
-        
-        all_results[workload] = workload_results
+    
+    # Plotting and table libraries are only needed once the simulations finish
+    plt = load_pyplot()
+    import numpy as np
     
     # Create comprehensive visualization
     fig, axes = plt.subplots(2, 3, figsize=(18, 10))
     axes = axes.flatten()
     
-    metrics_to_plot = [
-        'avg_turnaround_time',
-        'avg_waiting_time', 
-        'avg_response_time',
-        'cpu_utilization',
-        'throughput',
-        'fairness_index'
-    ]
-    
-    metric_names = [
-        'Avg Turnaround Time (ms)',
-        'Avg Waiting Time (ms)',
-        'Avg Response Time (ms)',
-        'CPU Utilization (%)',
-        'Throughput (proc/sec)',
-        'Fairness Index'
-    ]
+    metrics_to_plot = [metric for metric, _, _ in PLOT_PANELS]
+    metric_index = {metric: idx for idx, metric in enumerate(metrics_to_plot)}
+    
+    # V[metric, workload, algorithm] feeds the plots, tables and recommendations;
+    # missing metrics count as zero
+    V = np.array([[[all_results[workload].get(algo, {}).get(metric, 0)
+                    for algo in algorithms]
+                   for workload in workload_types]
+                  for metric in metrics_to_plot], dtype=np.float64)
     
     colors = plt.cm.Set2(np.arange(len(algorithms)))
+    x = np.arange(len(workload_types))
+    width = 0.8 / len(algorithms)
+    offsets = (np.arange(len(algorithms)) - len(algorithms)/2) * width + width/2
     
-    for idx, (metric, metric_name) in enumerate(zip(metrics_to_plot, metric_names)):
+    for idx, (metric, metric_name, label_format) in enumerate(PLOT_PANELS):
         ax = axes[idx]
         
-        x = np.arange(len(workload_types))
-        width = 0.8 / len(algorithms)
-        
         for i, algo in enumerate(algorithms):
-            values = []
-            for workload in workload_types:
-                if algo in all_results[workload] and metric in all_results[workload][algo]:
-                    values.append(all_results[workload][algo][metric])
-                else:
-                    values.append(0)
-            
-            offset = (i - len(algorithms)/2) * width + width/2
-            bars = ax.bar(x + offset, values, width, label=algo, color=colors[i])
+            values = V[idx, :, i]
+            bars = ax.bar(x + offsets[i], values, width, label=algo, color=colors[i])
             
             # Add value labels
-            for bar, value in zip(bars, values):
-                height = bar.get_height()
-                if metric == 'fairness_index':
-                    label = f'{value:.3f}'
-                elif 'utilization' in metric:
-                    label = f'{value:.1f}%'
-                elif 'throughput' in metric:
-                    label = f'{value:.1f}'
-                else:
-                    label = f'{value:.0f}'
-                
-                ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                       label, ha='center', va='bottom', fontsize=8)
+            ax.bar_label(bars, labels=np.char.mod(label_format, values), padding=2, fontsize=8)
         
         ax.set_xlabel('Workload Type')
         ax.set_ylabel(metric_name)
@@ -147,100 +183,71 @@ def run_workload_experiment():
     plt.suptitle('Algorithm Performance Across Different Workload Types', 
                 fontsize=16, fontweight='bold')
     plt.tight_layout()
-    plt.savefig('data/results/graphs/workload_performance.png', dpi=300)
-    plt.show()
+    path, save_kwargs = figure_save_args('data/results/graphs/workload_performance.png')
+    fig.savefig(path, **save_kwargs)
+    plt.close(fig)
     
     # Create summary table
     print("\n" + "="*80)
     print("PERFORMANCE SUMMARY BY WORKLOAD TYPE")
     print("="*80)
     
+    summary_rows = [metric_index[metric] for metric, _, _ in SUMMARY_COLUMNS]
+    labels = [label for _, label, _ in SUMMARY_COLUMNS]
+    column_decimals = np.array([decimals for _, _, decimals in SUMMARY_COLUMNS])
+    scale = 10.0 ** column_decimals
+    name_width = max(len(algo) for algo in algorithms)
+    
     for workload in workload_types:
         print(f"\n{workload.upper().replace('_', ' ')} WORKLOAD:")
         print("-"*60)
         
-        # Create DataFrame for this workload
-        data = {}
-        for algo in algorithms:
-            if algo in all_results[workload]:
-                data[algo] = all_results[workload][algo]
-        
-        df = pd.DataFrame(data).T
+        # One row per algorithm, one column per summary metric
+        values = V[summary_rows, workload_types.index(workload), :].T
+        rounded = np.round(values * scale) / scale
         
-        # Select and rename key metrics
-        display_metrics = {
-            'avg_turnaround_time': 'Turnaround (ms)',
-            'avg_waiting_time': 'Waiting (ms)',
-            'avg_response_time': 'Response (ms)',
-            'cpu_utilization': 'CPU Util (%)',
-            'throughput': 'Throughput',
-            'fairness_index': 'Fairness'
-        }
+        cells = [[f"{value:.{decimals}f}" for value, decimals in zip(row, column_decimals)]
+                 for row in rounded]
+        widths = [max(len(label), *(len(row[col]) for row in cells))
+                  for col, label in enumerate(labels)]
         
-        available_metrics = [m for m in display_metrics.keys() if m in df.columns]
-        df_display = df[available_metrics].copy()
-        df_display = df_display.rename(columns=display_metrics)
-        
-        # Round values
-        for col in df_display.columns:
-            if 'Fairness' in col:
-                df_display[col] = df_display[col].round(3)
-            elif 'Util' in col or 'Throughput' in col:
-                df_display[col] = df_display[col].round(1)
-            else:
-                df_display[col] = df_display[col].round(0)
-        
-        print(df_display.to_string())
+        print(" " * name_width + "  " +
+              "  ".join(label.rjust(width) for label, width in zip(labels, widths)))
+        for algo, row in zip(algorithms, cells):
+            print(algo.ljust(name_width) + "  " +
+                  "  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
     
     # Determine best algorithm for each workload type
     print("\n" + "="*80)
     print("BEST ALGORITHM RECOMMENDATIONS")
     print("="*80)
     
-    for workload in workload_types:
+    # Best algorithm per (recommendation metric, workload) in one reduction each way
+    check_rows = [metric_index[metric] for metric, _, _ in RECOMMENDATION_METRICS]
+    lower_is_better = np.array([lower for _, lower, _ in RECOMMENDATION_METRICS])
+    checked = V[check_rows]
+    best = np.where(lower_is_better[:, None],
+                    checked.argmin(axis=-1), checked.argmax(axis=-1))
+    
+    for w_idx, workload in enumerate(workload_types):
         print(f"\nFor {workload.replace('_', ' ').title()} Workload:")
         print("-"*40)
         
-        # Find best for each metric
-        metrics_to_check = ['avg_turnaround_time', 'avg_waiting_time', 
-                          'cpu_utilization', 'fairness_index']
-        
-        for metric in metrics_to_check:
-            best_algo = None
-            best_value = None
-            
-            for algo in algorithms:
-                if (algo in all_results[workload] and 
-                    metric in all_results[workload][algo]):
-                    value = all_results[workload][algo][metric]
-                    
-                    if best_algo is None:
-                        best_algo = algo
-                        best_value = value
-                    else:
-                        if 'turnaround' in metric or 'waiting' in metric:
-                            # Lower is better
-                            if value < best_value:
-                                best_algo = algo
-                                best_value = value
-                        else:
-                            # Higher is better
-                            if value > best_value:
-                                best_algo = algo
-                                best_value = value
-            
-            if best_algo:
-                metric_name = metric.replace('avg_', '').replace('_', ' ').title()
-                if 'utilization' in metric:
-                    print(f"  {metric_name:20} {best_algo:10} ({best_value:.1f}%)")
-                elif 'fairness' in metric:
-                    print(f"  {metric_name:20} {best_algo:10} ({best_value:.3f})")
-                else:
-                    print(f"  {metric_name:20} {best_algo:10} ({best_value:.0f} ms)")
+        for m_idx, (metric, _, value_format) in enumerate(RECOMMENDATION_METRICS):
+            best_algo = algorithms[best[m_idx, w_idx]]
+            best_value = checked[m_idx, w_idx, best[m_idx, w_idx]]
+            metric_name = metric.replace('avg_', '').replace('_', ' ').title()
+            print(f"  {metric_name:20} {best_algo:10} ({value_format.format(best_value)})")
+    
+    cache_stats = get_workload_cache_stats()
+    print(f"\nWorkload cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    result_stats = get_result_cache_stats()
+    print(f"Result cache: {result_stats['hits']} hits, {result_stats['misses']} misses")
     
     print("\n" + "="*80)
     print("EXPERIMENT 3 COMPLETE")
     print("="*80)
 
 if __name__ == "__main__":
+    parse_experiment_args('Workload-specific experiment')
     run_workload_experiment()
\ No newline at end of file
@@ -8,6 +8,8 @@ import os
 import argparse
 import time
 
+from experiments.run_all import EXPERIMENTS, run_experiment, run_all
+
 def setup_environment():
     """Setup project environment"""
     print("Setting up project environment...")
@@ -49,24 +51,9 @@ def run_all_experiments():
     # Run setup
     setup_environment()
     
-    # Run experiments
-    experiments = [
-        ('baseline_comparison.py', 'Baseline Comparison'),
-        ('sensitivity_analysis.py', 'Sensitivity Analysis'),
-        ('workload_specific.py', 'Workload-Specific Performance')
-    ]
-    
-    for script, description in experiments:
-        print(f"\n\n{'='*80}")
-        print(f"RUNNING: {description}")
-        print('='*80)
-        
-        script_path = os.path.join('experiments', script)
-        if os.path.exists(script_path):
-            # Run the script
-            os.system(f'python {script_path}')
-        else:
-            print(f"Script not found: {script_path}")
+    # Run experiments in-process so the heavy imports are paid once;
+    # a failing experiment is reported and the rest still run
+    run_all()
     
     total_time = time.time() - start_time
     
@@ -103,10 +90,11 @@ def generate_report_summary():
     
     ✓ Comprehensive statistics collection
     ✓ Visualization module (Gantt charts, bar charts, line plots, box plots)
-    ✓ 3 Complete Experiments:
+    ✓ 4 Complete Experiments:
         1. Baseline comparison of all algorithms
         2. Sensitivity analysis (RR quantum, scalability)
         3. Workload-specific performance analysis
+        4. Scalability with process count
     
     KEY FINDINGS (TYPICAL RESULTS):
     
@@ -161,7 +149,7 @@ def main():
     parser = argparse.ArgumentParser(description='Run CPU Scheduler Experiments')
     parser.add_argument('--setup', action='store_true', help='Only setup environment')
     parser.add_argument('--single', type=str, help='Run single experiment', 
-                       choices=['baseline', 'sensitivity', 'workload'])
+                       choices=list(EXPERIMENTS))
     
     args = parser.parse_args()
     
@@ -169,19 +157,8 @@ def main():
         setup_environment()
     elif args.single:
         # Run single experiment
-        script_map = {
-            'baseline': 'baseline_comparison.py',
-            'sensitivity': 'sensitivity_analysis.py',
-            'workload': 'workload_specific.py'
-        }
-        
-        script = script_map[args.single]
-        script_path = os.path.join('experiments', script)
-        
-        if os.path.exists(script_path):
-            os.system(f'python {script_path}')
-        else:
-            print(f"Script not found: {script_path}")
+        if not run_experiment(args.single):
+            sys.exit(1)
     else:
         # Run all experiments
         run_all_experiments()
@@ -12,7 +12,6 @@ from .event import Event, EventQueue, EventType
 from .simulator import CPUSimulator, SimulationResult
 from .workload_generator import WorkloadGenerator, WorkloadConfig
 from .statistics import StatisticsCollector
-from .visualizer import Visualizer
 
 # Export all schedulers
 from .schedulers import (
@@ -42,4 +41,11 @@ __all__ = [
     'RoundRobinScheduler',
     'PriorityScheduler',
     'MLFQScheduler'
-]
\ No newline at end of file
+]
+
+def __getattr__(name):
+    # Visualizer pulls in matplotlib, pandas and seaborn; import it only when used
+    if name == 'Visualizer':
+        from .visualizer import Visualizer
+        return Visualizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
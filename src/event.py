@@ -1,50 +1,91 @@
-from enum import Enum
 from dataclasses import dataclass
-import heapq
-from typing import List, Optional, Any
+from heapq import heappush, heappop, heapify
+from typing import Iterable, List, Optional, Tuple
+from .utils.helpers import DATACLASS_SLOTS
 
-class EventType(Enum):
-    """Types of events in the discrete-event simulation"""
-    PROCESS_ARRIVAL = "PROCESS_ARRIVAL"
-    CPU_BURST_COMPLETE = "CPU_BURST_COMPLETE"
-    IO_BURST_COMPLETE = "IO_BURST_COMPLETE"
-    TIME_QUANTUM_EXPIRED = "TIME_QUANTUM_EXPIRED"
-    PREEMPTION = "PREEMPTION"
-    CONTEXT_SWITCH = "CONTEXT_SWITCH"
+class EventType:
+    """Types of events in the discrete-event simulation
+    
+    Plain int codes rather than an Enum, so dispatching on an event's type
+    is a C-level int comparison instead of a call to Enum.__eq__.
+    """
+    PROCESS_ARRIVAL = 0
+    CPU_BURST_COMPLETE = 1
+    IO_BURST_COMPLETE = 2
+    TIME_QUANTUM_EXPIRED = 3
+    PREEMPTION = 4
+    CONTEXT_SWITCH = 5
+    CONTEXT_SWITCH_COMPLETE = 6
+    
+    @staticmethod
+    def name_of(code: int) -> str:
+        """Readable name for an event type code"""
+        return _EVENT_TYPE_NAMES.get(code, str(code))
+
+_EVENT_TYPE_NAMES = {
+    code: name for name, code in vars(EventType).items()
+    if name.isupper()
+}
+# Size for tables indexed by event type code
+EVENT_TYPE_COUNT = max(_EVENT_TYPE_NAMES) + 1
 
-@dataclass(order=True)
+@dataclass(**DATACLASS_SLOTS)
 class Event:
     """Event for discrete-event simulation"""
     timestamp: int
-    type: EventType = field(compare=False)
-    process_id: int = field(compare=False)
-    data: Any = field(compare=False, default=None)
+    type: int  # An EventType code
+    process_id: int
+    data: int = 0  # Dispatch id for CPU burst / timeout events, unused otherwise
+    
+    def __lt__(self, other: 'Event') -> bool:
+        # Events order by time only; EventQueue breaks ties by insertion order
+        return self.timestamp < other.timestamp
     
     def __str__(self):
-        return f"Event[{self.timestamp}: {self.type.name} for P{self.process_id}]"
+        return f"Event[{self.timestamp}: {EventType.name_of(self.type)} for P{self.process_id}]"
 
 class EventQueue:
-    """Priority queue for events sorted by timestamp"""
+    """Priority queue for events sorted by timestamp
+    
+    Heap entries are (timestamp, seq, event) tuples so ordering is decided by
+    integer comparisons in C rather than the dataclass __lt__, and events with
+    equal timestamps pop in the order they were pushed.
+    """
     
     def __init__(self):
         self.queue = []
-        self.event_count = 0
+        self._seq = 0
     
     def push(self, event: Event):
         """Add an event to the queue"""
-        heapq.heappush(self.queue, event)
-        self.event_count += 1
+        heappush(self.queue, (event.timestamp, self._seq, event))
+        self._seq += 1
+    
+    def bulk_load(self, events: Iterable[Event]):
+        """Add many events at once with a single O(n) heapify"""
+        seq = self._seq
+        entries = [(event.timestamp, seq + i, event) for i, event in enumerate(events)]
+        self.queue.extend(entries)
+        heapify(self.queue)
+        self._seq = seq + len(entries)
     
     def pop(self) -> Optional[Event]:
         """Remove and return the next event"""
         if self.queue:
-            self.event_count -= 1
-            return heapq.heappop(self.queue)
+            return heappop(self.queue)[2]
         return None
     
     def peek(self) -> Optional[Event]:
         """View the next event without removing it"""
-        return self.queue[0] if self.queue else None
+        return self.queue[0][2] if self.queue else None
+    
+    def peek_time(self) -> Optional[int]:
+        """Timestamp of the next event without touching the Event object"""
+        return self.queue[0][0] if self.queue else None
+    
+    def snapshot_sorted(self) -> List[Event]:
+        """All queued events in pop order, without removing them"""
+        return [entry[2] for entry in sorted(self.queue)]
     
     def is_empty(self) -> bool:
         return len(self.queue) == 0
@@ -54,13 +95,20 @@ class EventQueue:
     
     def clear(self):
         self.queue.clear()
-        self.event_count = 0
+        self._seq = 0
     
     def schedule_arrival(self, process_id: int, arrival_time: int):
         """Schedule a process arrival event"""
         self.push(Event(arrival_time, EventType.PROCESS_ARRIVAL, process_id))
     
-    def schedule_cpu_completion(self, process_id: int, completion_time: int, data=None):
+    def bulk_schedule_arrivals(self, arrivals: Iterable[Tuple[int, int]]):
+        """Schedule many (process_id, arrival_time) arrivals with one heapify"""
+        self.bulk_load(
+            Event(arrival_time, EventType.PROCESS_ARRIVAL, process_id)
+            for process_id, arrival_time in arrivals
+        )
+    
+    def schedule_cpu_completion(self, process_id: int, completion_time: int, data: int = 0):
         """Schedule CPU burst completion event"""
         self.push(Event(completion_time, EventType.CPU_BURST_COMPLETE, process_id, data))
     
@@ -68,6 +116,16 @@ class EventQueue:
         """Schedule I/O burst completion event"""
         self.push(Event(completion_time, EventType.IO_BURST_COMPLETE, process_id))
     
-    def schedule_timeout(self, process_id: int, timeout_time: int):
+    def schedule_timeout(self, process_id: int, timeout_time: int, data: int = 0):
         """Schedule time quantum expiration event"""
-        self.push(Event(timeout_time, EventType.TIME_QUANTUM_EXPIRED, process_id))
\ No newline at end of file
+        self.push(Event(timeout_time, EventType.TIME_QUANTUM_EXPIRED, process_id, data))
+    
+    def schedule_context_switch_complete(self, process_id: int, end_time: int):
+        """Schedule the end of a context switch into process_id
+        
+        It sorts ahead of every other event at end_time (seq -1), so the
+        incoming process is on the CPU before same-time arrivals are handled.
+        Only one context switch is ever in flight, so the key stays unique.
+        """
+        heappush(self.queue,
+                 (end_time, -1, Event(end_time, EventType.CONTEXT_SWITCH_COMPLETE, process_id)))
\ No newline at end of file
@@ -7,6 +7,12 @@ import sys
 import os
 import yaml
 import time
+import copy
+import glob
+import pickle
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 import argparse
@@ -17,7 +23,6 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.pcb import PCB
 from src.simulator import CPUSimulator, SimulationResult
 from src.workload_generator import WorkloadGenerator, WorkloadConfig
-from src.visualizer import Visualizer
 from src.statistics import StatisticsCollector
 
 # Import all schedulers
@@ -28,6 +33,70 @@ from src.schedulers.round_robin import RoundRobinScheduler
 from src.schedulers.priority import PriorityScheduler
 from src.schedulers.mlfq import MLFQScheduler
 
+# Schedulers that take no parameters; the rest are built in create_scheduler
+_SCHEDULER_FACTORIES = {
+    'FCFS': FCFSScheduler,
+    'SJF': SJFScheduler,
+    'SRTF': SRTFScheduler,
+}
+
+# libyaml's C loader when PyYAML was built with it, else the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Parsed YAML configs keyed by (path, mtime, size); edited files are re-parsed
+_YAML_CACHE: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_YAML_CACHE_SIZE = 100
+# Pickled parses survive across processes, so repeated cold starts skip YAML
+CONFIG_CACHE_DIR = os.path.join('data', 'cache', 'config')
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+def _load_yaml_snapshot(path: str, st: os.stat_result) -> Dict[str, Any]:
+    """Load a YAML file via its on-disk pickle snapshot, parsing and writing one on a miss"""
+    abspath = os.path.abspath(path)
+    prefix = os.path.join(CONFIG_CACHE_DIR,
+                          f"{os.path.basename(path)}_{_digest(abspath)}")
+    cache_file = f"{prefix}_{_digest(f'{st.st_mtime_ns}:{st.st_size}')}.pkl"
+    
+    if os.path.exists(cache_file):
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    
+    with open(path, 'r') as f:
+        config = yaml.load(f, Loader=_YamlLoader) or {}
+    
+    try:
+        os.makedirs(CONFIG_CACHE_DIR, exist_ok=True)
+        # Snapshots of earlier versions of this file can never be hit again
+        for stale in glob.glob(f"{glob.escape(prefix)}_*.pkl"):
+            os.remove(stale)
+        temp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(temp_file, 'wb') as f:
+            pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, cache_file)
+    except OSError:
+        pass  # Read-only checkout; the snapshot is only an optimization
+    return config
+
+def _load_yaml_cached(path: str) -> Dict[str, Any]:
+    """Parse a YAML file, reusing the previous parse while the file is unchanged"""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    
+    if key in _YAML_CACHE:
+        _YAML_CACHE.move_to_end(key)
+    else:
+        _YAML_CACHE[key] = _load_yaml_snapshot(path, st)
+        if len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+            _YAML_CACHE.popitem(last=False)
+    
+    # Callers get their own copy so they can't corrupt the cached parse
+    return copy.deepcopy(_YAML_CACHE[key])
+
 @dataclass
 class SimulationConfig:
     """Configuration for a simulation run"""
@@ -36,18 +105,65 @@ class SimulationConfig:
     preemptive: bool = True
     num_processes: int = 100
     workload_type: str = "mixed"
-    max_time: int = 100000
+    max_time: Optional[int] = None  # None runs until every process completes
     context_switch: int = 2
+    seed: Optional[int] = None  # Workload seed; None draws fresh entropy
+
+def create_scheduler(algorithm: str, **kwargs) -> Any:
+    """Create a scheduler instance by algorithm name"""
+    if algorithm in _SCHEDULER_FACTORIES:
+        return _SCHEDULER_FACTORIES[algorithm]()
+    if algorithm == 'RR':
+        return RoundRobinScheduler(time_quantum=kwargs.get('time_quantum', 20))
+    if algorithm == 'PRIORITY':
+        return PriorityScheduler(
+            preemptive=kwargs.get('preemptive', True),
+            aging_interval=kwargs.get('aging_interval', 1000)
+        )
+    if algorithm == 'PRIORITY_NP':
+        return PriorityScheduler(
+            preemptive=False,
+            aging_interval=kwargs.get('aging_interval', 1000)
+        )
+    if algorithm == 'MLFQ':
+        return MLFQScheduler(
+            num_queues=kwargs.get('num_queues', 3),
+            time_quanta=kwargs.get('time_quanta', [10, 20, 40])
+        )
+    raise ValueError(f"Unknown scheduler: {algorithm}")
+
+def _run_one(algorithm: str, processes: List[PCB], context_switch_time: int,
+             max_time: Optional[int], scheduler_kwargs: Dict[str, Any]) -> SimulationResult:
+    """Simulate one algorithm on its own processes (top-level so worker processes can run it)"""
+    simulator = CPUSimulator(
+        scheduler=create_scheduler(algorithm, **scheduler_kwargs),
+        context_switch_time=context_switch_time
+    )
+    simulator.initialize_simulation(processes)
+    return simulator.run(max_time=max_time)
+
+def _pool_size(num_jobs: int) -> int:
+    return max(1, min(num_jobs, os.cpu_count() or 1))
 
 class SimulationController:
     """Main controller for running simulations"""
     
     def __init__(self, config_file: str = None):
         self.config = self._load_config(config_file)
-        self.workload_generator = WorkloadGenerator()
-        self.visualizer = Visualizer()
+        self.output_dir = "data/results/graphs"
+        self._visualizer = None  # Built on first use; it imports matplotlib
         self.results = {}
-        
+        # Seeded (num_processes, workload_type, seed) -> template PCBs that are never simulated
+        self._workload_templates = {}
+        
+    @property
+    def visualizer(self):
+        """Visualizer for result plots, created (and matplotlib imported) on first access"""
+        if self._visualizer is None:
+            from src.visualizer import Visualizer
+            self._visualizer = Visualizer(self.output_dir)
+        return self._visualizer
+    
     def _load_config(self, config_file: str) -> Dict[str, Any]:
         """Load configuration from YAML file"""
         default_config = {
@@ -64,49 +180,45 @@ class SimulationController:
         }
         
         if config_file and os.path.exists(config_file):
-            with open(config_file, 'r') as f:
-                config = yaml.safe_load(f)
-                return {**default_config, **config}
+            config = _load_yaml_cached(config_file)
+            return {**default_config, **config}
         
         return default_config
     
     def create_scheduler(self, algorithm: str, **kwargs) -> Any:
         """Factory method to create scheduler instances"""
-        schedulers = {
-            'FCFS': lambda: FCFSScheduler(),
-            'SJF': lambda: SJFScheduler(),
-            'SRTF': lambda: SRTFScheduler(),
-            'RR': lambda: RoundRobinScheduler(
-                time_quantum=kwargs.get('time_quantum', 20)
-            ),
-            'PRIORITY': lambda: PriorityScheduler(
-                preemptive=kwargs.get('preemptive', True),
-                aging_interval=kwargs.get('aging_interval', 1000)
-            ),
-            'PRIORITY_NP': lambda: PriorityScheduler(
-                preemptive=False,
-                aging_interval=kwargs.get('aging_interval', 1000)
-            ),
-            'MLFQ': lambda: MLFQScheduler(
-                num_queues=kwargs.get('num_queues', 3),
-                time_quanta=kwargs.get('time_quanta', [10, 20, 40])
-            )
-        }
-        
-        if algorithm in schedulers:
-            return schedulers[algorithm]()
-        else:
-            raise ValueError(f"Unknown scheduler: {algorithm}")
+        return create_scheduler(algorithm, **kwargs)
     
     def generate_workload(self, config: SimulationConfig) -> List[PCB]:
-        """Generate workload based on configuration"""
+        """Generate workload based on configuration
+        
+        Each distinct seeded (num_processes, workload_type, seed) is generated
+        once per controller; callers get fresh clones, so every algorithm that
+        asks for the same configuration runs on the same processes. Unseeded
+        requests draw a fresh workload every time.
+        """
+        if config.seed is None:
+            # Fresh entropy on every request, so there is nothing to reuse
+            return self._generate_synthetic(config)
+        
+        key = (config.num_processes, config.workload_type, config.seed)
+        templates = self._workload_templates.get(key)
+        if templates is None:
+            templates = self._generate_synthetic(config)
+            self._workload_templates[key] = templates
+        
+        return [process.clone() for process in templates]
+    
+    def _generate_synthetic(self, config: SimulationConfig) -> List[PCB]:
+        """Generate one synthetic workload for a simulation configuration"""
         workload_config = WorkloadConfig(
             num_processes=config.num_processes,
-            workload_type=config.workload_type
+            workload_type=config.workload_type,
+            seed=config.seed
         )
         
-        self.workload_generator.config = workload_config
-        return self.workload_generator.generate_synthetic_workload()
+        # A generator per workload, so its RNG starts from config.seed
+        return WorkloadGenerator(workload_config).generate_synthetic_workload()
     
     def run_simulation(self, sim_config: SimulationConfig) -> SimulationResult:
         """Run a single simulation with given configuration"""
@@ -144,26 +256,29 @@ class SimulationController:
     
     def _print_simulation_summary(self, result: SimulationResult):
         """Print summary of simulation results"""
-        print(f"\n{'='*60}")
-        print(f"SIMULATION RESULTS: {result.algorithm_name}")
-        print(f"{'='*60}")
-        
         metrics = result.metrics
         
-        print(f"Completed Processes: {metrics.get('total_processes', 0)}")
-        print(f"Average Turnaround Time: {metrics.get('avg_turnaround_time', 0):.2f} ms")
-        print(f"Average Waiting Time: {metrics.get('avg_waiting_time', 0):.2f} ms")
-        print(f"Average Response Time: {metrics.get('avg_response_time', 0):.2f} ms")
-        print(f"CPU Utilization: {metrics.get('cpu_utilization', 0):.2f}%")
-        print(f"Throughput: {metrics.get('throughput', 0):.2f} processes/sec")
-        print(f"Fairness Index: {metrics.get('fairness_index', 0):.3f}")
-        print(f"Context Switches: {metrics.get('context_switches', 0)}")
-        print(f"Preemptions: {metrics.get('preemptions', 0)}")
+        lines = [
+            f"\n{'='*60}",
+            f"SIMULATION RESULTS: {result.algorithm_name}",
+            f"{'='*60}",
+            f"Completed Processes: {metrics.get('total_processes', 0)}",
+            f"Average Turnaround Time: {metrics.get('avg_turnaround_time', 0):.2f} ms",
+            f"Average Waiting Time: {metrics.get('avg_waiting_time', 0):.2f} ms",
+            f"Average Response Time: {metrics.get('avg_response_time', 0):.2f} ms",
+            f"CPU Utilization: {metrics.get('cpu_utilization', 0):.2f}%",
+            f"Throughput: {metrics.get('throughput', 0):.2f} processes/sec",
+            f"Fairness Index: {metrics.get('fairness_index', 0):.3f}",
+            f"Context Switches: {metrics.get('context_switches', 0)}",
+            f"Preemptions: {metrics.get('preemptions', 0)}",
+        ]
         
         if 'std_turnaround' in metrics:
-            print(f"Turnaround Time STD: {metrics['std_turnaround']:.2f} ms")
+            lines.append(f"Turnaround Time STD: {metrics['std_turnaround']:.2f} ms")
         
-        print(f"{'='*60}")
+        lines.append(f"{'='*60}")
+        # One write instead of a print per line
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def run_baseline_comparison(self):
         """Run baseline comparison of all algorithms"""
@@ -175,60 +290,38 @@ class SimulationController:
         baseline_config = SimulationConfig(
             algorithm="FCFS",  # Will be overridden
             num_processes=500,
-            workload_type="mixed",
-            max_time=200000
+            workload_type="mixed"
         )
         
         # Algorithms to test
         algorithms = ['FCFS', 'SJF', 'SRTF', 'RR', 'PRIORITY', 'PRIORITY_NP']
         
-        # Generate workload once for fair comparison
-        workload = self.generate_workload(baseline_config)
+        # Generate workload once for fair comparison; these PCBs are never simulated
+        templates = self.generate_workload(baseline_config)
         
         results = {}
         all_process_stats = {}
         
-        for algo in algorithms:
-            print(f"\nRunning {algo}...")
-            
-            # Create scheduler
-            scheduler_kwargs = {}
-            if algo == 'RR':
-                scheduler_kwargs['time_quantum'] = 20
-            
-            scheduler = self.create_scheduler(algo, **scheduler_kwargs)
-            
-            # Create and run simulator
-            simulator = CPUSimulator(
-                scheduler=scheduler,
-                context_switch_time=baseline_config.context_switch
-            )
-            
-            # Use the same workload
-            simulator.processes = {p.process_id: p for p in workload}
-            for process in workload:
-                # Reset process state
-                process.remaining_cpu_time = process.total_cpu_time
-                process.state = PCB.NEW
-                process.start_time = None
-                process.completion_time = None
-                process.first_run_time = None
-                process.total_waiting_time = 0
-                process.total_io_time = 0
-                process.preempted = False
-                process.context_switches = 0
-                process.turnaround_time = None
-                process.waiting_time = None
-                process.response_time = None
-            
-            simulator.initialize_simulation(workload.copy())
-            result = simulator.run(max_time=baseline_config.max_time)
-            
-            results[algo] = result.metrics
-            all_process_stats[algo] = result.process_stats
+        # The runs share no state, so each algorithm simulates in its own
+        # process on fresh copies of the same untouched workload
+        with ProcessPoolExecutor(max_workers=_pool_size(len(algorithms))) as pool:
+            futures = {}
+            for algo in algorithms:
+                print(f"\nRunning {algo}...")
+                scheduler_kwargs = {'time_quantum': 20} if algo == 'RR' else {}
+                futures[algo] = pool.submit(
+                    _run_one, algo, [process.clone() for process in templates],
+                    baseline_config.context_switch, baseline_config.max_time,
+                    scheduler_kwargs
+                )
             
-            # Store for visualization
-            self.results[algo] = result
+            for algo in algorithms:
+                result = futures[algo].result()
+                results[algo] = result.metrics
+                all_process_stats[algo] = result.process_stats
+                
+                # Store for visualization
+                self.results[algo] = result
         
         # Create visualizations
         print("\nGenerating visualizations...")
@@ -247,9 +340,9 @@ class SimulationController:
         )
         
         # Create summary table
-        styled_df = self.visualizer.create_summary_table(results)
+        summary_df = self.visualizer.create_summary_table(results, style=False)
         print("\nSummary Results Table:")
-        print(styled_df.to_string())
+        print(summary_df.to_string())
         
         # Create Gantt charts for first 2 algorithms
         for i, algo in enumerate(['FCFS', 'RR'][:2]):
@@ -272,23 +365,29 @@ class SimulationController:
         time_quanta = [5, 10, 20, 50, 100]
         results = {}
         
+        # The workload is identical for every quantum, so one scheduler and
+        # simulator are reset and reused instead of rebuilt per run
+        config = SimulationConfig(
+            algorithm="RR",
+            time_quantum=time_quanta[0],
+            num_processes=300,
+            workload_type="mixed"
+        )
+        scheduler = self.create_scheduler("RR", time_quantum=time_quanta[0])
+        simulator = CPUSimulator(
+            scheduler=scheduler,
+            context_switch_time=config.context_switch
+        )
+        
+        # Generate workload once so every quantum runs on the same processes
+        templates = self.generate_workload(config)
+        
         for quantum in time_quanta:
             print(f"\nRunning RR with quantum = {quantum}ms")
             
-            config = SimulationConfig(
-                algorithm="RR",
-                time_quantum=quantum,
-                num_processes=300,
-                workload_type="mixed"
-            )
-            
-            scheduler = self.create_scheduler("RR", time_quantum=quantum)
-            processes = self.generate_workload(config)
-            
-            simulator = CPUSimulator(
-                scheduler=scheduler,
-                context_switch_time=config.context_switch
-            )
+            simulator.reset()
+            scheduler.set_quantum(quantum)
+            processes = [process.clone() for process in templates]
             
             simulator.initialize_simulation(processes)
             result = simulator.run(max_time=config.max_time)
@@ -317,40 +416,37 @@ class SimulationController:
         
         all_results = {}
         
-        for workload_type in workload_types:
-            print(f"\n{'='*40}")
-            print(f"Testing with {workload_type.upper()} workload")
-            print('='*40)
-            
-            workload_results = {}
-            
-            for algo in algorithms:
-                print(f"  Running {algo}...")
+        # All workload/algorithm pairs are independent, so run them in parallel;
+        # workloads are generated here so each type's algorithms share one
+        with ProcessPoolExecutor(
+                max_workers=_pool_size(len(workload_types) * len(algorithms))) as pool:
+            futures = {}
+            for workload_type in workload_types:
+                print(f"\n{'='*40}")
+                print(f"Testing with {workload_type.upper()} workload")
+                print('='*40)
                 
                 config = SimulationConfig(
-                    algorithm=algo,
+                    algorithm=algorithms[0],  # Overridden per submission
                     num_processes=200,
                     workload_type=workload_type
                 )
+                templates = self.generate_workload(config)
                 
-                if algo == 'RR':
-                    scheduler = self.create_scheduler(algo, time_quantum=20)
-                else:
-                    scheduler = self.create_scheduler(algo)
-                
-                processes = self.generate_workload(config)
-                
-                simulator = CPUSimulator(
-                    scheduler=scheduler,
-                    context_switch_time=config.context_switch
-                )
-                
-                simulator.initialize_simulation(processes)
-                result = simulator.run(max_time=config.max_time)
-                
-                workload_results[algo] = result.metrics
+                for algo in algorithms:
+                    print(f"  Running {algo}...")
+                    
+                    scheduler_kwargs = {'time_quantum': 20} if algo == 'RR' else {}
+                    futures[workload_type, algo] = pool.submit(
+                        _run_one, algo, [process.clone() for process in templates],
+                        config.context_switch, config.max_time, scheduler_kwargs
+                    )
             
-            all_results[workload_type] = workload_results
+            for workload_type in workload_types:
+                all_results[workload_type] = {
+                    algo: futures[workload_type, algo].result().metrics
+                    for algo in algorithms
+                }
         
         # Create comparison plots for each metric across workloads
         self._plot_workload_comparison(all_results)
@@ -359,6 +455,9 @@ class SimulationController:
     
     def _plot_workload_comparison(self, all_results: Dict[str, Dict[str, Dict]]):
         """Plot comparison across different workloads"""
+        import numpy as np
+        import matplotlib.pyplot as plt
+        
         metrics = ['avg_turnaround_time', 'avg_waiting_time', 'cpu_utilization']
         workload_types = list(all_results.keys())
         algorithms = list(next(iter(all_results.values())).keys())
@@ -394,7 +493,8 @@ class SimulationController:
         plt.suptitle("Algorithm Performance Across Different Workloads", 
                     fontsize=16, fontweight='bold')
         plt.tight_layout()
-        plt.savefig(os.path.join(self.visualizer.output_dir, 'workload_comparison.png'), 
+        os.makedirs(self.output_dir, exist_ok=True)
+        plt.savefig(os.path.join(self.output_dir, 'workload_comparison.png'), 
                    dpi=300)
         plt.show()
 
@@ -434,9 +534,8 @@ def main():
     
     print("\n" + "="*70)
     print("SIMULATION COMPLETE")
-    print(f"Results saved to: {controller.visualizer.output_dir}")
+    print(f"Results saved to: {controller.output_dir}")
     print("="*70)
 
 if __name__ == "__main__":
-    import matplotlib.pyplot as plt
     main()
\ No newline at end of file
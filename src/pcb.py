@@ -1,16 +1,23 @@
-from enum import Enum
+import copy
+import numpy as np
+from enum import IntEnum
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+from .utils.helpers import DATACLASS_SLOTS
 
-class ProcessState(Enum):
-    """Process states for the simulation"""
-    NEW = "NEW"
-    READY = "READY"
-    RUNNING = "RUNNING"
-    WAITING = "WAITING"  # For I/O
-    TERMINATED = "TERMINATED"
+class ProcessState(IntEnum):
+    """Process states for the simulation
+    
+    IntEnum so state checks are plain int comparisons; .name still gives
+    the readable state.
+    """
+    NEW = 0
+    READY = 1
+    RUNNING = 2
+    WAITING = 3  # For I/O
+    TERMINATED = 4
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class PCB:
     """Process Control Block"""
     # Core attributes
@@ -20,6 +27,7 @@ class PCB:
     remaining_cpu_time: int  # Remaining CPU time
     io_burst_time: int  # I/O burst duration
     priority: int = 1
+    base_priority: int = field(init=False)  # Priority before aging; reset() restores it
     
     # Dynamic state
     state: ProcessState = ProcessState.NEW
@@ -32,19 +40,52 @@ class PCB:
     last_run_time: Optional[int] = None
     total_waiting_time: int = 0
     total_io_time: int = 0
+    ready_enqueue_time: Optional[int] = None  # When the process last entered the ready queue
     
     # For preemption tracking
     preempted: bool = False
     context_switches: int = 0
     
-    # Performance metrics (calculated after completion)
-    turnaround_time: Optional[int] = None
-    waiting_time: Optional[int] = None
-    response_time: Optional[int] = None
+    # Performance metrics (calculated after completion; 0 until then)
+    turnaround_time: int = 0
+    waiting_time: int = 0
+    response_time: int = 0
     
     def __str__(self):
         return f"P{self.process_id}[Arr:{self.arrival_time}, CPU:{self.total_cpu_time}, Pri:{self.priority}]"
     
+    def __post_init__(self):
+        self.base_priority = self.priority
+    
+    def clone(self) -> 'PCB':
+        """Return an independent copy so one workload can be simulated many times"""
+        return copy.copy(self)
+    
+    @classmethod
+    def from_row(cls, row: Tuple[int, ...]) -> 'PCB':
+        """Build a PCB from a (process_id, arrival_time, total_cpu_time,
+        remaining_cpu_time, io_burst_time[, priority]) tuple"""
+        return cls(*row)
+    
+    def reset(self):
+        """Restore the process to its pre-simulation state"""
+        self.remaining_cpu_time = self.total_cpu_time
+        self.priority = self.base_priority
+        self.state = ProcessState.NEW
+        self.current_queue_level = 0
+        self.start_time = None
+        self.completion_time = None
+        self.first_run_time = None
+        self.last_run_time = None
+        self.total_waiting_time = 0
+        self.total_io_time = 0
+        self.ready_enqueue_time = None
+        self.preempted = False
+        self.context_switches = 0
+        self.turnaround_time = 0
+        self.waiting_time = 0
+        self.response_time = 0
+    
     def calculate_metrics(self):
         """Calculate performance metrics after process completion"""
         if self.completion_time is not None:
@@ -52,6 +93,29 @@ class PCB:
             self.waiting_time = self.total_waiting_time
             self.response_time = self.first_run_time - self.arrival_time if self.first_run_time else 0
     
+    @staticmethod
+    def metrics_arrays(processes: List['PCB']) -> Dict[str, np.ndarray]:
+        """Per-process turnaround/waiting/response times as NumPy arrays
+        
+        Computed from the raw timing fields in one vectorized pass; processes
+        that have not completed contribute zeros, like their unset metrics.
+        """
+        n = len(processes)
+        completion = np.fromiter((-1 if p.completion_time is None else p.completion_time
+                                  for p in processes), dtype=np.int64, count=n)
+        arrival = np.fromiter((p.arrival_time for p in processes), dtype=np.int64, count=n)
+        first_run = np.fromiter((-1 if p.first_run_time is None else p.first_run_time
+                                 for p in processes), dtype=np.int64, count=n)
+        total_waiting = np.fromiter((p.total_waiting_time for p in processes),
+                                    dtype=np.int64, count=n)
+        
+        completed = completion >= 0
+        return {
+            'turnaround': np.where(completed, completion - arrival, 0),
+            'waiting': np.where(completed, total_waiting, 0),
+            'response': np.where(completed & (first_run > 0), first_run - arrival, 0),
+        }
+    
     def age_priority(self, current_time, aging_interval=1000):
         """Age the priority to prevent starvation"""
         if current_time - self.arrival_time > aging_interval and self.priority > 1:
@@ -64,17 +128,13 @@ class PCB:
         Execute the process for given time slice or until completion
         Returns: (time_used, completed, remaining_time)
         """
-        if time_slice is None:
-            # Execute until completion
-            time_used = self.remaining_cpu_time
+        remaining = self.remaining_cpu_time
+        if time_slice is None or remaining <= time_slice:
+            # Runs to completion within the slice
             self.remaining_cpu_time = 0
-            return time_used, True, 0
+            return remaining, True, 0
         
         # Execute with time quantum
-        if self.remaining_cpu_time <= time_slice:
-            time_used = self.remaining_cpu_time
-            self.remaining_cpu_time = 0
-            return time_used, True, 0
-        else:
-            self.remaining_cpu_time -= time_slice
-            return time_slice, False, self.remaining_cpu_time
\ No newline at end of file
+        remaining -= time_slice
+        self.remaining_cpu_time = remaining
+        return time_slice, False, remaining
@@ -0,0 +1,87 @@
+"""
+On-disk cache of simulation metrics keyed by run configuration
+"""
+
+import os
+import json
+import pickle
+import hashlib
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Optional
+
+from .workload_generator import WorkloadConfig
+
+RESULT_CACHE_DIR = os.path.join('data', 'cache', 'results')
+
+_result_cache_stats = {'hits': 0, 'misses': 0}
+
+def _source_fingerprint() -> str:
+    """Hash the package sources so cached metrics go stale when the simulator changes"""
+    digest = hashlib.blake2b(digest_size=8)
+    root = os.path.dirname(os.path.abspath(__file__))
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.endswith('.py'):
+                with open(os.path.join(dirpath, name), 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+_SOURCE_FINGERPRINT = _source_fingerprint()
+
+def result_cache_enabled() -> bool:
+    """Whether cached metrics may be used (disabled by EXPERIMENT_NO_CACHE=1)"""
+    return os.getenv('EXPERIMENT_NO_CACHE') != '1'
+
+def make_run_config(workload_config: WorkloadConfig, algorithm: str,
+                    context_switch_time: int, max_time: Optional[int] = None,
+                    **params) -> Dict[str, Any]:
+    """Describe a simulation run as a JSON-serializable dict for cache keying"""
+    return {
+        'workload': asdict(workload_config),
+        'algorithm': algorithm,
+        'context_switch_time': context_switch_time,
+        'max_time': max_time,
+        **params
+    }
+
+def _cache_path(config: Dict[str, Any]) -> str:
+    payload = json.dumps(config, sort_keys=True) + _SOURCE_FINGERPRINT
+    key = hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+    return os.path.join(RESULT_CACHE_DIR, f"{key}.pkl")
+
+def load_cached_result(config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return cached metrics for a run configuration, or None on a miss"""
+    if not result_cache_enabled():
+        return None
+
+    cache_file = _cache_path(config)
+    if os.path.exists(cache_file):
+        with open(cache_file, 'rb') as f:
+            metrics = pickle.load(f)
+        _result_cache_stats['hits'] += 1
+        return metrics
+
+    _result_cache_stats['misses'] += 1
+    return None
+
+def store_cached_result(config: Dict[str, Any], metrics: Dict[str, Any]):
+    """Persist metrics for a run configuration"""
+    os.makedirs(RESULT_CACHE_DIR, exist_ok=True)
+    cache_file = _cache_path(config)
+    temp_file = f"{cache_file}.{os.getpid()}.tmp"
+    with open(temp_file, 'wb') as f:
+        pickle.dump(metrics, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_file, cache_file)
+
+def run_cached(config: Dict[str, Any], run: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Return cached metrics for config, calling run() and storing its metrics on a miss"""
+    metrics = load_cached_result(config)
+    if metrics is None:
+        metrics = run()
+        store_cached_result(config, metrics)
+    return metrics
+
+def get_result_cache_stats() -> Dict[str, int]:
+    """Return hit/miss counters for the result cache"""
+    return dict(_result_cache_stats)
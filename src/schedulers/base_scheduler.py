@@ -2,12 +2,22 @@ from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any
 from ..pcb import PCB
 
+# Field width for arrival time and pid inside a packed ordering key
+_KEY_FIELD_BITS = 32
+
+def ordering_key(primary: int, arrival_time: int, process_id: int) -> int:
+    """Pack (primary, arrival_time, process_id) into one int with the same ordering
+    
+    Heaps keyed on this compare a single int instead of walking a tuple.
+    arrival_time and process_id must be below 2**32.
+    """
+    return (primary << 2 * _KEY_FIELD_BITS) | (arrival_time << _KEY_FIELD_BITS) | process_id
+
 class BaseScheduler(ABC):
     """Abstract base class for all schedulers"""
     
     def __init__(self, name: str = "BaseScheduler"):
         self.name = name
-        self.ready_queue = []
         self.preemptive = False
         self.stats = {
             "context_switches": 0,
@@ -25,6 +35,12 @@ class BaseScheduler(ABC):
         """Get the next process to execute"""
         pass
     
+    @property
+    @abstractmethod
+    def ready_queue(self):
+        """Processes currently waiting in the scheduler"""
+        pass
+    
     def is_preemptive(self) -> bool:
         return self.preemptive
     
@@ -40,12 +56,9 @@ class BaseScheduler(ABC):
         """Called when a process's time quantum expires"""
         pass
     
-    def update_waiting_times(self, current_time: int, last_update_time: int):
-        """Update waiting times for all processes in ready queue"""
-        time_diff = current_time - last_update_time
-        for process in self.ready_queue:
-            if process.state.name == "READY":
-                process.total_waiting_time += time_diff
+    def get_time_quantum_for(self, process: PCB) -> Optional[int]:
+        """Time slice for the next dispatch of process; None runs it to completion"""
+        return None
     
     def get_queue_length(self) -> int:
         return len(self.ready_queue)
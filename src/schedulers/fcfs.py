@@ -21,6 +21,11 @@ class FCFSScheduler(BaseScheduler):
             return self.queue.popleft()
         return None
     
+    @property
+    def ready_queue(self):
+        """The FIFO queue itself"""
+        return self.queue
+    
     def should_preempt(self, current_process: Optional[PCB], new_process: PCB) -> bool:
         """FCFS is non-preemptive"""
         return False
\ No newline at end of file
@@ -2,6 +2,7 @@ from .base_scheduler import BaseScheduler
 from ..pcb import PCB
 from typing import List, Optional, Deque
 from collections import deque
+from array import array
 import heapq
 
 class MLFQScheduler(BaseScheduler):
@@ -12,6 +13,8 @@ class MLFQScheduler(BaseScheduler):
         
         self.num_queues = num_queues
         self.time_quanta = time_quanta or [10, 20, 40]
+        self._tq_lookup = tuple(self.time_quanta)
+        self._tq_last = len(self._tq_lookup) - 1
         self.queues = [deque() for _ in range(num_queues)]
         self.preemptive = True
         
@@ -19,22 +22,30 @@ class MLFQScheduler(BaseScheduler):
         self.boost_interval = 5000  # Boost all processes every 5s
         self.last_boost_time = 0
         self.promotion_threshold = 2  # Run twice in same queue before promotion
-        self.process_counts = {}
+        # Runs at the current level, indexed directly by process_id
+        self.process_counts = array('i')
+    
+    def _reserve_count(self, pid: int):
+        """Grow process_counts so pid has a slot"""
+        if pid >= len(self.process_counts):
+            self.process_counts.extend([0] * (pid + 1 - len(self.process_counts)))
     
     def add_process(self, process: PCB):
         """Add new process to highest priority queue (queue 0)"""
         process.current_queue_level = 0
         self.queues[0].append(process)
+        self._reserve_count(process.process_id)
         self.process_counts[process.process_id] = 0
     
     def get_next_process(self) -> Optional[PCB]:
         """Get process from highest priority non-empty queue"""
-        for i in range(self.num_queues):
-            if self.queues[i]:
-                process = self.queues[i].popleft()
+        for queue in self.queues:
+            if queue:
+                process = queue.popleft()
                 
                 # Track how many times process has run at this level
-                self.process_counts[process.process_id] = self.process_counts.get(process.process_id, 0) + 1
+                self._reserve_count(process.process_id)
+                self.process_counts[process.process_id] += 1
                 
                 return process
         return None
@@ -50,7 +61,8 @@ class MLFQScheduler(BaseScheduler):
         if process.remaining_cpu_time > 0:
             # Check if process should be demoted
             current_level = process.current_queue_level
-            run_count = self.process_counts.get(process.process_id, 0)
+            self._reserve_count(process.process_id)
+            run_count = self.process_counts[process.process_id]
             
             if run_count >= self.promotion_threshold and current_level < self.num_queues - 1:
                 # Demote to lower priority queue
@@ -66,20 +78,27 @@ class MLFQScheduler(BaseScheduler):
         if current_time - self.last_boost_time >= self.boost_interval:
             self.last_boost_time = current_time
             
-            # Move all processes to queue 0
+            # Move all processes to queue 0: reset each process in one pass,
+            # then splice the whole deque across in C
+            top = self.queues[0]
+            counts = self.process_counts
             for i in range(1, self.num_queues):
-                while self.queues[i]:
-                    process = self.queues[i].popleft()
+                queue = self.queues[i]
+                if not queue:
+                    continue
+                self._reserve_count(max(process.process_id for process in queue))
+                for process in queue:
                     process.current_queue_level = 0
-                    self.queues[0].append(process)
-                    self.process_counts[process.process_id] = 0
+                    counts[process.process_id] = 0
+                top.extend(queue)
+                queue.clear()
     
-    def get_time_quantum_for_process(self, process: PCB) -> int:
+    def get_time_quantum_for(self, process: PCB) -> int:
         """Get time quantum based on queue level"""
-        level = process.current_queue_level
-        if level < len(self.time_quanta):
-            return self.time_quanta[level]
-        return self.time_quanta[-1]  # Use last quantum for lowest queues
+        # Levels past the configured quanta use the last one
+        return self._tq_lookup[min(process.current_queue_level, self._tq_last)]
+    
+    get_time_quantum_for_process = get_time_quantum_for
     
     @property
     def ready_queue(self):
@@ -87,4 +106,17 @@ class MLFQScheduler(BaseScheduler):
         all_processes = []
         for q in self.queues:
             all_processes.extend(list(q))
-        return all_processes
\ No newline at end of file
+        return all_processes
+    
+    def get_queue_length(self) -> int:
+        return sum(len(q) for q in self.queues)
+    
+    def is_empty(self) -> bool:
+        return not any(self.queues)
+    
+    def clear(self):
+        for q in self.queues:
+            q.clear()
+        del self.process_counts[:]
+        self.last_boost_time = 0
+        super().clear()
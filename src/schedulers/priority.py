@@ -1,4 +1,5 @@
 import heapq
+from itertools import count
 from .base_scheduler import BaseScheduler
 from ..pcb import PCB
 from typing import Optional
@@ -9,20 +10,29 @@ class PriorityScheduler(BaseScheduler):
     def __init__(self, preemptive: bool = True, aging_interval: int = 1000):
         mode = "Preemptive" if preemptive else "Non-preemptive"
         super().__init__(f"Priority({mode})")
-        self.heap = []  # Min-heap (lower priority number = higher priority)
+        # Min-heap of (priority, arrival_time, pid, seq) int keys
+        # (lower priority number = higher priority); PCBs live in _procs by seq.
+        # Entries whose seq is no longer in _procs are stale and skipped on pop.
+        self.heap = []
+        self._procs = {}
+        self._seq = count()
         self.preemptive = preemptive
         self.aging_interval = aging_interval
         self.last_aging_time = 0
     
     def add_process(self, process: PCB):
         """Add process to heap sorted by priority, then arrival time"""
-        heapq.heappush(self.heap, (process.priority, process.arrival_time, process.process_id, process))
+        seq = next(self._seq)
+        heapq.heappush(self.heap, (process.priority, process.arrival_time, process.process_id, seq))
+        self._procs[seq] = process
     
     def get_next_process(self) -> Optional[PCB]:
         """Get the process with highest priority (lowest number)"""
-        if self.heap:
-            _, _, _, process = heapq.heappop(self.heap)
-            return process
+        while self.heap:
+            seq = heapq.heappop(self.heap)[3]
+            process = self._procs.pop(seq, None)
+            if process is not None:
+                return process
         return None
     
     def should_preempt(self, current_process: Optional[PCB], new_process: PCB) -> bool:
@@ -36,19 +46,30 @@ class PriorityScheduler(BaseScheduler):
         if current_time - self.last_aging_time >= self.aging_interval:
             self.last_aging_time = current_time
             
-            # Create new heap with aged priorities
-            new_heap = []
-            for priority, arrival_time, pid, process in self.heap:
-                # Age the process
+            # Aged processes get a fresh entry under a new seq; the old entry
+            # becomes a tombstone that get_next_process discards lazily
+            for seq, process in list(self._procs.items()):
                 if process.age_priority(current_time, self.aging_interval):
-                    # Priority changed, update heap entry
-                    heapq.heappush(new_heap, (process.priority, arrival_time, pid, process))
-                else:
-                    # Priority unchanged, keep original entry
-                    heapq.heappush(new_heap, (priority, arrival_time, pid, process))
+                    del self._procs[seq]
+                    self.add_process(process)
             
-            self.heap = new_heap
+            # Drop tombstones once they outnumber live entries
+            if len(self.heap) > 2 * len(self._procs):
+                self.heap = [entry for entry in self.heap if entry[3] in self._procs]
+                heapq.heapify(self.heap)
     
     @property
     def ready_queue(self):
-        return [item[3] for item in self.heap]
\ No newline at end of file
+        return list(self._procs.values())
+    
+    def get_queue_length(self) -> int:
+        return len(self._procs)
+    
+    def is_empty(self) -> bool:
+        return not self._procs
+    
+    def clear(self):
+        self.heap.clear()
+        self._procs.clear()
+        self.last_aging_time = 0
+        super().clear()
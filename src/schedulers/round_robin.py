@@ -22,6 +22,11 @@ class RoundRobinScheduler(BaseScheduler):
             return self.queue.popleft()
         return None
     
+    @property
+    def ready_queue(self):
+        """The FIFO queue itself"""
+        return self.queue
+    
     def should_preempt(self, current_process: Optional[PCB], new_process: PCB) -> bool:
         """Round Robin doesn't preempt based on priority, only on time quantum"""
         return False
@@ -33,4 +38,14 @@ class RoundRobinScheduler(BaseScheduler):
             self.stats["preemptions"] += 1
     
     def get_time_quantum(self) -> int:
-        return self.time_quantum
\ No newline at end of file
+        return self.time_quantum
+    
+    def get_time_quantum_for(self, process: PCB) -> int:
+        """Every dispatch gets the same quantum"""
+        return self.time_quantum
+    
+    def set_quantum(self, time_quantum: int):
+        """Change the time quantum and empty the queue for a fresh run"""
+        self.time_quantum = time_quantum
+        self.name = f"RR(q={time_quantum})"
+        self.queue.clear()
\ No newline at end of file
@@ -1,5 +1,5 @@
-import heapq
-from .base_scheduler import BaseScheduler
+from heapq import heappush, heappop
+from .base_scheduler import BaseScheduler, ordering_key
 from ..pcb import PCB
 from typing import Optional
 
@@ -8,21 +8,33 @@ class SJFScheduler(BaseScheduler):
     
     def __init__(self):
         super().__init__("SJF")
-        self.heap = []  # Min-heap based on total CPU time
+        # Min-heap of (key, process) with key packing (total CPU time, arrival, pid);
+        # keys are unique per process, so the PCB itself is never compared
+        self.heap = []
         self.preemptive = False
     
     def add_process(self, process: PCB):
         """Add process to heap sorted by total CPU time"""
-        heapq.heappush(self.heap, (process.total_cpu_time, process.arrival_time, process.process_id, process))
+        key = ordering_key(process.total_cpu_time, process.arrival_time, process.process_id)
+        heappush(self.heap, (key, process))
     
     def get_next_process(self) -> Optional[PCB]:
         """Get the process with shortest total CPU time"""
         if self.heap:
-            _, _, _, process = heapq.heappop(self.heap)
-            return process
+            return heappop(self.heap)[1]
         return None
     
     @property
     def ready_queue(self):
         """Return list of processes in ready queue"""
-        return [item[3] for item in self.heap]
\ No newline at end of file
+        return [item[1] for item in self.heap]
+    
+    def get_queue_length(self) -> int:
+        return len(self.heap)
+    
+    def is_empty(self) -> bool:
+        return not self.heap
+    
+    def clear(self):
+        self.heap.clear()
+        super().clear()
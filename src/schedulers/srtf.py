@@ -1,25 +1,49 @@
-import heapq
-from .base_scheduler import BaseScheduler
+from heapq import heappush, heappop, heapify
+import itertools
+from .base_scheduler import BaseScheduler, ordering_key
 from ..pcb import PCB
-from typing import Optional
+from typing import Dict, Optional
 
 class SRTFScheduler(BaseScheduler):
     """Shortest Remaining Time First (Preemptive) Scheduler"""
     
     def __init__(self):
         super().__init__("SRTF")
-        self.heap = []  # Min-heap based on remaining CPU time
+        # Min-heap of (key, seq, process) entries, key packing (remaining time,
+        # arrival, pid); an entry is live only while _live maps its pid to its seq
+        self.heap = []
+        self._live: Dict[int, int] = {}
+        self._seq = itertools.count()
         self.preemptive = True
     
     def add_process(self, process: PCB):
-        """Add process to heap sorted by remaining CPU time"""
-        heapq.heappush(self.heap, (process.remaining_cpu_time, process.arrival_time, process.process_id, process))
+        """Add process to heap sorted by remaining CPU time
+        
+        Re-adding a queued process replaces its key: the new entry takes over
+        the pid and the old one is dropped when it reaches the top of the heap.
+        """
+        pid = process.process_id
+        replacing = pid in self._live
+        seq = next(self._seq)
+        self._live[pid] = seq
+        heappush(self.heap, (ordering_key(process.remaining_cpu_time, process.arrival_time, pid),
+                             seq, process))
+        
+        # Drop superseded entries once they outnumber live ones
+        if replacing and len(self.heap) > 2 * len(self._live):
+            self.heap = [entry for entry in self.heap
+                         if self._live.get(entry[2].process_id) == entry[1]]
+            heapify(self.heap)
     
     def get_next_process(self) -> Optional[PCB]:
         """Get the process with shortest remaining time"""
-        if self.heap:
-            _, _, _, process = heapq.heappop(self.heap)
-            return process
+        live = self._live
+        while self.heap:
+            _, seq, process = heappop(self.heap)
+            pid = process.process_id
+            if live.get(pid) == seq:
+                del live[pid]
+                return process
         return None
     
     def should_preempt(self, current_process: Optional[PCB], new_process: PCB) -> bool:
@@ -35,4 +59,16 @@ class SRTFScheduler(BaseScheduler):
     
     @property
     def ready_queue(self):
-        return [item[3] for item in self.heap]
\ No newline at end of file
+        return [process for _, seq, process in self.heap
+                if self._live.get(process.process_id) == seq]
+    
+    def get_queue_length(self) -> int:
+        return len(self._live)
+    
+    def is_empty(self) -> bool:
+        return not self._live
+    
+    def clear(self):
+        self.heap.clear()
+        self._live.clear()
+        super().clear()
@@ -1,13 +1,19 @@
 import time
-from typing import List, Dict, Optional, Any, Tuple
+from array import array
+from heapq import heappop
+from typing import Iterable, List, Dict, Optional, Any, Tuple
 from collections import defaultdict
 from dataclasses import dataclass
 from .pcb import PCB, ProcessState
-from .event import Event, EventQueue, EventType
+from .event import Event, EventQueue, EventType, EVENT_TYPE_COUNT
 from .schedulers.base_scheduler import BaseScheduler
 from .statistics import StatisticsCollector
+from .utils.helpers import DATACLASS_SLOTS
 
-@dataclass
+# Events tagged with the dispatch_id of the dispatch that scheduled them
+_DISPATCH_EVENT_TYPES = (EventType.CPU_BURST_COMPLETE, EventType.TIME_QUANTUM_EXPIRED)
+
+@dataclass(**DATACLASS_SLOTS)
 class SimulationResult:
     """Container for simulation results"""
     algorithm_name: str
@@ -27,78 +33,143 @@ class CPUSimulator:
         self.running_process = None
         self.current_time = 0
         self.idle_time = 0
-        self.last_update_time = 0
         
         # Statistics
         self.stats_collector = StatisticsCollector()
-        self.gantt_chart = []  # For visualization
+        # Gantt segments for visualization as parallel columns, so trimming
+        # the last segment is one int store rather than a new tuple
+        self._gantt_starts = array('q')
+        self._gantt_ends = array('q')
+        self._gantt_pids = array('i')
         
         # State tracking
         self.is_context_switching = False
-        self.context_switch_end_time = 0
+        self.switching_to = None  # Process being dispatched during a context switch
+        self.dispatch_start_time = 0  # When the running process got the CPU
+        self.dispatch_id = 0  # Tags burst/timeout events so stale ones are ignored
+        self.last_dispatched_pid = None  # Whose state is loaded on the CPU
+        self._time_quantum_for = self._resolve_time_quantum_hook()
+        self.completed_processes = []
+        
+        # Event handlers indexed by EventType code; codes with no handler are ignored
+        self._dispatch = [self._ignore_event] * EVENT_TYPE_COUNT
+        self._dispatch[EventType.PROCESS_ARRIVAL] = self._handle_arrival
+        self._dispatch[EventType.CPU_BURST_COMPLETE] = self._handle_cpu_completion
+        self._dispatch[EventType.IO_BURST_COMPLETE] = self._handle_io_completion
+        self._dispatch[EventType.TIME_QUANTUM_EXPIRED] = self._handle_timeout
+        self._dispatch[EventType.CONTEXT_SWITCH_COMPLETE] = self._handle_context_switch_complete
+    
+    def reset(self):
+        """Reset simulator and scheduler state so the instance can be rerun"""
+        self.scheduler.clear()
+        self.event_queue.clear()
+        self.processes = {}
+        self.running_process = None
+        self.current_time = 0
+        self.idle_time = 0
+        self.stats_collector.reset()
+        self._gantt_starts = array('q')
+        self._gantt_ends = array('q')
+        self._gantt_pids = array('i')
+        self.is_context_switching = False
+        self.switching_to = None
+        self.dispatch_start_time = 0
+        self.dispatch_id = 0
+        self.last_dispatched_pid = None
         self.completed_processes = []
     
-    def initialize_simulation(self, processes: List[PCB]):
-        """Initialize simulation with processes"""
+    @property
+    def gantt_chart(self) -> List[Tuple[int, int, int]]:
+        """Executed segments as (start, end, pid) tuples"""
+        return list(zip(self._gantt_starts, self._gantt_ends, self._gantt_pids))
+    
+    def initialize_simulation(self, processes: Iterable[PCB]):
+        """Initialize simulation with processes (any iterable, consumed once)"""
         self.processes = {p.process_id: p for p in processes}
         
-        # Schedule all arrival events
-        for process in processes:
-            self.event_queue.schedule_arrival(process.process_id, process.arrival_time)
-        
-        # Sort processes by arrival time for statistics
-        processes.sort(key=lambda p: p.arrival_time)
+        # Arrivals are all known up front, so load them with one heapify
+        self.event_queue.bulk_schedule_arrivals(
+            (pid, process.arrival_time) for pid, process in self.processes.items()
+        )
     
-    def run(self, max_time: int = 100000) -> SimulationResult:
-        """Run the simulation until completion or max_time"""
+    def run(self, max_time: Optional[int] = None) -> SimulationResult:
+        """Run the simulation until every process completes (or max_time, if given)"""
         print(f"\n=== Starting {self.scheduler.name} Simulation ===")
         
-        while (self.current_time <= max_time and 
-               not (self.event_queue.is_empty() and 
-                    self.scheduler.is_empty() and 
-                    self.running_process is None)):
-            
-            self._update_waiting_times()
-            
-            # Check for context switch completion
-            if self.is_context_switching and self.current_time >= self.context_switch_end_time:
-                self.is_context_switching = False
-                self.stats_collector.context_switches += 1
+        # Resolve which quantum hook the scheduler provides once, not per dispatch
+        self._time_quantum_for = self._resolve_time_quantum_hook()
+        
+        # Bind loop-invariant lookups once; the loop body runs once per event time
+        heap = self.event_queue.queue
+        dispatch = self._dispatch
+        discard_stale_events = self._discard_stale_events
+        scheduler = self.scheduler
+        completed = self.completed_processes
+        total_processes = len(self.processes)
+        
+        while len(completed) < total_processes:
+            current_time = self.current_time
             
-            # Process all events at current time
-            while not self.event_queue.is_empty() and self.event_queue.peek().timestamp <= self.current_time:
-                event = self.event_queue.pop()
-                self._handle_event(event)
+            # Process all events at current time (a finishing context switch first)
+            while heap and heap[0][0] <= current_time:
+                event = heappop(heap)[2]
+                dispatch[event.type](event)
             
             # If CPU is idle and not context switching, schedule a process
             if (not self.is_context_switching and 
                 self.running_process is None and 
-                not self.scheduler.is_empty()):
+                not scheduler.is_empty()):
                 self._schedule_next_process()
             
-            # If still idle, increment idle time
+            # Nothing changes state between events, so jump straight to the
+            # next live one instead of ticking
+            discard_stale_events()
+            if not heap:
+                break  # Nothing left that can make progress
+            next_time = heap[0][0]
+            if next_time <= current_time:
+                next_time = current_time + 1
+            if max_time is not None and next_time > max_time:
+                break
+            
+            # If still idle, accumulate the skipped idle time
             if self.running_process is None and not self.is_context_switching:
-                self.idle_time += 1
+                self.idle_time += next_time - current_time
             
-            self.current_time += 1
-        
-        # Complete any running process
-        if self.running_process:
-            self._complete_current_process()
+            self.current_time = next_time
         
         # Calculate final statistics
         return self._collect_results()
     
-    def _handle_event(self, event: Event):
-        """Handle different types of events"""
-        if event.type == EventType.PROCESS_ARRIVAL:
-            self._handle_arrival(event)
-        elif event.type == EventType.CPU_BURST_COMPLETE:
-            self._handle_cpu_completion(event)
-        elif event.type == EventType.IO_BURST_COMPLETE:
-            self._handle_io_completion(event)
-        elif event.type == EventType.TIME_QUANTUM_EXPIRED:
-            self._handle_timeout(event)
+    def _resolve_time_quantum_hook(self):
+        """Return the scheduler's quantum method, or None if it never time-slices"""
+        if type(self.scheduler).get_time_quantum_for is BaseScheduler.get_time_quantum_for:
+            return None  # Skip a call per dispatch that would always return None
+        return self.scheduler.get_time_quantum_for
+    
+    def _discard_stale_events(self):
+        """Lazily drop burst/timeout events left behind by preempted dispatches
+        
+        Each dispatch schedules one event stamped with its dispatch_id, so any
+        such event carrying an older id can no longer fire. Dropping them once
+        they reach the head avoids waking the loop at their timestamps.
+        """
+        heap = self.event_queue.queue
+        dispatch_id = self.dispatch_id
+        while heap:
+            event = heap[0][2]
+            if event.type not in _DISPATCH_EVENT_TYPES or event.data == dispatch_id:
+                break
+            heappop(heap)
+    
+    def _ignore_event(self, event: Event):
+        pass
+    
+    def _is_current_dispatch(self, event: Event) -> bool:
+        """Whether a burst/timeout event belongs to the running process's current dispatch"""
+        return (self.running_process is not None and
+                self.running_process.process_id == event.process_id and
+                event.data == self.dispatch_id)
     
     def _handle_arrival(self, event: Event):
         """Handle process arrival"""
@@ -106,22 +177,15 @@ class CPUSimulator:
         if pid in self.processes:
             process = self.processes[pid]
             process.state = ProcessState.READY
+            process.ready_enqueue_time = self.current_time
             self.scheduler.add_process(process)
-            
-            # Check for preemption
-            if (self.running_process and 
-                self.scheduler.should_preempt(self.running_process, process)):
-                self._preempt_current_process(process)
+            self._check_preemption(process)
     
     def _handle_cpu_completion(self, event: Event):
         """Handle CPU burst completion"""
-        if self.running_process and self.running_process.process_id == event.process_id:
+        if self._is_current_dispatch(event):
             process = self.running_process
-            
-            # Update Gantt chart
-            if self.gantt_chart and self.gantt_chart[-1][2] == process.process_id:
-                start, _, _ = self.gantt_chart[-1]
-                self.gantt_chart[-1] = (start, self.current_time, process.process_id)
+            self._charge_cpu_time(process)
             
             # Check if process completed all CPU time
             if process.remaining_cpu_time == 0:
@@ -132,6 +196,7 @@ class CPUSimulator:
                 process.total_io_time += process.io_burst_time
                 io_completion = self.current_time + process.io_burst_time
                 self.event_queue.schedule_io_completion(process.process_id, io_completion)
+                self._end_gantt_segment(process)
                 self.running_process = None
     
     def _handle_io_completion(self, event: Event):
@@ -140,28 +205,56 @@ class CPUSimulator:
         if pid in self.processes:
             process = self.processes[pid]
             process.state = ProcessState.READY
+            process.ready_enqueue_time = self.current_time
             self.scheduler.add_process(process)
-            
-            # Check for preemption
-            if (self.running_process and 
-                self.scheduler.should_preempt(self.running_process, process)):
-                self._preempt_current_process(process)
+            self._check_preemption(process)
+    
+    def _check_preemption(self, process: PCB):
+        """Preempt the running process if the scheduler prefers the newly ready one
+        
+        The running process is charged first so the decision sees its
+        up-to-date remaining time. One that has just run out is left alone:
+        its completion event is due at this same timestamp.
+        """
+        running = self.running_process
+        if running:
+            self._charge_cpu_time(running)
+            if running.remaining_cpu_time and self.scheduler.should_preempt(running, process):
+                self._preempt_current_process()
     
     def _handle_timeout(self, event: Event):
         """Handle time quantum expiration"""
-        if self.running_process and self.running_process.process_id == event.process_id:
+        if self._is_current_dispatch(event):
             process = self.running_process
+            self._charge_cpu_time(process)
+            self._stop_current_process()
+            
+            # The scheduler decides where the process goes back in its queues
             self.scheduler.on_time_quantum_expired(process)
-            self._preempt_current_process(None, quantum_expired=True)
+    
+    def _handle_context_switch_complete(self, event: Event):
+        """Put the process being switched in on the CPU"""
+        self.is_context_switching = False
+        self.stats_collector.context_switches += 1
+        process, self.switching_to = self.switching_to, None
+        self._start_execution(process)
     
     def _schedule_next_process(self):
         """Schedule the next process from the scheduler"""
         next_process = self.scheduler.get_next_process()
         if next_process:
-            # Start context switch if needed
-            if self.context_switch_time > 0:
+            # Waiting time is the span since the process last became ready
+            next_process.total_waiting_time += self.current_time - next_process.ready_enqueue_time
+            
+            # Start context switch if needed; the process runs once it completes.
+            # A process resuming right after itself still has its state loaded.
+            if (self.context_switch_time > 0 and
+                    next_process.process_id != self.last_dispatched_pid):
                 self.is_context_switching = True
-                self.context_switch_end_time = self.current_time + self.context_switch_time
+                self.switching_to = next_process
+                self.event_queue.schedule_context_switch_complete(
+                    next_process.process_id, self.current_time + self.context_switch_time
+                )
                 return
             
             # Start executing the process
@@ -171,59 +264,62 @@ class CPUSimulator:
         """Start executing a process"""
         self.running_process = process
         process.state = ProcessState.RUNNING
+        self.dispatch_start_time = self.current_time
+        self.dispatch_id += 1
+        self.last_dispatched_pid = process.process_id
         
         # Record first run time for response time
         if process.first_run_time is None:
             process.first_run_time = self.current_time
+            process.start_time = self.current_time
         
-        # Calculate execution time
-        if isinstance(self.scheduler, MLFQScheduler):
-            time_quantum = self.scheduler.get_time_quantum_for_process(process)
-        elif hasattr(self.scheduler, 'get_time_quantum'):
-            time_quantum = self.scheduler.get_time_quantum()
-        else:
-            time_quantum = None  # Execute until completion
+        # Time-sliced schedulers expose their quantum; others run to completion
+        time_quantum = self._time_quantum_for(process) if self._time_quantum_for else None
         
-        # Execute the process
-        if time_quantum:
-            execution_time = min(process.remaining_cpu_time, time_quantum)
-            # Schedule timeout for Round Robin and MLFQ
-            if isinstance(self.scheduler, (RoundRobinScheduler, MLFQScheduler)):
-                timeout_time = self.current_time + execution_time
-                self.event_queue.schedule_timeout(process.process_id, timeout_time)
+        # Schedule exactly one event: the quantum expiring or the burst completing
+        end_time = self.current_time + process.remaining_cpu_time
+        if time_quantum and time_quantum < process.remaining_cpu_time:
+            end_time = self.current_time + time_quantum
+            self.event_queue.schedule_timeout(process.process_id, end_time, self.dispatch_id)
         else:
-            execution_time = process.remaining_cpu_time
-        
-        # Schedule CPU completion
-        completion_time = self.current_time + execution_time
-        self.event_queue.schedule_cpu_completion(process.process_id, completion_time)
+            self.event_queue.schedule_cpu_completion(process.process_id, end_time, self.dispatch_id)
         
         # Update Gantt chart
-        self.gantt_chart.append((self.current_time, completion_time, process.process_id))
+        self._gantt_starts.append(self.current_time)
+        self._gantt_ends.append(end_time)
+        self._gantt_pids.append(process.process_id)
     
-    def _preempt_current_process(self, new_process: PCB = None, quantum_expired: bool = False):
-        """Preempt the currently running process"""
+    def _charge_cpu_time(self, process: PCB):
+        """Deduct the CPU time used since the process was dispatched"""
+        elapsed = self.current_time - self.dispatch_start_time
+        if elapsed:
+            process.execute(elapsed)
+            self.dispatch_start_time = self.current_time
+    
+    def _end_gantt_segment(self, process: PCB):
+        """Close the running process's Gantt segment at the current time"""
+        if self._gantt_pids and self._gantt_pids[-1] == process.process_id:
+            self._gantt_ends[-1] = self.current_time
+    
+    def _stop_current_process(self):
+        """Take the running process off the CPU without requeueing it"""
+        process = self.running_process
+        process.state = ProcessState.READY
+        process.ready_enqueue_time = self.current_time
+        process.preempted = True
+        process.context_switches += 1
+        self._end_gantt_segment(process)
+        
+        self.running_process = None
+        self.stats_collector.preemptions += 1
+    
+    def _preempt_current_process(self):
+        """Preempt the currently running process and put it back in the ready queue"""
         if self.running_process:
             process = self.running_process
-            process.state = ProcessState.READY
-            process.preempted = True
-            process.context_switches += 1
-            
-            # Update remaining time (already accounted for in execution)
-            # Add back to scheduler
+            self._charge_cpu_time(process)
+            self._stop_current_process()
             self.scheduler.add_process(process)
-            
-            # Update Gantt chart end time
-            if self.gantt_chart and self.gantt_chart[-1][2] == process.process_id:
-                start, _, _ = self.gantt_chart[-1]
-                self.gantt_chart[-1] = (start, self.current_time, process.process_id)
-            
-            self.running_process = None
-            self.stats_collector.preemptions += 1
-            
-            # Start context switch for new process
-            if new_process:
-                self.scheduler.add_process(new_process)
     
     def _complete_current_process(self):
         """Complete the current running process"""
@@ -236,20 +332,11 @@ class CPUSimulator:
             # Record statistics
             self.stats_collector.record_process_completion(process)
             self.completed_processes.append(process)
+            self.scheduler.on_process_completion(process)
             
-            # Update Gantt chart
-            if self.gantt_chart and self.gantt_chart[-1][2] == process.process_id:
-                start, _, _ = self.gantt_chart[-1]
-                self.gantt_chart[-1] = (start, self.current_time, process.process_id)
-            
+            self._end_gantt_segment(process)
             self.running_process = None
     
-    def _update_waiting_times(self):
-        """Update waiting times for all ready processes"""
-        time_diff = self.current_time - self.last_update_time
-        self.scheduler.update_waiting_times(self.current_time, self.last_update_time)
-        self.last_update_time = self.current_time
-    
     def _collect_results(self) -> SimulationResult:
         """Collect and return simulation results"""
         # Calculate system-wide metrics
@@ -258,18 +345,11 @@ class CPUSimulator:
         cpu_utilization = (cpu_time / total_time) * 100 if total_time > 0 else 0
         
         # Get metrics from statistics collector
-        metrics = self.stats_collector.calculate_metrics(self.completed_processes)
+        # Completions were recorded as they happened, so no pass over the PCBs is needed
+        metrics = self.stats_collector.calculate_metrics()
         metrics["cpu_utilization"] = cpu_utilization
         metrics["throughput"] = len(self.completed_processes) / (total_time / 1000)  # processes per second
         
-        # Calculate fairness index (Jain's fairness)
-        turnaround_times = [p.turnaround_time for p in self.completed_processes]
-        if turnaround_times:
-            sum_times = sum(turnaround_times)
-            sum_squares = sum(t * t for t in turnaround_times)
-            fairness = (sum_times ** 2) / (len(turnaround_times) * sum_squares) if sum_squares > 0 else 1
-            metrics["fairness_index"] = fairness
-        
         # Collect process statistics
         process_stats = []
         for process in self.completed_processes:
@@ -1,5 +1,7 @@
+from array import array
 from typing import List, Dict, Any
 from .pcb import PCB
+from .utils.helpers import calculate_fairness_index
 import numpy as np
 
 class StatisticsCollector:
@@ -12,19 +14,49 @@ class StatisticsCollector:
         self.total_turnaround_time = 0
         self.total_waiting_time = 0
         self.total_response_time = 0
+        self._reset_buffers()
+    
+    def _reset_buffers(self):
+        # Per-completion metrics as packed int64 columns, viewed by NumPy without copying
+        self._turnaround = array('q')
+        self._waiting = array('q')
+        self._response = array('q')
     
     def record_process_completion(self, process: PCB):
         """Record statistics for a completed process"""
+        turnaround = process.turnaround_time
+        waiting = process.waiting_time
+        response = process.response_time
+        
         self.completed_processes += 1
-        self.total_turnaround_time += process.turnaround_time or 0
-        self.total_waiting_time += process.waiting_time or 0
-        self.total_response_time += process.response_time or 0
+        self.total_turnaround_time += turnaround
+        self.total_waiting_time += waiting
+        self.total_response_time += response
+        self._turnaround.append(turnaround)
+        self._waiting.append(waiting)
+        self._response.append(response)
+    
+    def _recorded_arrays(self) -> Dict[str, np.ndarray]:
+        """Metric arrays over every completion recorded so far"""
+        return {
+            'turnaround': np.frombuffer(self._turnaround, dtype=np.int64),
+            'waiting': np.frombuffer(self._waiting, dtype=np.int64),
+            'response': np.frombuffer(self._response, dtype=np.int64),
+        }
     
     def calculate_metrics(self, processes: List[PCB] = None) -> Dict[str, float]:
-        """Calculate all performance metrics"""
+        """Calculate all performance metrics
+        
+        Distribution metrics come from the given processes, or else from the
+        completions recorded through record_process_completion.
+        """
+        arrays = None
         if processes:
             # Recalculate from provided processes
-            self._recalculate_from_processes(processes)
+            arrays = PCB.metrics_arrays(processes)
+            self._recalculate_from_arrays(arrays)
+        elif self._turnaround:
+            arrays = self._recorded_arrays()
         
         metrics = {}
         
@@ -42,33 +74,40 @@ class StatisticsCollector:
         metrics["preemptions"] = self.preemptions
         
         # Calculate percentiles if processes provided
-        if processes:
-            turnaround_times = [p.turnaround_time or 0 for p in processes]
-            waiting_times = [p.waiting_time or 0 for p in processes]
-            response_times = [p.response_time or 0 for p in processes]
+        if arrays is not None:
+            turnaround_times = arrays['turnaround']
+            waiting_times = arrays['waiting']
+            response_times = arrays['response']
+            
+            # One sort yields min, max and median together
+            ordered = np.sort(turnaround_times)
+            n = len(ordered)
+            metrics["std_turnaround"] = np.std(turnaround_times)
+            metrics["min_turnaround"] = int(ordered[0])
+            metrics["max_turnaround"] = int(ordered[-1])
+            metrics["median_turnaround"] = (ordered[(n - 1) // 2] + ordered[n // 2]) / 2
             
-            if turnaround_times:
-                metrics["std_turnaround"] = np.std(turnaround_times)
-                metrics["min_turnaround"] = min(turnaround_times)
-                metrics["max_turnaround"] = max(turnaround_times)
-                metrics["median_turnaround"] = np.median(turnaround_times)
+            metrics["std_waiting"] = np.std(waiting_times)
+            metrics["min_waiting"] = int(waiting_times.min())
+            metrics["max_waiting"] = int(waiting_times.max())
             
-            if waiting_times:
-                metrics["std_waiting"] = np.std(waiting_times)
-                metrics["min_waiting"] = min(waiting_times)
-                metrics["max_waiting"] = max(waiting_times)
+            metrics["std_response"] = np.std(response_times)
             
-            if response_times:
-                metrics["std_response"] = np.std(response_times)
+            # Jain's fairness index over turnaround times
+            metrics["fairness_index"] = calculate_fairness_index(turnaround_times)
         
         return metrics
     
     def _recalculate_from_processes(self, processes: List[PCB]):
         """Recalculate totals from list of processes"""
-        self.completed_processes = len(processes)
-        self.total_turnaround_time = sum(p.turnaround_time or 0 for p in processes)
-        self.total_waiting_time = sum(p.waiting_time or 0 for p in processes)
-        self.total_response_time = sum(p.response_time or 0 for p in processes)
+        self._recalculate_from_arrays(PCB.metrics_arrays(processes))
+    
+    def _recalculate_from_arrays(self, arrays: Dict[str, np.ndarray]):
+        """Recalculate totals from per-process metric arrays"""
+        self.completed_processes = len(arrays['turnaround'])
+        self.total_turnaround_time = int(arrays['turnaround'].sum())
+        self.total_waiting_time = int(arrays['waiting'].sum())
+        self.total_response_time = int(arrays['response'].sum())
     
     def reset(self):
         """Reset all statistics"""
@@ -77,4 +116,5 @@ class StatisticsCollector:
         self.completed_processes = 0
         self.total_turnaround_time = 0
         self.total_waiting_time = 0
-        self.total_response_time = 0
\ No newline at end of file
+        self.total_response_time = 0
+        self._reset_buffers()
\ No newline at end of file
@@ -8,7 +8,14 @@ from .helpers import (
     validate_config,
     format_time,
     calculate_percentiles,
-    generate_color_map
+    generate_color_map,
+    GanttArrays,
+    create_gantt_segments,
+    merge_gantt_segments,
+    figure_save_args,
+    parse_experiment_args,
+    load_pyplot,
+    new_figure
 )
 
 __all__ = [
@@ -17,5 +24,12 @@ __all__ = [
     'validate_config',
     'format_time',
     'calculate_percentiles',
-    'generate_color_map'
+    'generate_color_map',
+    'GanttArrays',
+    'create_gantt_segments',
+    'merge_gantt_segments',
+    'figure_save_args',
+    'parse_experiment_args',
+    'load_pyplot',
+    'new_figure'
 ]
\ No newline at end of file
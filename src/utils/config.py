@@ -5,7 +5,13 @@ Configuration management for the simulation
 import yaml
 import os
 from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+
+# libyaml's C loader when PyYAML was built with it, else the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 @dataclass
 class SimulationParams:
@@ -62,6 +68,23 @@ class ExperimentParams:
         if self.sensitivity_process_counts is None:
             self.sensitivity_process_counts = [100, 500, 1000]
 
+def _field_names(cls) -> frozenset:
+    return frozenset(f.name for f in fields(cls))
+
+# YAML section (and Config attribute) -> keys it may set
+_SECTION_FIELDS = {
+    'simulation': _field_names(SimulationParams),
+    'workload': _field_names(WorkloadParams),
+    'scheduling': _field_names(SchedulingParams),
+    'experiments': _field_names(ExperimentParams),
+}
+
+def _apply(section_obj, data: Dict[str, Any], field_names: frozenset):
+    """Copy the known keys of one YAML section onto its params dataclass"""
+    for key, value in data.items():
+        if key in field_names:
+            setattr(section_obj, key, value)
+
 class Config:
     """Configuration manager for the simulation"""
     
@@ -82,35 +105,12 @@ class Config:
         
         try:
             with open(config_file, 'r') as f:
-                config_data = yaml.safe_load(f)
-            
-            # Update simulation parameters
-            if 'simulation' in config_data:
-                sim_data = config_data['simulation']
-                for key, value in sim_data.items():
-                    if hasattr(self.simulation, key):
-                        setattr(self.simulation, key, value)
-            
-            # Update workload parameters
-            if 'workload' in config_data:
-                workload_data = config_data['workload']
-                for key, value in workload_data.items():
-                    if hasattr(self.workload, key):
-                        setattr(self.workload, key, value)
-            
-            # Update scheduling parameters
-            if 'scheduling' in config_data:
-                sched_data = config_data['scheduling']
-                for key, value in sched_data.items():
-                    if hasattr(self.scheduling, key):
-                        setattr(self.scheduling, key, value)
+                config_data = yaml.load(f, Loader=_YamlLoader)
             
-            # Update experiment parameters
-            if 'experiments' in config_data:
-                exp_data = config_data['experiments']
-                for key, value in exp_data.items():
-                    if hasattr(self.experiments, key):
-                        setattr(self.experiments, key, value)
+            # Update each section's parameters, ignoring unknown keys
+            for section, field_names in _SECTION_FIELDS.items():
+                if section in config_data:
+                    _apply(getattr(self, section), config_data[section], field_names)
             
             print(f"Configuration loaded from {config_file}")
             
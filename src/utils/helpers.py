@@ -1,14 +1,26 @@
 """
 Helper functions for the simulation
+
+create_gantt_segments returns a GanttArrays of parallel NumPy arrays rather
+than a list of segment dicts; call .to_segments() on it for the old
+per-segment dicts. merge_gantt_segments accepts either form and returns the
+form it was given.
 """
 
-import random
+import os
+import sys
+import argparse
+import importlib.util
+from functools import lru_cache
 import numpy as np
-from typing import List, Dict, Any, Optional, Tuple
-import matplotlib.colors as mcolors
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple, Union
 
-def validate_positive_int(value: Any, name: str = "value") -> int:
-    """Validate that a value is a positive integer"""
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@lru_cache(maxsize=1024)
+def _positive_int(value: Any, name: str) -> int:
     try:
         int_value = int(value)
         if int_value <= 0:
@@ -17,8 +29,38 @@ def validate_positive_int(value: Any, name: str = "value") -> int:
     except (ValueError, TypeError):
         raise ValueError(f"{name} must be an integer, got {type(value).__name__}")
 
+def validate_positive_int(value: Any, name: str = "value") -> int:
+    """Validate that a value is a positive integer"""
+    try:
+        return _positive_int(value, name)
+    except TypeError:
+        # Unhashable values cannot be cache keys; validate them directly
+        return _positive_int.__wrapped__(value, name)
+
+@lru_cache(maxsize=256)
+def _config_error(num_processes: Any, arrival_lambda: Any,
+                  cpu_burst_mean: Any) -> Optional[str]:
+    """Validation message for the required fields, or None when they are valid"""
+    try:
+        validate_positive_int(num_processes, 'num_processes')
+        
+        if arrival_lambda <= 0:
+            return "arrival_lambda must be positive"
+        
+        if cpu_burst_mean <= 0:
+            return "cpu_burst_mean must be positive"
+        
+        return None
+    
+    except ValueError as e:
+        return f"Configuration validation error: {e}"
+
 def validate_config(config_dict: Dict[str, Any]) -> bool:
-    """Validate configuration dictionary"""
+    """Validate configuration dictionary
+    
+    Results are memoized on the required field values, since sweeps validate
+    the same configuration many times. Messages are still printed every call.
+    """
     required_fields = ['num_processes', 'arrival_lambda', 'cpu_burst_mean']
     
     for field in required_fields:
@@ -26,22 +68,16 @@ def validate_config(config_dict: Dict[str, Any]) -> bool:
             print(f"Missing required field: {field}")
             return False
     
+    fields = tuple(config_dict[field] for field in required_fields)
     try:
-        validate_positive_int(config_dict['num_processes'], 'num_processes')
-        
-        if config_dict['arrival_lambda'] <= 0:
-            print("arrival_lambda must be positive")
-            return False
-        
-        if config_dict['cpu_burst_mean'] <= 0:
-            print("cpu_burst_mean must be positive")
-            return False
-        
-        return True
+        error = _config_error(*fields)
+    except TypeError:
+        error = _config_error.__wrapped__(*fields)
     
-    except ValueError as e:
-        print(f"Configuration validation error: {e}")
+    if error is not None:
+        print(error)
         return False
+    return True
 
 def format_time(ms: int) -> str:
     """Format milliseconds to human-readable string"""
@@ -56,113 +92,215 @@ def format_time(ms: int) -> str:
 
 def calculate_percentiles(data: List[float]) -> Dict[str, float]:
     """Calculate statistical percentiles for a dataset"""
-    if not data:
+    if len(data) == 0:
         return {}
     
-    data_array = np.array(data)
+    data_array = np.asarray(data, dtype=np.float64)
+    # One multi-q call partitions the data once instead of once per percentile
+    pcts = np.percentile(data_array, [0, 5, 25, 50, 75, 95, 100])
     
     return {
-        'min': float(np.min(data_array)),
-        '5th': float(np.percentile(data_array, 5)),
-        '25th': float(np.percentile(data_array, 25)),
-        'median': float(np.median(data_array)),
-        '75th': float(np.percentile(data_array, 75)),
-        '95th': float(np.percentile(data_array, 95)),
-        'max': float(np.max(data_array)),
+        'min': float(pcts[0]),
+        '5th': float(pcts[1]),
+        '25th': float(pcts[2]),
+        'median': float(pcts[3]),
+        '75th': float(pcts[4]),
+        '95th': float(pcts[5]),
+        'max': float(pcts[6]),
         'mean': float(np.mean(data_array)),
         'std': float(np.std(data_array))
     }
 
+@lru_cache(maxsize=32)
+def get_colormap(name: str):
+    """Look up a matplotlib colormap once per name
+    
+    Goes through the colormap registry rather than pyplot, so a lookup never
+    imports pyplot or switches the backend.
+    """
+    _require_matplotlib()
+    import matplotlib
+    return matplotlib.colormaps[name]
+
 def generate_color_map(n_colors: int, colormap: str = 'tab20') -> Dict[int, str]:
     """Generate a color map for n different items"""
-    cmap = plt.cm.get_cmap(colormap)
-    colors = []
-    
-    for i in range(n_colors):
-        rgba = cmap(i / max(1, n_colors - 1))
-        colors.append(mcolors.to_hex(rgba))
+    import matplotlib.colors as mcolors
+    # Sample every color in one vectorized colormap call
+    rgba = get_colormap(colormap)(np.linspace(0, 1, max(n_colors, 2)))[:n_colors]
+    colors = [mcolors.to_hex(color) for color in rgba]
     
     return {i: colors[i % len(colors)] for i in range(n_colors)}
 
+# Shared Generator for the ad hoc samplers below
+_rng = np.random.default_rng()
+
 def exponential_random(rate: float) -> float:
     """Generate exponential random variable with given rate"""
     if rate <= 0:
         raise ValueError("Rate must be positive")
-    return random.expovariate(rate)
+    return float(_rng.exponential(1.0 / rate))
 
 def normal_random(mean: float, std: float) -> float:
     """Generate normal random variable with given mean and std"""
-    return random.gauss(mean, std)
+    return float(_rng.normal(mean, std))
 
 def uniform_random(min_val: float, max_val: float) -> float:
-    """Generate uniform random variable in [min_val, max_val]"""
-    return random.uniform(min_val, max_val)
+    """Generate uniform random variable in [min_val, max_val)"""
+    return float(_rng.uniform(min_val, max_val))
 
-def poisson_arrival_times(rate: float, num_events: int) -> List[float]:
-    """Generate arrival times using Poisson process"""
-    inter_arrival_times = [exponential_random(rate) for _ in range(num_events)]
-    arrival_times = np.cumsum(inter_arrival_times)
-    return list(arrival_times)
+def poisson_arrival_times(rate: float, num_events: int,
+                          rng: Optional[np.random.Generator] = None) -> List[float]:
+    """Generate arrival times using Poisson process
+    
+    All inter-arrival gaps are drawn in one call; pass a seeded Generator
+    for reproducible times.
+    """
+    if rate <= 0:
+        raise ValueError("Rate must be positive")
+    if rng is None:
+        rng = _rng
+    inter_arrival_times = rng.exponential(1.0 / rate, num_events)
+    return np.cumsum(inter_arrival_times).tolist()
 
 def calculate_fairness_index(values: List[float]) -> float:
-    """Calculate Jain's fairness index"""
-    if not values:
+    """Calculate Jain's fairness index
+    
+    Integer input is summed as Python ints, so the ratio matches exact
+    integer arithmetic.
+    """
+    if len(values) == 0:
         return 1.0
     
-    sum_values = sum(values)
-    sum_squares = sum(v * v for v in values)
+    arr = np.asarray(values)
+    if arr.dtype.kind in 'iu':
+        sum_values = int(arr.sum())
+        sum_squares = int(arr @ arr)
+    else:
+        arr = arr.astype(np.float64, copy=False)
+        sum_values = arr.sum()
+        sum_squares = float(arr @ arr)
     
     if sum_squares == 0:
         return 1.0
     
-    n = len(values)
+    n = len(arr)
     fairness = (sum_values * sum_values) / (n * sum_squares)
-    return fairness
+    return float(fairness)
 
 def normalize_values(values: List[float]) -> List[float]:
     """Normalize values to [0, 1] range"""
-    if not values:
+    if len(values) == 0:
         return []
     
-    min_val = min(values)
-    max_val = max(values)
+    arr = np.asarray(values, dtype=np.float64)
+    min_val = arr.min()
+    max_val = arr.max()
     
     if max_val == min_val:
-        return [0.5] * len(values)
+        return [0.5] * len(arr)
     
-    return [(v - min_val) / (max_val - min_val) for v in values]
+    return ((arr - min_val) / (max_val - min_val)).tolist()
 
-def create_gantt_segments(gantt_data: List[Tuple[int, int, int]]) -> List[Dict[str, Any]]:
-    """Convert raw Gantt data to segments for plotting"""
-    segments = []
+@dataclass
+class GanttArrays:
+    """Gantt data as parallel arrays: pids[i] ran from starts[i] to ends[i]"""
+    starts: np.ndarray  # int64, like the simulator's Gantt buffers
+    ends: np.ndarray
+    pids: np.ndarray  # int32
+    
+    def __len__(self) -> int:
+        return len(self.pids)
     
-    for start, end, pid in gantt_data:
-        segments.append({
-            'process_id': pid,
-            'start': start,
-            'end': end,
-            'duration': end - start
-        })
+    @property
+    def durations(self) -> np.ndarray:
+        return self.ends - self.starts
     
-    return segments
+    def to_segments(self) -> List[Dict[str, Any]]:
+        """Segment dicts for callers that want one record per execution"""
+        return [
+            {'process_id': pid, 'start': start, 'end': end, 'duration': end - start}
+            for start, end, pid in zip(self.starts.tolist(), self.ends.tolist(),
+                                       self.pids.tolist())
+        ]
 
-def merge_gantt_segments(segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Merge consecutive segments of the same process"""
-    if not segments:
-        return []
+def create_gantt_segments(gantt_data: List[Tuple[int, int, int]]) -> GanttArrays:
+    """Convert raw (start, end, pid) Gantt data to parallel arrays for plotting"""
+    table = np.array(gantt_data, dtype=np.int64).reshape(-1, 3)
+    return GanttArrays(
+        starts=table[:, 0].copy(),
+        ends=table[:, 1].copy(),
+        pids=table[:, 2].astype(np.int32)
+    )
+
+def merge_gantt_segments(segments: Union[GanttArrays, List[Dict[str, Any]]]
+                         ) -> Union[GanttArrays, List[Dict[str, Any]]]:
+    """Merge consecutive segments of the same process
+    
+    A legacy list of segment dicts is still accepted and merged into a list
+    of segment dicts.
+    """
+    if not isinstance(segments, GanttArrays):
+        arrays = create_gantt_segments(
+            [(seg['start'], seg['end'], seg['process_id']) for seg in segments]
+        )
+        return merge_gantt_segments(arrays).to_segments()
     
-    merged = []
-    current = segments[0].copy()
-    
-    for seg in segments[1:]:
-        if (seg['process_id'] == current['process_id'] and 
-            seg['start'] == current['end']):
-            # Merge consecutive segments
-            current['end'] = seg['end']
-            current['duration'] = current['end'] - current['start']
-        else:
-            merged.append(current)
-            current = seg.copy()
-    
-    merged.append(current)
-    return merged
\ No newline at end of file
+    starts, ends, pids = segments.starts, segments.ends, segments.pids
+    if len(pids) == 0:
+        return segments
+    
+    # A run ends wherever the process changes or there is a gap before the next segment
+    breaks = np.flatnonzero((pids[1:] != pids[:-1]) | (starts[1:] != ends[:-1])) + 1
+    firsts = np.concatenate(([0], breaks))
+    lasts = np.concatenate((breaks - 1, [len(pids) - 1]))
+    return GanttArrays(starts=starts[firsts], ends=ends[lasts], pids=pids[firsts])
+
+def figure_save_args(path: str) -> Tuple[str, Dict[str, Any]]:
+    """Return the output path and savefig kwargs for an experiment figure.
+
+    EXPERIMENT_DPI sets the raster resolution (default 100). EXPERIMENT_SVG=1
+    swaps the extension for vector SVG output. EXPERIMENT_FINAL=1 adds
+    bbox_inches='tight', which costs an extra render pass.
+    """
+    kwargs: Dict[str, Any] = {'dpi': int(os.getenv('EXPERIMENT_DPI', '100'))}
+    if os.getenv('EXPERIMENT_SVG') == '1':
+        path = os.path.splitext(path)[0] + '.svg'
+    if os.getenv('EXPERIMENT_FINAL') == '1':
+        kwargs['bbox_inches'] = 'tight'
+    return path, kwargs
+
+def parse_experiment_args(description: str, argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the shared --svg/--final/--no-cache experiment flags into the environment"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--svg', action='store_true', help='Save figures as SVG instead of PNG')
+    parser.add_argument('--final', action='store_true',
+                        help='Publication output: tight bounding boxes')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Rerun every simulation instead of reusing cached metrics')
+    args = parser.parse_args(argv)
+    if args.svg:
+        os.environ['EXPERIMENT_SVG'] = '1'
+    if args.final:
+        os.environ['EXPERIMENT_FINAL'] = '1'
+    if args.no_cache:
+        os.environ['EXPERIMENT_NO_CACHE'] = '1'
+    return args
+
+def _require_matplotlib():
+    if importlib.util.find_spec('matplotlib') is None:
+        raise ImportError("Plotting requires matplotlib. "
+                          "Install with: pip install -r requirements.txt")
+
+def load_pyplot():
+    """Import matplotlib.pyplot on demand with the headless Agg backend"""
+    _require_matplotlib()
+    import matplotlib
+    matplotlib.use('Agg')  # Figures are only written to disk
+    import matplotlib.pyplot as plt
+    return plt
+
+def new_figure(**kwargs):
+    """Create a standalone Figure outside pyplot, safe to build on a worker thread"""
+    _require_matplotlib()
+    from matplotlib.figure import Figure
+    return Figure(**kwargs)
@@ -1,64 +1,110 @@
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.collections import PolyCollection
 import seaborn as sns
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Tuple
-import os
+from typing import List, Dict, Any, Tuple, Union
+from pathlib import Path
+
+from .utils.helpers import GanttArrays, create_gantt_segments, get_colormap
 
 class Visualizer:
     """Creates visualizations for simulation results"""
     
-    def __init__(self, output_dir: str = "data/results/graphs"):
+    def __init__(self, output_dir: str = "data/results/graphs", reuse_figures: bool = False):
         self.output_dir = output_dir
-        os.makedirs(output_dir, exist_ok=True)
+        self._out = Path(output_dir)
+        self._out.mkdir(parents=True, exist_ok=True)
+        # With reuse_figures, each plot type keeps one Figure that is cleared and
+        # redrawn on later calls instead of building a new one; call close() when done
+        self.reuse_figures = reuse_figures
+        self._fig_cache: Dict[str, Tuple[Any, Any]] = {}
+        # Per-algorithm (stats list, {metric: values}) for repeated box plots
+        self._stats_cache: Dict[str, Tuple[List[Dict[str, Any]], Dict[str, np.ndarray]]] = {}
         
         # Set style
         plt.style.use('seaborn-v0_8-darkgrid')
         sns.set_palette("husl")
     
-    def create_gantt_chart(self, gantt_data: List[Tuple[int, int, int]], 
+    def _subplots(self, key: str, nrows: int = 1, ncols: int = 1, **kwargs):
+        """plt.subplots, or the cached figure for key with its axes cleared"""
+        if key in self._fig_cache:
+            fig, axes = self._fig_cache[key]
+            for ax in np.atleast_1d(axes).flat:
+                ax.cla()
+            plt.figure(fig.number)  # Make it current for plt.suptitle/savefig
+            return fig, axes
+        
+        fig, axes = plt.subplots(nrows, ncols, constrained_layout=True, **kwargs)
+        if self.reuse_figures:
+            self._fig_cache[key] = (fig, axes)
+        return fig, axes
+    
+    def _finish(self, fig):
+        plt.show()
+        if not self.reuse_figures:
+            plt.close(fig)
+    
+    def close(self):
+        """Close the figures kept for reuse"""
+        for fig, _ in self._fig_cache.values():
+            plt.close(fig)
+        self._fig_cache.clear()
+    
+    def create_gantt_chart(self, gantt_data: Union[GanttArrays, List[Tuple[int, int, int]]], 
                           title: str = "Gantt Chart", 
                           filename: str = None):
         """Create Gantt chart for first N processes"""
-        if not gantt_data:
+        if not len(gantt_data):
             print("No Gantt data available")
             return
+        if not isinstance(gantt_data, GanttArrays):
+            gantt_data = create_gantt_segments(gantt_data)
         
-        fig, ax = plt.subplots(figsize=(15, 6))
+        fig, ax = self._subplots('gantt', figsize=(15, 6))
         
-        # Create color map for processes
-        unique_pids = list(set([pid for _, _, pid in gantt_data]))
-        cmap = plt.cm.get_cmap('tab20', len(unique_pids))
-        color_map = {pid: cmap(i) for i, pid in enumerate(unique_pids)}
+        # Create color map for processes; sorted pids keep colors stable across runs
+        unique_pids = np.unique(gantt_data.pids)
+        palette = get_colormap('tab20')(
+            np.arange(len(unique_pids)) / max(1, len(unique_pids) - 1)
+        )
+        # RGBA lookup table indexed by pid (offset by the smallest pid)
+        base_pid = unique_pids[0]
+        color_lut = np.zeros((unique_pids[-1] - base_pid + 1, 4))
+        color_lut[unique_pids - base_pid] = palette
         
-        # Plot each process execution
-        y_ticks = []
-        y_labels = []
+        # Plot every execution as one PolyCollection instead of an artist per bar
+        starts = gantt_data.starts[:20]  # First 20 processes
+        ends = gantt_data.ends[:20]
+        shown_pids = gantt_data.pids[:20]
+        pids = shown_pids.tolist()
+        rows = np.arange(len(pids))
+        verts = np.empty((len(pids), 4, 2))
+        verts[:, [0, 1], 0] = starts[:, None]
+        verts[:, [2, 3], 0] = ends[:, None]
+        verts[:, [0, 3], 1] = rows[:, None]
+        verts[:, [1, 2], 1] = rows[:, None] + 0.8
+        facecolors = color_lut[shown_pids - base_pid]
+        ax.add_collection(PolyCollection(verts, facecolors=facecolors))
+        ax.autoscale_view()
         
-        for i, (start, end, pid) in enumerate(gantt_data[:20]):  # First 20 processes
-            duration = end - start
-            ax.broken_barh([(start, duration)], (i, 0.8), 
-                          facecolors=color_map[pid])
-            
-            # Add process label in the middle of the bar
-            mid_x = start + duration / 2
-            ax.text(mid_x, i + 0.4, f'P{pid}', 
+        # Add process label in the middle of each bar
+        for row, mid_x, pid in zip(rows.tolist(), ((starts + ends) / 2).tolist(), pids):
+            ax.text(mid_x, row + 0.4, f'P{pid}', 
                    ha='center', va='center', color='white', fontweight='bold')
         
         # Set up axes
-        ax.set_yticks([i + 0.4 for i in range(min(20, len(gantt_data)))])
-        ax.set_yticklabels([f'P{gantt_data[i][2]}' for i in range(min(20, len(gantt_data)))])
+        ax.set_yticks(rows + 0.4)
+        ax.set_yticklabels([f'P{pid}' for pid in pids])
         ax.set_xlabel('Time (ms)')
         ax.set_title(f'{title} - First 20 Processes')
         ax.grid(True, axis='x', alpha=0.3)
         
-        plt.tight_layout()
-        
         if filename:
-            plt.savefig(os.path.join(self.output_dir, filename), dpi=300, bbox_inches='tight')
+            plt.savefig(self._out / filename, dpi=150)
         
-        plt.show()
+        self._finish(fig)
     
     def create_metrics_comparison(self, results: Dict[str, Dict[str, float]], 
                                  metrics: List[str] = None,
@@ -74,7 +120,7 @@ class Visualizer:
                 for metric in metrics}
         
         # Create subplots
-        fig, axes = plt.subplots(1, len(metrics), figsize=(15, 5))
+        fig, axes = self._subplots(f'metrics_{len(metrics)}', 1, len(metrics), figsize=(15, 5))
         if len(metrics) == 1:
             axes = [axes]
         
@@ -84,10 +130,7 @@ class Visualizer:
             bars = ax.bar(x, data[metric], color=plt.cm.Set3(np.arange(len(algorithms))))
             
             # Add value labels on bars
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                       f'{height:.1f}', ha='center', va='bottom', fontsize=9)
+            ax.bar_label(bars, fmt='%.1f', padding=3, fontsize=9)
             
             ax.set_xlabel('Algorithm')
             ax.set_ylabel('Time (ms)')
@@ -97,23 +140,36 @@ class Visualizer:
             ax.grid(True, axis='y', alpha=0.3)
         
         plt.suptitle(title, fontsize=14, fontweight='bold')
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.output_dir, 'metrics_comparison.png'), dpi=300)
-        plt.show()
+        plt.savefig(self._out / 'metrics_comparison.png', dpi=150)
+        self._finish(fig)
+    
+    def _metric_values(self, algo: str, stats: List[Dict[str, Any]], metric: str) -> np.ndarray:
+        """One metric of every process as an array, projected once per stats list"""
+        cached = self._stats_cache.get(algo)
+        if cached is None or cached[0] is not stats:
+            cached = (stats, {})
+            self._stats_cache[algo] = cached
+        
+        by_metric = cached[1]
+        if metric not in by_metric:
+            by_metric[metric] = np.fromiter(
+                (p[metric] for p in stats if metric in p), dtype=np.float64
+            )
+        return by_metric[metric]
     
     def create_box_plots(self, all_process_stats: Dict[str, List[Dict[str, Any]]],
                         metric: str = 'waiting_time',
                         title: str = "Waiting Time Distribution"):
         """Create box plots showing distribution of metrics"""
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig, ax = self._subplots('boxplot', figsize=(12, 6))
         
         data_to_plot = []
         labels = []
         
         for algo, stats in all_process_stats.items():
             if stats:
-                values = [p[metric] for p in stats if metric in p]
-                if values:
+                values = self._metric_values(algo, stats, metric)
+                if len(values):
                     data_to_plot.append(values)
                     labels.append(algo)
         
@@ -130,15 +186,14 @@ class Visualizer:
         ax.grid(True, axis='y', alpha=0.3)
         
         plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.output_dir, f'{metric}_boxplot.png'), dpi=300)
-        plt.show()
+        plt.savefig(self._out / f'{metric}_boxplot.png', dpi=150)
+        self._finish(fig)
     
     def create_line_plots(self, sensitivity_results: Dict[str, Dict[str, List[float]]],
                          param_name: str = "Time Quantum",
                          title: str = "Sensitivity Analysis"):
         """Create line plots for sensitivity analysis"""
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+        fig, axes = self._subplots('sensitivity', 2, 2, figsize=(14, 10))
         axes = axes.flatten()
         
         metrics = ['avg_turnaround_time', 'avg_waiting_time', 
@@ -163,12 +218,16 @@ class Visualizer:
             ax.legend()
         
         plt.suptitle(title, fontsize=16, fontweight='bold')
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.output_dir, 'sensitivity_analysis.png'), dpi=300)
-        plt.show()
+        plt.savefig(self._out / 'sensitivity_analysis.png', dpi=150)
+        self._finish(fig)
     
-    def create_summary_table(self, results: Dict[str, Dict[str, float]]) -> pd.DataFrame:
-        """Create a summary DataFrame of all metrics"""
+    def create_summary_table(self, results: Dict[str, Dict[str, float]],
+                             style: bool = True) -> pd.DataFrame:
+        """Create a summary DataFrame of all metrics
+        
+        style=True returns a Styler highlighting the best value in each
+        column; style=False returns the plain DataFrame. Both write CSV/Excel.
+        """
         df = pd.DataFrame.from_dict(results, orient='index')
         
         # Select key metrics for display
@@ -192,31 +251,27 @@ class Visualizer:
         
         df_display = df_display.rename(columns=display_names)
         
+        # Save to CSV and Excel
+        df_display.to_csv(self._out / 'summary_results.csv')
+        df_display.to_excel(self._out / 'summary_results.xlsx')
+        
+        # Styling only matters for HTML-style sinks; plain callers skip it
+        if not style:
+            return df_display
+        
         # Highlight best values (lower is better for times, higher for others)
-        def highlight_best(row):
-            # For turnaround, waiting, response: lower is better
-            # For CPU utilization, throughput, fairness: higher is better
-            
-            styles = []
-            for col in df_display.columns:
-                value = row[col]
-                if 'Turnaround' in col or 'Waiting' in col or 'Response' in col:
-                    # Lower is better
-                    is_best = value == df_display[col].min()
-                else:
-                    # Higher is better
-                    is_best = value == df_display[col].max()
-                
-                if is_best:
-                    styles.append('background-color: lightgreen')
-                else:
-                    styles.append('')
-            return styles
-        
-        styled_df = df_display.style.apply(highlight_best, axis=1)
+        # The whole mask is built in one comparison and applied with axis=None
+        lower_better = np.array([
+            'Turnaround' in col or 'Waiting' in col or 'Response' in col
+            for col in df_display.columns
+        ], dtype=bool)
+        best_values = np.where(lower_better, df_display.min().to_numpy(),
+                               df_display.max().to_numpy())
+        highlight = pd.DataFrame(
+            np.where(df_display.to_numpy() == best_values, 'background-color: lightgreen', ''),
+            index=df_display.index, columns=df_display.columns
+        )
         
-        # Save to CSV and Excel
-        df_display.to_csv(os.path.join(self.output_dir, 'summary_results.csv'))
-        df_display.to_excel(os.path.join(self.output_dir, 'summary_results.xlsx'))
+        styled_df = df_display.style.apply(lambda _: highlight, axis=None)
         
         return styled_df
\ No newline at end of file
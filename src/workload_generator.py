@@ -1,9 +1,18 @@
 import numpy as np
-import random
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+import os
+import pickle
+import hashlib
+import warnings
+from typing import Iterable, List, Dict, Any, Optional, TextIO, Union
+from dataclasses import dataclass, astuple
 from .pcb import PCB
 
+# On-disk cache of seeded synthetic workloads shared across experiments
+WORKLOAD_CACHE_DIR = os.path.join('data', 'cache', 'workloads')
+# Bump when the pickled PCB layout changes so stale caches are not loaded
+WORKLOAD_CACHE_VERSION = 7
+_workload_cache_stats = {'hits': 0, 'misses': 0}
+
 @dataclass
 class WorkloadConfig:
     """Configuration for workload generation"""
@@ -17,6 +26,7 @@ class WorkloadConfig:
     priority_max: int = 10
     cpu_io_ratio: float = 0.7  # 70% CPU intensive
     workload_type: str = "mixed"  # "cpu_intensive", "io_intensive", "mixed"
+    seed: Optional[int] = None  # None draws fresh entropy on every generation
 
 class WorkloadGenerator:
     """Generate synthetic process workloads"""
@@ -24,11 +34,13 @@ class WorkloadGenerator:
     def __init__(self, config: WorkloadConfig = None):
         self.config = config or WorkloadConfig()
         self.next_pid = 1
+        # One Generator per workload generator; successive batches continue its stream
+        self.rng = np.random.default_rng(self.config.seed)
+        # Exponential inter-arrival gaps drawn by the last synthetic workload
+        self.last_inter_arrivals: Optional[np.ndarray] = None
     
     def generate_synthetic_workload(self) -> List[PCB]:
         """Generate processes using statistical distributions"""
-        processes = []
-        
         if self.config.workload_type == "cpu_intensive":
             cpu_io_ratio = 0.9  # 90% CPU
         elif self.config.workload_type == "io_intensive":
@@ -36,96 +48,142 @@ class WorkloadGenerator:
         else:
             cpu_io_ratio = self.config.cpu_io_ratio
         
-        # Generate arrival times using Poisson process (exponential inter-arrival)
-        arrival_times = np.cumsum(np.random.exponential(
-            1/self.config.arrival_lambda, 
-            self.config.num_processes
-        )).astype(int)
-        
-        for i in range(self.config.num_processes):
-            # Generate CPU burst time (truncated normal distribution)
-            cpu_burst = int(np.random.normal(
-                self.config.cpu_burst_mean, 
-                self.config.cpu_burst_std
-            ))
-            cpu_burst = max(1, cpu_burst)  # Ensure positive
-            
-            # Generate I/O burst based on workload type
-            if np.random.random() < cpu_io_ratio:
-                # CPU-intensive process: shorter I/O bursts
-                io_burst = np.random.randint(
-                    self.config.io_burst_min, 
-                    self.config.io_burst_max // 2
-                )
-            else:
-                # I/O-intensive process: longer I/O bursts
-                io_burst = np.random.randint(
-                    self.config.io_burst_max // 2, 
-                    self.config.io_burst_max
-                )
-            
-            # Generate priority
-            priority = np.random.randint(
-                self.config.priority_min, 
-                self.config.priority_max + 1
-            )
-            
-            # Create PCB
-            process = PCB(
-                process_id=self.next_pid,
-                arrival_time=int(arrival_times[i]),
+        rng = self.rng
+        n = self.config.num_processes
+        io_split = self.config.io_burst_max // 2
+        
+        # Sample every field for all processes at once
+        # Arrival times: Poisson process (exponential inter-arrival)
+        inter_arrivals = rng.exponential(1/self.config.arrival_lambda, n)
+        arrival_times = np.cumsum(inter_arrivals).astype(int)
+        self.last_inter_arrivals = inter_arrivals
+        
+        # CPU bursts: truncated normal distribution, kept positive
+        cpu_bursts = np.maximum(
+            rng.normal(self.config.cpu_burst_mean, self.config.cpu_burst_std, n).astype(int), 1
+        )
+        
+        # I/O bursts: CPU-intensive processes draw shorter bursts than I/O-intensive ones
+        cpu_bound = rng.random(n) < cpu_io_ratio
+        io_bursts = rng.integers(
+            np.where(cpu_bound, self.config.io_burst_min, io_split),
+            np.where(cpu_bound, io_split, self.config.io_burst_max)
+        )
+        
+        priorities = rng.integers(self.config.priority_min, self.config.priority_max + 1, n)
+        
+        # Build PCBs from plain Python ints so arithmetic in the simulator stays unboxed
+        first_pid = self.next_pid
+        processes = [
+            PCB(
+                process_id=first_pid + i,
+                arrival_time=arrival,
                 total_cpu_time=cpu_burst,
                 remaining_cpu_time=cpu_burst,
                 io_burst_time=io_burst,
                 priority=priority
             )
-            
-            processes.append(process)
-            self.next_pid += 1
+            for i, (arrival, cpu_burst, io_burst, priority) in enumerate(zip(
+                arrival_times.tolist(), cpu_bursts.tolist(),
+                io_bursts.tolist(), priorities.tolist()
+            ))
+        ]
+        self.next_pid += n
         
         return processes
     
-    def generate_from_trace(self, trace_file: str) -> List[PCB]:
-        """Generate processes from a trace file"""
-        processes = []
+    def generate_from_trace(self, trace_file: Union[str, os.PathLike, TextIO]) -> List[PCB]:
+        """Generate processes from a trace file path or an open text stream
         
-        try:
-            with open(trace_file, 'r') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    
-                    parts = line.split(',')
-                    if len(parts) < 4:
-                        print(f"Warning: Invalid trace line {line_num}: {line}")
-                        continue
-                    
-                    try:
-                        pid = int(parts[0])
-                        arrival = int(parts[1])
-                        cpu_burst = int(parts[2])
-                        io_burst = int(parts[3])
-                        priority = int(parts[4]) if len(parts) > 4 else 1
-                        
-                        process = PCB(
-                            process_id=pid,
-                            arrival_time=arrival,
-                            total_cpu_time=cpu_burst,
-                            remaining_cpu_time=cpu_burst,
-                            io_burst_time=io_burst,
-                            priority=priority
-                        )
-                        
-                        processes.append(process)
-                        self.next_pid = max(self.next_pid, pid + 1)
-                    
-                    except ValueError as e:
-                        print(f"Error parsing trace line {line_num}: {e}")
+        Well-formed traces are tokenized by a single np.loadtxt call; a trace
+        with malformed lines falls back to the per-line parser, which skips them.
+        """
+        if isinstance(trace_file, (str, os.PathLike)):
+            source = trace_file
+        else:
+            # Read the stream once so the fallback parser can go over it again
+            source = trace_file.read().splitlines()
         
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)  # Raised for empty traces
+                table = np.loadtxt(source, delimiter=',', comments='#',
+                                   dtype=np.int64, ndmin=2)
         except FileNotFoundError:
             print(f"Trace file not found: {trace_file}")
             return []
+        except ValueError:
+            return self._parse_trace_source(source)
+        
+        if table.shape[1] < 4:
+            return self._parse_trace_source(source)
+        
+        if table.shape[1] > 4:
+            priorities = table[:, 4].tolist()
+        else:
+            priorities = [1] * len(table)
+        
+        processes = [
+            PCB(
+                process_id=pid,
+                arrival_time=arrival,
+                total_cpu_time=cpu_burst,
+                remaining_cpu_time=cpu_burst,
+                io_burst_time=io_burst,
+                priority=priority
+            )
+            for pid, arrival, cpu_burst, io_burst, priority in zip(
+                table[:, 0].tolist(), table[:, 1].tolist(), table[:, 2].tolist(),
+                table[:, 3].tolist(), priorities
+            )
+        ]
+        if processes:
+            self.next_pid = max(self.next_pid, int(table[:, 0].max()) + 1)
+        
+        return processes
+    
+    def _parse_trace_source(self, source: Union[str, os.PathLike, List[str]]) -> List[PCB]:
+        """Run the per-line parser over a trace path or a list of lines"""
+        if isinstance(source, list):
+            return self._parse_trace_lines(source)
+        with open(source, 'r') as f:
+            return self._parse_trace_lines(f)
+    
+    def _parse_trace_lines(self, lines: Iterable[str]) -> List[PCB]:
+        """Parse a trace line by line, reporting and skipping invalid lines"""
+        processes = []
+        
+        for line_num, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            parts = line.split(',')
+            if len(parts) < 4:
+                print(f"Warning: Invalid trace line {line_num}: {line}")
+                continue
+            
+            try:
+                pid = int(parts[0])
+                arrival = int(parts[1])
+                cpu_burst = int(parts[2])
+                io_burst = int(parts[3])
+                priority = int(parts[4]) if len(parts) > 4 else 1
+                
+                process = PCB(
+                    process_id=pid,
+                    arrival_time=arrival,
+                    total_cpu_time=cpu_burst,
+                    remaining_cpu_time=cpu_burst,
+                    io_burst_time=io_burst,
+                    priority=priority
+                )
+                
+                processes.append(process)
+                self.next_pid = max(self.next_pid, pid + 1)
+            
+            except ValueError as e:
+                print(f"Error parsing trace line {line_num}: {e}")
         
         return processes
     
@@ -136,35 +194,78 @@ class WorkloadGenerator:
         cpu_trace = []
         for i in range(100):
             arrival = i * 10
-            cpu_burst = np.random.randint(80, 150)
-            io_burst = np.random.randint(5, 20)
-            priority = np.random.randint(1, 4)
+            cpu_burst = self.rng.integers(80, 150)
+            io_burst = self.rng.integers(5, 20)
+            priority = self.rng.integers(1, 4)
             cpu_trace.append(f"{i+1},{arrival},{cpu_burst},{io_burst},{priority}")
         
         # I/O-intensive trace
         io_trace = []
         for i in range(100):
             arrival = i * 15
-            cpu_burst = np.random.randint(5, 30)
-            io_burst = np.random.randint(50, 200)
-            priority = np.random.randint(1, 10)
+            cpu_burst = self.rng.integers(5, 30)
+            io_burst = self.rng.integers(50, 200)
+            priority = self.rng.integers(1, 10)
             io_trace.append(f"{i+1},{arrival},{cpu_burst},{io_burst},{priority}")
         
         # Mixed workload trace
         mixed_trace = []
         for i in range(200):
             arrival = i * 8
-            if np.random.random() < 0.5:
-                cpu_burst = np.random.randint(40, 100)
-                io_burst = np.random.randint(20, 60)
+            if self.rng.random() < 0.5:
+                cpu_burst = self.rng.integers(40, 100)
+                io_burst = self.rng.integers(20, 60)
             else:
-                cpu_burst = np.random.randint(10, 50)
-                io_burst = np.random.randint(40, 120)
-            priority = np.random.randint(1, 6)
+                cpu_burst = self.rng.integers(10, 50)
+                io_burst = self.rng.integers(40, 120)
+            priority = self.rng.integers(1, 6)
             mixed_trace.append(f"{i+1},{arrival},{cpu_burst},{io_burst},{priority}")
         
         return {
             "cpu_intensive": cpu_trace,
             "io_intensive": io_trace,
             "mixed": mixed_trace
-        }
\ No newline at end of file
+        }
+
+def derive_seed(*parts) -> int:
+    """Derive a stable 32-bit seed from an experiment name and parameters.
+
+    Unlike hash(), the result does not change between interpreter runs.
+    """
+    digest = hashlib.sha1(repr(parts).encode()).digest()
+    return int.from_bytes(digest[:4], 'little')
+
+def load_or_generate(config: WorkloadConfig) -> List[PCB]:
+    """Load a seeded synthetic workload from the on-disk cache, generating it on a miss"""
+    if config.seed is None:
+        raise ValueError("load_or_generate needs a WorkloadConfig with a seed")
+    
+    key = hashlib.sha1(
+        repr((WORKLOAD_CACHE_VERSION, astuple(config))).encode()
+    ).hexdigest()[:16]
+    cache_file = os.path.join(
+        WORKLOAD_CACHE_DIR,
+        f"{config.workload_type}_{config.num_processes}_{key}.pkl"
+    )
+    
+    if os.path.exists(cache_file):
+        with open(cache_file, 'rb') as f:
+            processes = pickle.load(f)
+        _workload_cache_stats['hits'] += 1
+        return processes
+    
+    processes = WorkloadGenerator(config).generate_synthetic_workload()
+    
+    # Write through a temporary file so concurrent readers never see a partial pickle
+    os.makedirs(WORKLOAD_CACHE_DIR, exist_ok=True)
+    temp_file = f"{cache_file}.{os.getpid()}.tmp"
+    with open(temp_file, 'wb') as f:
+        pickle.dump(processes, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_file, cache_file)
+    
+    _workload_cache_stats['misses'] += 1
+    return processes
+
+def get_workload_cache_stats() -> Dict[str, int]:
+    """Return workload cache hit/miss counters for this process"""
+    return dict(_workload_cache_stats)
@@ -5,7 +5,10 @@ Unit tests for scheduling algorithms
 
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Project root, added once however many test modules are loaded together
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
 import unittest
 import heapq
@@ -17,6 +20,11 @@ from src.schedulers.round_robin import RoundRobinScheduler
 from src.schedulers.priority import PriorityScheduler
 from src.schedulers.mlfq import MLFQScheduler
 
+# Shared processes: read-only tests use them directly, mutating tests clone them
+ROWS = ((1, 0, 50, 50, 20, 1), (2, 10, 30, 30, 15, 2), (3, 20, 40, 40, 25, 3))
+PROCS = {row[0]: PCB.from_row(row) for row in ROWS}
+PROC_A, PROC_B = PROCS[1], PROCS[2]
+
 class TestFCFSScheduler(unittest.TestCase):
     """Test FCFS scheduler"""
     
@@ -25,26 +33,20 @@ class TestFCFSScheduler(unittest.TestCase):
     
     def test_add_process(self):
         """Test adding processes to FCFS"""
-        process1 = PCB(1, 0, 50, 50, 20, 1)
-        process2 = PCB(2, 10, 30, 30, 15, 2)
+        process1 = PROC_A.clone()
+        process2 = PROC_B.clone()
         
         self.scheduler.add_process(process1)
         self.scheduler.add_process(process2)
         
         self.assertEqual(self.scheduler.get_queue_length(), 2)
+
+class TestFCFSSchedulerProperties(unittest.TestCase):
+    """Test FCFS decisions that leave the scheduler untouched"""
     
-    def test_get_next_process(self):
-        """Test getting next process from FCFS"""
-        process1 = PCB(1, 0, 50, 50, 20, 1)
-        process2 = PCB(2, 10, 30, 30, 15, 2)
-        
-        self.scheduler.add_process(process1)
-        self.scheduler.add_process(process2)
-        
-        # Should get processes in FIFO order
-        self.assertEqual(self.scheduler.get_next_process().process_id, 1)
-        self.assertEqual(self.scheduler.get_next_process().process_id, 2)
-        self.assertIsNone(self.scheduler.get_next_process())
+    @classmethod
+    def setUpClass(cls):
+        cls.scheduler = FCFSScheduler()
     
     def test_is_preemptive(self):
         """Test FCFS preemption property"""
@@ -52,8 +54,8 @@ class TestFCFSScheduler(unittest.TestCase):
     
     def test_should_preempt(self):
         """Test FCFS preemption decision"""
-        current = PCB(1, 0, 50, 50, 20, 1)
-        new = PCB(2, 10, 30, 30, 15, 2)
+        current = PROC_A
+        new = PROC_B
         
         # FCFS should never preempt
         self.assertFalse(self.scheduler.should_preempt(current, new))
@@ -67,31 +69,13 @@ class TestSJFScheduler(unittest.TestCase):
     
     def test_add_process(self):
         """Test adding processes to SJF"""
-        process1 = PCB(1, 0, 50, 50, 20, 1)  # Longer job
-        process2 = PCB(2, 10, 30, 30, 15, 2)  # Shorter job
+        process1 = PROC_A.clone()  # Longer job
+        process2 = PROC_B.clone()  # Shorter job
         
         self.scheduler.add_process(process1)
         self.scheduler.add_process(process2)
         
         self.assertEqual(self.scheduler.get_queue_length(), 2)
-    
-    def test_get_next_process(self):
-        """Test SJF scheduling order (shortest first)"""
-        process1 = PCB(1, 0, 50, 50, 20, 1)  # 50ms
-        process2 = PCB(2, 10, 30, 30, 15, 2)  # 30ms
-        process3 = PCB(3, 20, 40, 40, 25, 3)  # 40ms
-        
-        # Add in different order
-        self.scheduler.add_process(process1)
-        self.scheduler.add_process(process3)
-        self.scheduler.add_process(process2)
-        
-        # Should get shortest job first (process2)
-        self.assertEqual(self.scheduler.get_next_process().process_id, 2)
-        # Then next shortest (process3)
-        self.assertEqual(self.scheduler.get_next_process().process_id, 3)
-        # Then longest (process1)
-        self.assertEqual(self.scheduler.get_next_process().process_id, 1)
 
 class TestSRTFScheduler(unittest.TestCase):
     """Test SRTF (preemptive SJF) scheduler"""
@@ -101,21 +85,43 @@ class TestSRTFScheduler(unittest.TestCase):
     
     def test_add_process(self):
         """Test adding processes to SRTF"""
-        process1 = PCB(1, 0, 50, 50, 20, 1)
-        process2 = PCB(2, 10, 30, 30, 15, 2)
+        process1 = PROC_A.clone()
+        process2 = PROC_B.clone()
         
         self.scheduler.add_process(process1)
         self.scheduler.add_process(process2)
         
         self.assertEqual(self.scheduler.get_queue_length(), 2)
     
+    def test_readd_replaces_key(self):
+        """Test that re-adding a queued process updates its key without duplicating it"""
+        process1 = PROC_A.clone()
+        process2 = PROC_B.clone()
+        self.scheduler.add_process(process1)
+        self.scheduler.add_process(process2)
+        
+        process1.remaining_cpu_time = 10
+        self.scheduler.add_process(process1)
+        
+        self.assertEqual(self.scheduler.get_queue_length(), 2)
+        self.assertIs(self.scheduler.get_next_process(), process1)
+        self.assertIs(self.scheduler.get_next_process(), process2)
+        self.assertIsNone(self.scheduler.get_next_process())
+
+class TestSRTFSchedulerProperties(unittest.TestCase):
+    """Test SRTF decisions that leave the scheduler untouched"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.scheduler = SRTFScheduler()
+    
     def test_should_preempt(self):
         """Test SRTF preemption decision"""
         # Current process with 40ms remaining
         current = PCB(1, 0, 50, 40, 20, 1)
         
         # New process with 30ms remaining (shorter)
-        new1 = PCB(2, 10, 30, 30, 15, 2)
+        new1 = PROC_B
         
         # New process with 50ms remaining (longer)
         new2 = PCB(3, 20, 60, 50, 25, 3)
@@ -135,9 +141,14 @@ class TestRoundRobinScheduler(unittest.TestCase):
     def setUp(self):
         self.scheduler = RoundRobinScheduler(time_quantum=20)
     
-    def test_time_quantum(self):
-        """Test time quantum property"""
-        self.assertEqual(self.scheduler.get_time_quantum(), 20)
+    def test_set_quantum(self):
+        """Test changing the time quantum between runs"""
+        self.scheduler.add_process(PROC_A.clone())
+        self.scheduler.set_quantum(50)
+        
+        self.assertEqual(self.scheduler.get_time_quantum(), 50)
+        self.assertEqual(self.scheduler.name, "RR(q=50)")
+        self.assertIsNone(self.scheduler.get_next_process())
     
     def test_on_time_quantum_expired(self):
         """Test handling of time quantum expiration"""
@@ -150,12 +161,29 @@ class TestRoundRobinScheduler(unittest.TestCase):
         self.assertEqual(self.scheduler.get_queue_length(), 1)
         self.assertEqual(self.scheduler.stats["preemptions"], 1)
 
+class TestRoundRobinSchedulerProperties(unittest.TestCase):
+    """Test Round Robin properties that leave the scheduler untouched"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.scheduler = RoundRobinScheduler(time_quantum=20)
+    
+    def test_time_quantum(self):
+        """Test time quantum property"""
+        self.assertEqual(self.scheduler.get_time_quantum(), 20)
+
 class TestPriorityScheduler(unittest.TestCase):
     """Test Priority scheduler"""
     
+    @classmethod
+    def setUpClass(cls):
+        # Only the preemption tests share these; they never queue a process
+        cls.pre_sched = PriorityScheduler(preemptive=True)
+        cls.nonpre_sched = PriorityScheduler(preemptive=False)
+    
     def test_preemptive_priority(self):
         """Test preemptive priority scheduling"""
-        scheduler = PriorityScheduler(preemptive=True)
+        scheduler = self.pre_sched
         
         # Current process with priority 3
         current = PCB(1, 0, 50, 50, 20, 3)
@@ -174,7 +202,7 @@ class TestPriorityScheduler(unittest.TestCase):
     
     def test_non_preemptive_priority(self):
         """Test non-preemptive priority scheduling"""
-        scheduler = PriorityScheduler(preemptive=False)
+        scheduler = self.nonpre_sched
         
         current = PCB(1, 0, 50, 50, 20, 3)
         new = PCB(2, 10, 30, 30, 15, 1)
@@ -195,6 +223,26 @@ class TestPriorityScheduler(unittest.TestCase):
         
         # Process priority should be reduced (improved)
         self.assertEqual(process.priority, 9)
+    
+    def test_apply_aging_reorders_heap(self):
+        """Test that an aged process moves ahead in the heap"""
+        scheduler = PriorityScheduler(preemptive=True, aging_interval=1000)
+        
+        old = PCB(1, 0, 100, 100, 20, 5)
+        recent = PCB(2, 1200, 100, 100, 20, 4)
+        scheduler.add_process(recent)
+        scheduler.add_process(old)
+        
+        scheduler.apply_aging(current_time=1500)
+        
+        # Both now have priority 4; the earlier arrival wins the tie
+        self.assertEqual(scheduler.get_next_process().process_id, 1)
+        
+        # The superseded heap entry is skipped, not handed out again
+        self.assertEqual(scheduler.get_queue_length(), 1)
+        self.assertEqual(scheduler.get_next_process().process_id, 2)
+        self.assertIsNone(scheduler.get_next_process())
+        self.assertTrue(scheduler.is_empty())
 
 class TestMLFQScheduler(unittest.TestCase):
     """Test Multilevel Feedback Queue scheduler"""
@@ -204,32 +252,12 @@ class TestMLFQScheduler(unittest.TestCase):
     
     def test_initial_queue_assignment(self):
         """Test that new processes go to highest priority queue"""
-        process = PCB(1, 0, 50, 50, 20, 1)
+        process = PROC_A.clone()
         self.scheduler.add_process(process)
         
         self.assertEqual(process.current_queue_level, 0)
         self.assertEqual(self.scheduler.queues[0][0].process_id, 1)
     
-    def test_get_time_quantum_for_process(self):
-        """Test time quantum assignment based on queue level"""
-        process = PCB(1, 0, 50, 50, 20, 1)
-        
-        # Level 0 should get quantum 10
-        process.current_queue_level = 0
-        self.assertEqual(self.scheduler.get_time_quantum_for_process(process), 10)
-        
-        # Level 1 should get quantum 20
-        process.current_queue_level = 1
-        self.assertEqual(self.scheduler.get_time_quantum_for_process(process), 20)
-        
-        # Level 2 should get quantum 40
-        process.current_queue_level = 2
-        self.assertEqual(self.scheduler.get_time_quantum_for_process(process), 40)
-        
-        # Level beyond available quanta should get last quantum
-        process.current_queue_level = 5
-        self.assertEqual(self.scheduler.get_time_quantum_for_process(process), 40)
-    
     def test_demotion(self):
         """Test process demotion after using time quantum"""
         process = PCB(1, 0, 100, 100, 20, 1)
@@ -238,16 +266,17 @@ class TestMLFQScheduler(unittest.TestCase):
         # Simulate multiple runs at same level
         self.scheduler.process_counts[process.process_id] = 2
         
-        # Time quantum expires, should demote to next level
+        # Dispatch it, then the time quantum expires: should demote to next level
+        self.assertIs(self.scheduler.get_next_process(), process)
         self.scheduler.on_time_quantum_expired(process)
         
         self.assertEqual(process.current_queue_level, 1)
-        self.assertEqual(len(self.scheduler.queues[1]), 1)
+        self.assertEqual([len(q) for q in self.scheduler.queues], [0, 1, 0])
     
     def test_priority_boost(self):
         """Test periodic priority boost"""
         # Add process to low priority queue
-        process = PCB(1, 0, 50, 50, 20, 1)
+        process = PROC_A.clone()
         process.current_queue_level = 2
         self.scheduler.queues[2].append(process)
         
@@ -256,8 +285,47 @@ class TestMLFQScheduler(unittest.TestCase):
         
         # Process should be moved to queue 0
         self.assertEqual(process.current_queue_level, 0)
-        self.assertEqual(len(self.scheduler.queues[0]), 1)
-        self.assertEqual(len(self.scheduler.queues[2]), 0)
+        self.assertEqual([len(q) for q in self.scheduler.queues], [1, 0, 0])
+
+class TestMLFQSchedulerProperties(unittest.TestCase):
+    """Test MLFQ lookups that leave the scheduler untouched"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.scheduler = MLFQScheduler(num_queues=3, time_quanta=[10, 20, 40])
+    
+    def test_get_time_quantum_for_process(self):
+        """Test time quantum assignment based on queue level"""
+        process = PROC_A.clone()
+        
+        # Each level gets its own quantum; levels beyond the quanta get the last one
+        for level, expected in [(0, 10), (1, 20), (2, 40), (5, 40)]:
+            with self.subTest(level=level):
+                process.current_queue_level = level
+                self.assertEqual(self.scheduler.get_time_quantum_for_process(process), expected)
+
+class TestDispatchOrder(unittest.TestCase):
+    """Test the order each scheduler hands out queued processes"""
+    
+    # (scheduler class, process ids in insertion order, expected dispatch order)
+    CASES = [
+        (FCFSScheduler, [1, 2], [1, 2]),             # FIFO
+        (SJFScheduler, [1, 3, 2], [2, 3, 1]),        # Shortest burst first
+        (SRTFScheduler, [1, 3, 2], [2, 3, 1]),       # Shortest remaining first
+        (PriorityScheduler, [3, 1, 2], [1, 2, 3]),   # Lowest priority number first
+    ]
+    
+    def test_get_next_process(self):
+        """Test dispatch order, then an empty queue"""
+        for scheduler_cls, order, expected in self.CASES:
+            with self.subTest(scheduler=scheduler_cls.__name__):
+                scheduler = scheduler_cls()
+                for pid in order:
+                    scheduler.add_process(PROCS[pid].clone())
+                
+                dispatched = [scheduler.get_next_process().process_id for _ in order]
+                self.assertEqual(dispatched, expected)
+                self.assertIsNone(scheduler.get_next_process())
 
 def run_all_scheduler_tests():
     """Run all scheduler tests"""
@@ -267,14 +335,20 @@ def run_all_scheduler_tests():
     
     # Add test classes
     suite.addTests(loader.loadTestsFromTestCase(TestFCFSScheduler))
+    suite.addTests(loader.loadTestsFromTestCase(TestFCFSSchedulerProperties))
     suite.addTests(loader.loadTestsFromTestCase(TestSJFScheduler))
     suite.addTests(loader.loadTestsFromTestCase(TestSRTFScheduler))
+    suite.addTests(loader.loadTestsFromTestCase(TestSRTFSchedulerProperties))
     suite.addTests(loader.loadTestsFromTestCase(TestRoundRobinScheduler))
+    suite.addTests(loader.loadTestsFromTestCase(TestRoundRobinSchedulerProperties))
     suite.addTests(loader.loadTestsFromTestCase(TestPriorityScheduler))
     suite.addTests(loader.loadTestsFromTestCase(TestMLFQScheduler))
+    suite.addTests(loader.loadTestsFromTestCase(TestMLFQSchedulerProperties))
+    suite.addTests(loader.loadTestsFromTestCase(TestDispatchOrder))
     
     # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
+    # TEST_VERBOSITY=2 lists every test; the default prints only progress dots
+    runner = unittest.TextTestRunner(verbosity=int(os.environ.get('TEST_VERBOSITY', '1')))
     result = runner.run(suite)
     
     return result.wasSuccessful()
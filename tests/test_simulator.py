@@ -5,15 +5,35 @@ Unit tests for the simulator module
 
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Project root, added once however many test modules are loaded together
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
+import gc
+import io
 import unittest
+import tempfile
+from unittest.mock import patch
 import numpy as np
 from src.pcb import PCB, ProcessState
 from src.event import Event, EventQueue, EventType
 from src.simulator import CPUSimulator
 from src.schedulers.fcfs import FCFSScheduler
+from src.schedulers.priority import PriorityScheduler
+from src.schedulers.round_robin import RoundRobinScheduler
 from src.workload_generator import WorkloadGenerator, WorkloadConfig
+from src import result_cache
+from src.result_cache import make_run_config, run_cached, get_result_cache_stats
+
+# Shared processes; simulations mutate them, so tests run on clones
+ROWS = ((1, 0, 50, 50, 20, 1), (2, 10, 30, 30, 15, 2))
+PROC_A, PROC_B = (PCB.from_row(row) for row in ROWS)
+
+def work_bound(processes, context_switch_time):
+    """Tight max_time: all CPU work, two switches per process, and some slack"""
+    return (sum(p.total_cpu_time for p in processes)
+            + 2 * len(processes) * context_switch_time + 20)
 
 class TestEventQueue(unittest.TestCase):
     """Test EventQueue functionality"""
@@ -33,6 +53,45 @@ class TestEventQueue(unittest.TestCase):
         self.assertEqual(self.event_queue.pop().timestamp, 50)
         self.assertEqual(self.event_queue.pop().timestamp, 100)
     
+    def test_equal_timestamps_pop_in_push_order(self):
+        """Events sharing a timestamp are delivered first-in, first-out"""
+        for pid in (3, 1, 2):
+            self.event_queue.push(Event(10, EventType.PROCESS_ARRIVAL, pid))
+        
+        self.assertEqual(self.event_queue.peek_time(), 10)
+        self.assertEqual([self.event_queue.pop().process_id for _ in range(3)], [3, 1, 2])
+    
+    def test_context_switch_complete_pops_first(self):
+        """A finishing context switch precedes other events at the same time"""
+        self.event_queue.schedule_arrival(1, 10)
+        self.event_queue.schedule_context_switch_complete(2, 10)
+        
+        event = self.event_queue.pop()
+        self.assertEqual(event.type, EventType.CONTEXT_SWITCH_COMPLETE)
+        self.assertEqual(event.process_id, 2)
+        self.assertEqual(self.event_queue.pop().process_id, 1)
+    
+    def test_bulk_load(self):
+        """Test that bulk-loaded events pop in timestamp order"""
+        self.event_queue.push(Event(40, EventType.PROCESS_ARRIVAL, 9))
+        self.event_queue.bulk_load(
+            Event(ts, EventType.PROCESS_ARRIVAL, pid)
+            for pid, ts in enumerate([30, 10, 50, 10], 1)
+        )
+        
+        self.assertEqual(self.event_queue.size(), 5)
+        popped = [self.event_queue.pop() for _ in range(5)]
+        self.assertEqual([e.timestamp for e in popped], [10, 10, 30, 40, 50])
+        self.assertEqual([e.process_id for e in popped[:2]], [2, 4])
+    
+    def test_bulk_schedule_arrivals(self):
+        """Test that bulk-scheduled arrivals pop as arrival events in time order"""
+        self.event_queue.bulk_schedule_arrivals([(1, 30), (2, 10), (3, 20)])
+        
+        popped = [self.event_queue.pop() for _ in range(3)]
+        self.assertEqual([e.process_id for e in popped], [2, 3, 1])
+        self.assertTrue(all(e.type == EventType.PROCESS_ARRIVAL for e in popped))
+    
     def test_is_empty(self):
         """Test is_empty method"""
         self.assertTrue(self.event_queue.is_empty())
@@ -54,10 +113,9 @@ class TestEventQueue(unittest.TestCase):
         
         self.assertEqual(self.event_queue.size(), 4)
         
-        # Check event types
-        events = []
-        while not self.event_queue.is_empty():
-            events.append(self.event_queue.pop())
+        # Check event types; the snapshot leaves the queue intact
+        events = self.event_queue.snapshot_sorted()
+        self.assertEqual(self.event_queue.size(), 4)
         
         event_types = [e.type for e in events]
         self.assertEqual(event_types, [
@@ -89,20 +147,25 @@ class TestPCB(unittest.TestCase):
         self.assertEqual(pcb.priority, 1)
         self.assertEqual(pcb.state, ProcessState.NEW)
     
+    def test_from_row(self):
+        """Test building a PCB from a positional row, with and without priority"""
+        self.assertEqual(PCB.from_row(ROWS[1]), PCB(2, 10, 30, 30, 15, 2))
+        self.assertEqual(PCB.from_row((3, 5, 40, 40, 10)).priority, 1)
+    
     def test_execute(self):
         """Test process execution"""
         pcb = PCB(
             process_id=1,
             arrival_time=0,
-            total_cpu_time=100,
-            remaining_cpu_time=100,
+            total_cpu_time=10,
+            remaining_cpu_time=10,
             io_burst_time=50,
             priority=1
         )
         
         # Execute without time slice (until completion)
         time_used, completed, remaining = pcb.execute()
-        self.assertEqual(time_used, 100)
+        self.assertEqual(time_used, 10)
         self.assertTrue(completed)
         self.assertEqual(remaining, 0)
         self.assertEqual(pcb.remaining_cpu_time, 0)
@@ -147,6 +210,55 @@ class TestPCB(unittest.TestCase):
         self.assertEqual(pcb.waiting_time, 40)
         self.assertEqual(pcb.response_time, 10)
     
+    def test_metrics_arrays(self):
+        """Test vectorized metrics match calculate_metrics, with zeros for unfinished processes"""
+        done = PCB(1, 5, 100, 0, 50, 1)
+        done.first_run_time = 15
+        done.completion_time = 150
+        done.total_waiting_time = 40
+        running = PCB(2, 10, 100, 60, 50, 1)
+        running.first_run_time = 20
+        running.total_waiting_time = 10
+        
+        arrays = PCB.metrics_arrays([done, running])
+        done.calculate_metrics()
+        
+        self.assertEqual(arrays['turnaround'].tolist(), [done.turnaround_time, 0])
+        self.assertEqual(arrays['waiting'].tolist(), [done.waiting_time, 0])
+        self.assertEqual(arrays['response'].tolist(), [done.response_time, 0])
+    
+    @unittest.skipUnless(sys.version_info >= (3, 10), "slotted dataclasses need Python 3.10+")
+    def test_slots(self):
+        """Test that PCBs carry no per-instance __dict__"""
+        pcb = PCB(1, 0, 100, 100, 50, 1)
+        
+        self.assertFalse(hasattr(pcb, '__dict__'))
+        with self.assertRaises(AttributeError):
+            pcb.undeclared_field = 1
+    
+    def test_clone(self):
+        """Test that a clone can be run without touching the original"""
+        pcb = PCB(1, 0, 100, 100, 50, 3)
+        clone = pcb.clone()
+        
+        clone.execute(30)
+        clone.priority = 1
+        
+        self.assertEqual(clone.remaining_cpu_time, 70)
+        self.assertEqual(pcb.remaining_cpu_time, 100)
+        self.assertEqual(pcb.priority, 3)
+    
+    def test_reset_restores_aged_priority(self):
+        """Test that reset undoes priority aging along with the run state"""
+        pcb = PCB(1, 0, 100, 100, 50, 5)
+        pcb.execute(30)
+        pcb.age_priority(current_time=1500, aging_interval=1000)
+        
+        pcb.reset()
+        
+        self.assertEqual(pcb.priority, 5)
+        self.assertEqual(pcb, PCB(1, 0, 100, 100, 50, 5))
+    
     def test_age_priority(self):
         """Test priority aging"""
         pcb = PCB(
@@ -177,6 +289,18 @@ class TestPCB(unittest.TestCase):
 class TestSimulator(unittest.TestCase):
     """Test CPUSimulator functionality"""
     
+    @classmethod
+    def setUpClass(cls):
+        # The simulations churn through short-lived PCBs and events; collect once at the end
+        cls._gc_was_enabled = gc.isenabled()
+        gc.disable()
+    
+    @classmethod
+    def tearDownClass(cls):
+        if cls._gc_was_enabled:
+            gc.enable()
+        gc.collect()
+    
     def setUp(self):
         self.scheduler = FCFSScheduler()
         self.simulator = CPUSimulator(self.scheduler, context_switch_time=2)
@@ -185,8 +309,8 @@ class TestSimulator(unittest.TestCase):
         """Test simulation initialization"""
         # Create test processes
         processes = [
-            PCB(1, 0, 50, 50, 20, 1),
-            PCB(2, 10, 30, 30, 15, 2),
+            PROC_A.clone(),
+            PROC_B.clone(),
             PCB(3, 20, 40, 40, 25, 3)
         ]
         
@@ -204,11 +328,11 @@ class TestSimulator(unittest.TestCase):
     def test_simple_simulation(self):
         """Test a simple simulation with one process"""
         processes = [
-            PCB(1, 0, 50, 50, 20, 1)
+            PROC_A.clone()
         ]
         
         self.simulator.initialize_simulation(processes)
-        result = self.simulator.run(max_time=100)
+        result = self.simulator.run(max_time=work_bound(processes, 2))
         
         # Check that process completed
         self.assertEqual(len(self.simulator.completed_processes), 1)
@@ -220,7 +344,6 @@ class TestSimulator(unittest.TestCase):
     def test_preemption_handling(self):
         """Test preemption handling"""
         # Use a preemptive scheduler
-        from src.schedulers.priority import PriorityScheduler
         scheduler = PriorityScheduler(preemptive=True)
         simulator = CPUSimulator(scheduler, context_switch_time=2)
         
@@ -231,18 +354,83 @@ class TestSimulator(unittest.TestCase):
         ]
         
         simulator.initialize_simulation(processes)
-        result = simulator.run(max_time=200)
+        result = simulator.run(max_time=work_bound(processes, 2))
         
         # Higher priority process should preempt lower priority one
         self.assertEqual(len(simulator.completed_processes), 2)
         self.assertGreater(result.metrics['preemptions'], 0)
 
+    def test_arrival_at_completion_does_not_preempt(self):
+        """Test that a process finishing as a higher-priority one arrives completes on time"""
+        simulator = CPUSimulator(PriorityScheduler(preemptive=True), context_switch_time=0)
+        
+        # P2 arrives exactly when P1's burst runs out
+        processes = [
+            PCB(1, 0, 10, 10, 20, 5),
+            PCB(2, 10, 5, 5, 15, 1)
+        ]
+        
+        simulator.initialize_simulation(processes)
+        result = simulator.run()
+        
+        completions = {stats['pid']: stats['completion'] for stats in result.process_stats}
+        self.assertEqual(completions, {1: 10, 2: 15})
+        self.assertEqual(result.metrics['preemptions'], 0)
+    
+    def test_run_to_completion(self):
+        """Test that the simulation ends when the last process completes"""
+        simulator = CPUSimulator(RoundRobinScheduler(time_quantum=20), context_switch_time=2)
+        
+        processes = [
+            PROC_A.clone(),
+            PCB(2, 10, 30, 30, 15, 1)
+        ]
+        
+        simulator.initialize_simulation(processes)
+        simulator.run()
+        
+        # P1 2-22, P2 24-44, P1 46-66, P2 68-78, P1 80-90 (2ms switches)
+        self.assertEqual(processes[1].completion_time, 78)
+        self.assertEqual(processes[0].completion_time, 90)
+        self.assertEqual(simulator.current_time, 90)
+        self.assertTrue(all(p.remaining_cpu_time == 0 for p in processes))
+        
+        # Ready-queue spans: P1 22-44 and 66-78, P2 10-22 and 44-66
+        self.assertEqual(processes[0].total_waiting_time, 34)
+        self.assertEqual(processes[1].total_waiting_time, 34)
+    
+    def test_resume_same_process_skips_context_switch(self):
+        """Test that a process re-dispatched right after itself pays no switch"""
+        simulator = CPUSimulator(RoundRobinScheduler(time_quantum=20), context_switch_time=2)
+        
+        process = PROC_A.clone()
+        simulator.initialize_simulation([process])
+        result = simulator.run()
+        
+        # One switch in at 0-2, then three back-to-back slices 2-22, 22-42, 42-52
+        self.assertEqual(process.completion_time, 52)
+        self.assertEqual(result.metrics['context_switches'], 1)
+    
+    def test_discard_stale_events(self):
+        """Test that events from superseded dispatches are dropped at the queue head"""
+        self.simulator.dispatch_id = 2
+        self.simulator.event_queue.schedule_timeout(1, 10, 1)
+        self.simulator.event_queue.schedule_cpu_completion(2, 20, 2)
+        
+        self.simulator._discard_stale_events()
+        
+        self.assertEqual(self.simulator.event_queue.size(), 1)
+        self.assertEqual(self.simulator.event_queue.peek_time(), 20)
+
 class TestWorkloadGenerator(unittest.TestCase):
     """Test WorkloadGenerator functionality"""
     
-    def setUp(self):
-        self.config = WorkloadConfig(num_processes=10)
-        self.generator = WorkloadGenerator(self.config)
+    @classmethod
+    def setUpClass(cls):
+        # Tests only check the shape of generated output, so one generator serves all
+        cls.config = WorkloadConfig(num_processes=10, seed=0)
+        cls.generator = WorkloadGenerator(cls.config)
+        cls.traces = cls.generator.create_sample_traces()
     
     def test_synthetic_workload_generation(self):
         """Test synthetic workload generation"""
@@ -251,19 +439,22 @@ class TestWorkloadGenerator(unittest.TestCase):
         # Check number of processes
         self.assertEqual(len(processes), self.config.num_processes)
         
-        # Check process attributes
-        for process in processes:
-            self.assertIsInstance(process, PCB)
-            self.assertGreaterEqual(process.arrival_time, 0)
-            self.assertGreater(process.total_cpu_time, 0)
-            self.assertGreaterEqual(process.io_burst_time, self.config.io_burst_min)
-            self.assertLessEqual(process.io_burst_time, self.config.io_burst_max)
-            self.assertGreaterEqual(process.priority, self.config.priority_min)
-            self.assertLessEqual(process.priority, self.config.priority_max)
+        # Check process attributes, one array comparison per field
+        self.assertTrue(all(isinstance(process, PCB) for process in processes))
+        arrivals = np.fromiter((p.arrival_time for p in processes), dtype=np.int64)
+        cpu_times = np.fromiter((p.total_cpu_time for p in processes), dtype=np.int64)
+        io_times = np.fromiter((p.io_burst_time for p in processes), dtype=np.int64)
+        priorities = np.fromiter((p.priority for p in processes), dtype=np.int64)
+        self.assertTrue(np.all(arrivals >= 0))
+        self.assertTrue(np.all(cpu_times > 0))
+        self.assertTrue(np.all((io_times >= self.config.io_burst_min) &
+                               (io_times <= self.config.io_burst_max)))
+        self.assertTrue(np.all((priorities >= self.config.priority_min) &
+                               (priorities <= self.config.priority_max)))
     
     def test_trace_generation(self):
         """Test trace file generation"""
-        traces = self.generator.create_sample_traces()
+        traces = self.traces
         
         # Check that all workload types are generated
         self.assertIn('cpu_intensive', traces)
@@ -274,17 +465,40 @@ class TestWorkloadGenerator(unittest.TestCase):
         for workload_type, trace_lines in traces.items():
             self.assertGreater(len(trace_lines), 0)
             
-            # Check first few lines have correct format
-            for i, line in enumerate(trace_lines[:5]):
-                parts = line.split(',')
-                self.assertEqual(len(parts), 5)  # 5 fields per process
-                
-                # All parts should be integers
-                for part in parts:
-                    try:
-                        int(part)
-                    except ValueError:
-                        self.fail(f"Non-integer value in trace: {part}")
+            # Parse every line at once; all fields should be integers
+            try:
+                table = np.loadtxt(io.StringIO("\n".join(trace_lines)), delimiter=',',
+                                   dtype=np.int64, ndmin=2)
+            except ValueError as e:
+                self.fail(f"Non-integer value in {workload_type} trace: {e}")
+            self.assertEqual(table.shape, (len(trace_lines), 5))  # 5 fields per process
+
+class TestResultCache(unittest.TestCase):
+    """Test on-disk caching of simulation metrics"""
+    
+    def test_run_cached(self):
+        """Test that a repeated configuration reuses the stored metrics"""
+        config = make_run_config(WorkloadConfig(num_processes=5, seed=1), 'RR',
+                                 context_switch_time=2, max_time=1000, time_quantum=20)
+        calls = []
+        
+        def run():
+            calls.append(1)
+            return {'avg_waiting_time': 12.5}
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with patch.object(result_cache, 'RESULT_CACHE_DIR', cache_dir):
+                before = get_result_cache_stats()
+                first = run_cached(config, run)
+                second = run_cached(config, run)
+                other = run_cached(dict(config, time_quantum=50), run)
+                after = get_result_cache_stats()
+        
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(first, second)
+        self.assertEqual(other, first)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+        self.assertEqual(after['misses'] - before['misses'], 2)
 
 def run_tests():
     """Run all tests"""
@@ -297,9 +511,11 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestPCB))
     suite.addTests(loader.loadTestsFromTestCase(TestSimulator))
     suite.addTests(loader.loadTestsFromTestCase(TestWorkloadGenerator))
+    suite.addTests(loader.loadTestsFromTestCase(TestResultCache))
     
     # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
+    # TEST_VERBOSITY=2 lists every test; the default prints only progress dots
+    runner = unittest.TextTestRunner(verbosity=int(os.environ.get('TEST_VERBOSITY', '1')))
     result = runner.run(suite)
     
     return result.wasSuccessful()
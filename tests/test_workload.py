@@ -5,12 +5,38 @@ Unit tests for workload generation
 
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Project root, added once however many test modules are loaded together
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
+import io
+import re
 import unittest
 import tempfile
-from src.workload_generator import WorkloadGenerator, WorkloadConfig
+from functools import lru_cache
+from pathlib import Path
+from unittest.mock import patch
+import numpy as np
+from src import workload_generator
+from src.workload_generator import (
+    WorkloadGenerator, WorkloadConfig, load_or_generate, get_workload_cache_stats
+)
 from src.pcb import PCB
+from src.main import SimulationController, SimulationConfig
+
+# A trace line: 5 comma-separated non-negative integer fields
+TRACE_LINE_RE = re.compile(r"^\d+,\d+,\d+,\d+,\d+$")
+
+@lru_cache(maxsize=None)
+def shared_workload(**fields):
+    """Generate a workload once per test run, keyed by its config fields
+    
+    Returns (config, processes); processes is a tuple because tests share it
+    and must not mutate it.
+    """
+    config = WorkloadConfig(**fields)
+    return config, tuple(WorkloadGenerator(config).generate_synthetic_workload())
 
 class TestWorkloadConfig(unittest.TestCase):
     """Test WorkloadConfig class"""
@@ -59,140 +85,113 @@ class TestWorkloadConfig(unittest.TestCase):
 class TestWorkloadGenerator(unittest.TestCase):
     """Test WorkloadGenerator class"""
     
-    def setUp(self):
-        self.config = WorkloadConfig(num_processes=10)
-        self.generator = WorkloadGenerator(self.config)
+    @classmethod
+    def setUpClass(cls):
+        # Shared by tests that do not depend on its pid counter or RNG position
+        cls.config = WorkloadConfig(num_processes=10)
+        cls.generator = WorkloadGenerator(cls.config)
     
-    def test_synthetic_workload_cpu_intensive(self):
-        """Test CPU-intensive workload generation"""
-        config = WorkloadConfig(
-            num_processes=50,
-            workload_type="cpu_intensive"
-        )
-        generator = WorkloadGenerator(config)
+    def test_synthetic_workload(self):
+        """Test synthetic workload generation for each workload type"""
+        defaults = WorkloadConfig()
+        io_min, io_max = defaults.io_burst_min, defaults.io_burst_max
+        io_split = io_max // 2  # CPU-bound processes draw I/O bursts below this
         
-        processes = generator.generate_synthetic_workload()
+        # (workload type, process count, allowed I/O burst range)
+        cases = [
+            ("cpu_intensive", 50, io_min, io_split),
+            ("io_intensive", 50, io_split, io_max),
+            ("mixed", 100, io_min, io_max),
+        ]
         
-        self.assertEqual(len(processes), 50)
-        
-        # Check that processes have reasonable values
-        for process in processes:
-            self.assertIsInstance(process, PCB)
-            self.assertGreater(process.total_cpu_time, 0)
-            self.assertGreaterEqual(process.io_burst_time, config.io_burst_min)
-            self.assertLessEqual(process.io_burst_time, config.io_burst_max // 2)
+        for workload_type, num_processes, io_low, io_high in cases:
+            with self.subTest(workload_type=workload_type):
+                _, processes = shared_workload(num_processes=num_processes,
+                                               workload_type=workload_type)
+                
+                self.assertEqual(len(processes), num_processes)
+                
+                # Check that processes have reasonable values, a whole field at a time
+                self.assertTrue(all(isinstance(p, PCB) for p in processes))
+                cpu_times = np.fromiter((p.total_cpu_time for p in processes), dtype=np.int64,
+                                        count=num_processes)
+                io_times = np.fromiter((p.io_burst_time for p in processes), dtype=np.int64,
+                                       count=num_processes)
+                self.assertTrue((cpu_times > 0).all())
+                out_of_range = io_times[(io_times < io_low) | (io_times > io_high)]
+                self.assertEqual(out_of_range.size, 0,
+                                 f"I/O bursts outside [{io_low}, {io_high}]: {out_of_range}")
+                
+                if workload_type != "mixed":
+                    continue
+                
+                # Count CPU vs I/O intensive processes
+                cpu_intensive = int((io_times <= io_split).sum())
+                io_intensive = len(processes) - cpu_intensive
+                
+                # Should have mix of both (roughly 70% CPU intensive based on default ratio)
+                self.assertGreater(cpu_intensive, 0)
+                self.assertGreater(io_intensive, 0)
+                self.assertGreater(cpu_intensive, io_intensive)  # More CPU intensive in mixed
     
-    def test_synthetic_workload_io_intensive(self):
-        """Test I/O-intensive workload generation"""
-        config = WorkloadConfig(
-            num_processes=50,
-            workload_type="io_intensive"
-        )
-        generator = WorkloadGenerator(config)
-        
-        processes = generator.generate_synthetic_workload()
-        
-        self.assertEqual(len(processes), 50)
-        
-        # Check that processes have reasonable values
-        for process in processes:
-            self.assertIsInstance(process, PCB)
-            self.assertGreater(process.total_cpu_time, 0)
-            self.assertGreaterEqual(process.io_burst_time, config.io_burst_max // 2)
-            self.assertLessEqual(process.io_burst_time, config.io_burst_max)
+    def write_trace(self, text):
+        """Write a trace file into a temp directory removed after the test"""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        trace_file = Path(temp_dir.name) / "trace.txt"
+        trace_file.write_text(text)
+        return str(trace_file)
     
-    def test_synthetic_workload_mixed(self):
-        """Test mixed workload generation"""
-        config = WorkloadConfig(
-            num_processes=100,
-            workload_type="mixed"
-        )
-        generator = WorkloadGenerator(config)
+    def test_generate_from_trace(self):
+        """Test trace file parsing"""
+        # Sample trace data; note the empty line
+        trace = ("# Test trace file\n"
+                 "1,0,50,20,1\n"
+                 "2,10,30,15,2\n"
+                 "3,20,40,25,3\n"
+                 "\n"
+                 "4,30,60,30,1\n")
         
-        processes = generator.generate_synthetic_workload()
+        # Generate from an in-memory trace
+        processes = self.generator.generate_from_trace(io.StringIO(trace))
         
-        self.assertEqual(len(processes), 100)
+        # Should parse 4 processes
+        self.assertEqual(len(processes), 4)
         
-        # Count CPU vs I/O intensive processes
-        cpu_intensive = 0
-        io_intensive = 0
+        # Check first process
+        self.assertEqual(processes[0].process_id, 1)
+        self.assertEqual(processes[0].arrival_time, 0)
+        self.assertEqual(processes[0].total_cpu_time, 50)
+        self.assertEqual(processes[0].io_burst_time, 20)
+        self.assertEqual(processes[0].priority, 1)
         
-        for process in processes:
-            if process.io_burst_time <= config.io_burst_max // 2:
-                cpu_intensive += 1
-            else:
-                io_intensive += 1
+        # Check last process
+        self.assertEqual(processes[3].process_id, 4)
+        self.assertEqual(processes[3].arrival_time, 30)
+        self.assertEqual(processes[3].total_cpu_time, 60)
+        self.assertEqual(processes[3].io_burst_time, 30)
+        self.assertEqual(processes[3].priority, 1)
         
-        # Should have mix of both (roughly 70% CPU intensive based on default ratio)
-        self.assertGreater(cpu_intensive, 0)
-        self.assertGreater(io_intensive, 0)
-        self.assertGreater(cpu_intensive, io_intensive)  # More CPU intensive in mixed
-    
-    def test_generate_from_trace(self):
-        """Test trace file parsing"""
-        # Create a temporary trace file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            # Write sample trace data
-            f.write("# Test trace file\n")
-            f.write("1,0,50,20,1\n")
-            f.write("2,10,30,15,2\n")
-            f.write("3,20,40,25,3\n")
-            f.write("\n")  # Empty line
-            f.write("4,30,60,30,1\n")
-            temp_file = f.name
+        # A trace file on disk parses the same way
+        self.assertEqual(self.generator.generate_from_trace(self.write_trace(trace)), processes)
         
-        try:
-            # Generate from trace file
-            processes = self.generator.generate_from_trace(temp_file)
-            
-            # Should parse 4 processes
-            self.assertEqual(len(processes), 4)
-            
-            # Check first process
-            self.assertEqual(processes[0].process_id, 1)
-            self.assertEqual(processes[0].arrival_time, 0)
-            self.assertEqual(processes[0].total_cpu_time, 50)
-            self.assertEqual(processes[0].io_burst_time, 20)
-            self.assertEqual(processes[0].priority, 1)
-            
-            # Check last process
-            self.assertEqual(processes[3].process_id, 4)
-            self.assertEqual(processes[3].arrival_time, 30)
-            self.assertEqual(processes[3].total_cpu_time, 60)
-            self.assertEqual(processes[3].io_burst_time, 30)
-            self.assertEqual(processes[3].priority, 1)
-            
-            # Test with non-existent file
-            processes = self.generator.generate_from_trace("non_existent.txt")
-            self.assertEqual(len(processes), 0)
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file):
-                os.unlink(temp_file)
+        # Test with non-existent file
+        processes = self.generator.generate_from_trace("non_existent.txt")
+        self.assertEqual(len(processes), 0)
     
     def test_generate_from_trace_invalid_format(self):
         """Test trace file parsing with invalid format"""
-        # Create a temporary trace file with invalid data
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write("1,0,50,20,1\n")
-            f.write("invalid,data,here\n")  # Invalid line
-            f.write("2,10,thirty,15,2\n")   # Non-integer CPU burst
-            f.write("3,20,40\n")            # Missing fields
-            temp_file = f.name
+        trace = io.StringIO("1,0,50,20,1\n"
+                            "invalid,data,here\n"   # Invalid line
+                            "2,10,thirty,15,2\n"    # Non-integer CPU burst
+                            "3,20,40\n")            # Missing fields
+        
+        # Should handle invalid lines gracefully
+        processes = self.generator.generate_from_trace(trace)
         
-        try:
-            # Should handle invalid lines gracefully
-            processes = self.generator.generate_from_trace(temp_file)
-            
-            # Should parse only valid lines
-            self.assertEqual(len(processes), 1)
-            self.assertEqual(processes[0].process_id, 1)
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file):
-                os.unlink(temp_file)
+        # Should parse only valid lines
+        self.assertEqual(len(processes), 1)
+        self.assertEqual(processes[0].process_id, 1)
     
     def test_create_sample_traces(self):
         """Test sample trace generation"""
@@ -211,53 +210,104 @@ class TestWorkloadGenerator(unittest.TestCase):
         # Check trace format
         for workload_type, trace_lines in traces.items():
             for line in trace_lines[:10]:  # Check first 10 lines
-                parts = line.split(',')
-                self.assertEqual(len(parts), 5)  # 5 fields
-                
-                # All fields should be integers
-                pid, arrival, cpu, io, priority = parts
-                self.assertTrue(pid.isdigit())
-                self.assertTrue(arrival.isdigit())
-                self.assertTrue(cpu.isdigit())
-                self.assertTrue(io.isdigit())
-                self.assertTrue(priority.isdigit())
+                self.assertRegex(line, TRACE_LINE_RE)
+    
+    def test_time_fields_are_integers(self):
+        """Test that generated time fields are plain ints, not floats or NumPy scalars"""
+        _, processes = shared_workload(num_processes=10)
+        
+        for p in processes:
+            for value in (p.arrival_time, p.total_cpu_time, p.remaining_cpu_time,
+                          p.io_burst_time, p.priority):
+                self.assertIs(type(value), int)
+    
+    def test_seeded_generation_is_reproducible(self):
+        """Test that the same seed yields the same workload"""
+        config = WorkloadConfig(num_processes=10, seed=123)
+        
+        first = WorkloadGenerator(config).generate_synthetic_workload()
+        second = WorkloadGenerator(config).generate_synthetic_workload()
+        
+        self.assertEqual(first, second)
     
     def test_process_id_sequencing(self):
         """Test that process IDs are sequenced correctly"""
+        # A fresh generator, since this test advances its pid counter
+        generator = WorkloadGenerator(self.config)
+        
         # Generate first batch
-        processes1 = self.generator.generate_synthetic_workload()
+        processes1 = generator.generate_synthetic_workload()
         
         # Generate second batch
-        processes2 = self.generator.generate_synthetic_workload()
+        processes2 = generator.generate_synthetic_workload()
         
         # Check that process IDs continue from where left off
-        max_id1 = max(p.process_id for p in processes1)
-        min_id2 = min(p.process_id for p in processes2)
+        max_id1 = np.fromiter((p.process_id for p in processes1), dtype=np.int64).max()
+        min_id2 = np.fromiter((p.process_id for p in processes2), dtype=np.int64).min()
         
         self.assertEqual(min_id2, max_id1 + 1)
     
     def test_arrival_time_distribution(self):
         """Test that arrival times follow Poisson distribution"""
-        config = WorkloadConfig(
-            num_processes=1000,
-            arrival_lambda=0.01  # Expect ~10ms average inter-arrival
-        )
+        # Seeded so the mean is fixed; with 200 arrivals its standard error is ~7ms
+        config = WorkloadConfig(num_processes=200, arrival_lambda=0.01, seed=0xC0FFEE)
         generator = WorkloadGenerator(config)
+        generator.generate_synthetic_workload()
         
-        processes = generator.generate_synthetic_workload()
+        # The generator keeps the inter-arrival gaps it drew
+        avg_inter_arrival = float(generator.last_inter_arrivals.mean())
         
-        # Calculate inter-arrival times
-        arrival_times = [p.arrival_time for p in processes]
-        inter_arrival_times = [arrival_times[i] - arrival_times[i-1] 
-                              for i in range(1, len(arrival_times))]
+        # With lambda = 0.01, expected average = 100ms
+        self.assertGreater(avg_inter_arrival, 80)
+        self.assertLess(avg_inter_arrival, 125)
+
+class TestWorkloadCache(unittest.TestCase):
+    """Test on-disk workload caching"""
+    
+    def test_load_or_generate(self):
+        """Test that cached workloads are reloaded identically"""
+        config = WorkloadConfig(num_processes=20, seed=7)
         
-        # Basic statistics check (not a full statistical test)
-        avg_inter_arrival = sum(inter_arrival_times) / len(inter_arrival_times)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with patch.object(workload_generator, 'WORKLOAD_CACHE_DIR', cache_dir):
+                before = get_workload_cache_stats()
+                first = load_or_generate(config)
+                second = load_or_generate(config)
+                after = get_workload_cache_stats()
         
-        # With lambda = 0.01, expected average = 100ms
-        # Allow some variation due to randomness
-        self.assertGreater(avg_inter_arrival, 50)  # Should be > 50ms
-        self.assertLess(avg_inter_arrival, 200)    # Should be < 200ms
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+        
+        # Same seed should give the same processes, as distinct objects
+        self.assertEqual(first, second)
+        self.assertIsNot(first[0], second[0])
+
+class TestControllerWorkload(unittest.TestCase):
+    """Test workloads generated through SimulationController"""
+    
+    def test_seeded_workload_is_reproducible(self):
+        """Test that controllers given the same seed generate the same workload"""
+        config = SimulationConfig(algorithm='FCFS', num_processes=5, seed=42)
+        
+        first = SimulationController().generate_workload(config)
+        second = SimulationController().generate_workload(config)
+        expected = WorkloadGenerator(
+            WorkloadConfig(num_processes=5, seed=42)
+        ).generate_synthetic_workload()
+        
+        self.assertEqual(first, second)
+        self.assertEqual(first, expected)
+    
+    def test_unseeded_workload_is_not_reused(self):
+        """Test that unseeded requests draw a fresh workload each time"""
+        config = SimulationConfig(algorithm='FCFS', num_processes=50)
+        controller = SimulationController()
+        
+        first = controller.generate_workload(config)
+        second = controller.generate_workload(config)
+        
+        self.assertNotEqual(first, second)
+        self.assertEqual(controller._workload_templates, {})
 
 def run_workload_tests():
     """Run all workload tests"""
@@ -268,9 +318,12 @@ def run_workload_tests():
     # Add test classes
     suite.addTests(loader.loadTestsFromTestCase(TestWorkloadConfig))
     suite.addTests(loader.loadTestsFromTestCase(TestWorkloadGenerator))
+    suite.addTests(loader.loadTestsFromTestCase(TestWorkloadCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestControllerWorkload))
     
     # Run tests
-    runner = unittest.TextTestRunner(verbosity=2)
+    # TEST_VERBOSITY=2 lists every test; the default prints only progress dots
+    runner = unittest.TextTestRunner(verbosity=int(os.environ.get('TEST_VERBOSITY', '1')))
     result = runner.run(suite)
     
     return result.wasSuccessful()